@@ -30,9 +30,103 @@ ALLOWED_HOSTS = ['*']
 
 # Configurações do Bling ERP
 BLING_API_URL = config('API_URL', default='https://api.bling.com.br/Api/v3')
+# Base das chamadas REST e OAuth (authorize/token); os benchmarks apontam para um Bling simulado
+BLING_API_BASE_URL = config('BLING_API_BASE_URL', default='https://www.bling.com.br/Api/v3')
 BLING_CLIENT_ID = config('CLIENT_ID')
 BLING_CLIENT_SECRET = config('CLIENT_SECRET')
 BLING_REDIRECT_URI = config('REDIRECT_URI', default='http://localhost:8000/integrations/auth/callback/')
+# Segredo do HMAC do webhook (/integrations/webhooks/bling/); o Bling assina com o client secret do app
+BLING_WEBHOOK_SECRET = config('BLING_WEBHOOK_SECRET', default=BLING_CLIENT_SECRET)
+# Janela (segundos) para agrupar a invalidação das listagens em cache pelos webhooks (0 = a cada evento)
+BLING_WEBHOOK_LIST_INVALIDATION_SECONDS = config('BLING_WEBHOOK_LIST_INVALIDATION_SECONDS', default=10.0, cast=float)
+
+# Renovação antecipada do access token (fração do expires_in) e espera por renovação em outro worker
+BLING_TOKEN_REFRESH_FRACTION = config('BLING_TOKEN_REFRESH_FRACTION', default=0.8, cast=float)
+BLING_TOKEN_REFRESH_WAIT = config('BLING_TOKEN_REFRESH_WAIT', default=15.0, cast=float)  # Segundos
+
+# Pool de conexões HTTP (keep-alive) compartilhado com a API do Bling
+BLING_HTTP_POOL_CONNECTIONS = config('BLING_HTTP_POOL_CONNECTIONS', default=4, cast=int)  # Hosts distintos
+BLING_HTTP_POOL_MAXSIZE = config('BLING_HTTP_POOL_MAXSIZE', default=20, cast=int)  # Conexões por host
+BLING_HTTP_POOL_BLOCK = config('BLING_HTTP_POOL_BLOCK', default=False, cast=bool)
+# Timeouts das chamadas ao Bling (segundos): conexão e leitura da resposta
+BLING_HTTP_CONNECT_TIMEOUT = config('BLING_HTTP_CONNECT_TIMEOUT', default=5.0, cast=float)
+BLING_HTTP_TIMEOUT = config('BLING_HTTP_TIMEOUT', default=20.0, cast=float)
+
+# Circuit breaker por recurso: abre após N falhas seguidas (ou respostas lentas) e testa de novo após RESET
+BLING_CIRCUIT_ENABLED = config('BLING_CIRCUIT_ENABLED', default=True, cast=bool)
+BLING_CIRCUIT_FAILURE_THRESHOLD = config('BLING_CIRCUIT_FAILURE_THRESHOLD', default=5, cast=int)
+BLING_CIRCUIT_SLOW_SECONDS = config('BLING_CIRCUIT_SLOW_SECONDS', default=10.0, cast=float)  # 0 desativa
+BLING_CIRCUIT_RESET_SECONDS = config('BLING_CIRCUIT_RESET_SECONDS', default=30, cast=int)
+
+# Limite de requisições ao Bling (token bucket compartilhado via cache)
+BLING_RATE_LIMIT_PER_SECOND = config('BLING_RATE_LIMIT_PER_SECOND', default=3.0, cast=float)  # 0 desativa
+BLING_RATE_LIMIT_BURST = config('BLING_RATE_LIMIT_BURST', default=3, cast=int)
+BLING_RATE_LIMIT_MAX_RETRIES = config('BLING_RATE_LIMIT_MAX_RETRIES', default=3, cast=int)  # Tentativas após HTTP 429
+BLING_RATE_LIMIT_BACKOFF = config('BLING_RATE_LIMIT_BACKOFF', default=1.0, cast=float)  # Segundos, dobra a cada tentativa
+
+# Cache das respostas GET do Bling: prefixo do endpoint -> (TTL, janela stale) em segundos
+# Dentro da janela stale a resposta antiga é servida enquanto a nova é buscada em segundo plano
+BLING_RESPONSE_CACHE_ENABLED = config('BLING_RESPONSE_CACHE_ENABLED', default=True, cast=bool)
+# Por quanto tempo, além do TTL + stale, a última resposta fica guardada para quando o Bling estiver fora
+BLING_CACHE_FALLBACK_SECONDS = config('BLING_CACHE_FALLBACK_SECONDS', default=6 * 3600, cast=int)
+BLING_CACHE_POLICIES = {
+    '/categorias/produtos': (6 * 3600, 3600),
+    '/produtos': (300, 600),
+    '/pedidos/vendas': (15, 30),
+    '/contatos': (600, 1200),
+}
+
+# GETs idênticos simultâneos compartilham uma única chamada ao Bling (sempre ativo no processo)
+# No modo distribuído, workers aguardam via lock no cache o resultado de quem já está buscando
+BLING_SINGLE_FLIGHT_DISTRIBUTED = config('BLING_SINGLE_FLIGHT_DISTRIBUTED', default=False, cast=bool)
+BLING_SINGLE_FLIGHT_WAIT = config('BLING_SINGLE_FLIGHT_WAIT', default=10.0, cast=float)  # Segundos
+
+# Espelho local (manage.py sync_bling): as listagens passam a ler do banco em vez do Bling
+BLING_SERVE_FROM_MIRROR = config('BLING_SERVE_FROM_MIRROR', default=False, cast=bool)
+BLING_SYNC_BATCH_SIZE = config('BLING_SYNC_BATCH_SIZE', default=500, cast=int)
+BLING_SYNC_OVERLAP_SECONDS = config('BLING_SYNC_OVERLAP_SECONDS', default=300, cast=int)  # Recuo da marca d'água
+# Itens por página na paginação por cursor (?cursor=) sobre o espelho
+BLING_CURSOR_MAX_LIMIT = config('BLING_CURSOR_MAX_LIMIT', default=1000, cast=int)
+# Grava no espelho (e nos agregados de vendas) os pedidos buscados ao vivo no Bling
+BLING_MIRROR_WRITE_THROUGH = config('BLING_MIRROR_WRITE_THROUGH', default=False, cast=bool)
+# Responde ?search= de produtos pelo índice FTS5 do espelho também no modo API (SQLite)
+BLING_LOCAL_SEARCH = config('BLING_LOCAL_SEARCH', default=False, cast=bool)
+
+# Índice código -> ID (produtos) e número -> ID (pedidos) mantido no cache
+BLING_IDENTIFIER_INDEX_TTL = config('BLING_IDENTIFIER_INDEX_TTL', default=7 * 24 * 3600, cast=int)  # Segundos
+BLING_IDENTIFIER_INDEX_CACHE = 'identifiers'  # Alias em CACHES
+
+# Páginas buscadas em paralelo por get_all_products/get_all_orders (limitado por BLING_RATE_LIMIT_BURST)
+BLING_PAGINATION_CONCURRENCY = config('BLING_PAGINATION_CONCURRENCY', default=4, cast=int)
+
+# Fila de tarefas em segundo plano (manage.py bling_worker)
+BLING_WORKER_THREADS = config('BLING_WORKER_THREADS', default=2, cast=int)
+BLING_WORKER_POLL_INTERVAL = config('BLING_WORKER_POLL_INTERVAL', default=2.0, cast=float)  # Segundos
+BLING_JOB_MAX_ATTEMPTS = config('BLING_JOB_MAX_ATTEMPTS', default=3, cast=int)
+BLING_JOB_RETRY_BACKOFF = config('BLING_JOB_RETRY_BACKOFF', default=30, cast=int)  # Segundos, dobra a cada tentativa
+BLING_JOB_STALE_SECONDS = config('BLING_JOB_STALE_SECONDS', default=600, cast=int)  # Sem sinal de vida: volta para a fila
+BLING_EXPORT_DIR = config('BLING_EXPORT_DIR', default=str(BASE_DIR / 'exports'))
+
+# Agendamentos: nome -> {'kind', 'params', 'interval' (segundos), 'enabled'}
+BLING_JOB_SCHEDULES = {
+    'sync_incremental': {
+        'kind': 'sync',
+        'params': {'resources': ['products', 'orders'], 'incremental': True},
+        'interval': 5 * 60,
+        'enabled': config('BLING_SCHEDULE_SYNC_ENABLED', default=False, cast=bool),
+    },
+}
+
+# ETag nas respostas de leitura: 304 Not Modified quando o conteúdo não mudou
+BLING_ETAG_ENABLED = config('BLING_ETAG_ENABLED', default=True, cast=bool)
+
+# /orders/batch/: máximo de IDs por chamada e detalhes buscados em paralelo (limitado por BLING_RATE_LIMIT_BURST)
+BLING_BATCH_MAX_IDS = config('BLING_BATCH_MAX_IDS', default=50, cast=int)
+BLING_BATCH_CONCURRENCY = config('BLING_BATCH_CONCURRENCY', default=4, cast=int)
+
+# /metrics/: cada worker grava suas métricas no cache a cada FLUSH_INTERVAL segundos; somem após TTL sem gravar
+BLING_METRICS_FLUSH_INTERVAL = config('BLING_METRICS_FLUSH_INTERVAL', default=10.0, cast=float)
+BLING_METRICS_TTL = config('BLING_METRICS_TTL', default=3600, cast=int)
 
 
 # CORS (se necessário para frontend)
@@ -42,6 +136,8 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 CORS_ALLOW_CREDENTIALS = True
+# Headers legíveis pelo frontend em outra origem
+CORS_EXPOSE_HEADERS = ['X-Rate-Limit-Wait']
 
 INSTALLED_APPS = [
     'django.contrib.admin',
@@ -59,6 +155,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # ← ADICIONEi ESTA LINHA AQUI (Eduardo)
+    'integrations.middleware.ServerTimingMiddleware',
+    'integrations.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -68,6 +166,19 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Compressão das respostas da integração (brotli se o pacote estiver instalado, senão gzip)
+COMPRESSION_PATH_PREFIXES = ('/integrations/',)
+COMPRESSION_MIN_BYTES = config('COMPRESSION_MIN_BYTES', default=1024, cast=int)
+COMPRESSION_GZIP_LEVEL = config('COMPRESSION_GZIP_LEVEL', default=5, cast=int)  # 1-9
+COMPRESSION_BROTLI_QUALITY = config('COMPRESSION_BROTLI_QUALITY', default=4, cast=int)  # 0-11
+
+# Header Server-Timing (auth, cache, chamadas ao Bling, serialização) nas respostas da integração
+SERVER_TIMING_ENABLED = config('SERVER_TIMING_ENABLED', default=True, cast=bool)
+SERVER_TIMING_PATH_PREFIXES = ('/integrations/',)
+SERVER_TIMING_MAX_ENTRIES = config('SERVER_TIMING_MAX_ENTRIES', default=10, cast=int)  # Chamadas ao Bling listadas uma a uma
+# Grava no log a linha do tempo das requisições acima deste tempo (ms); 0 desativa
+SLOW_REQUEST_LOG_MS = config('SLOW_REQUEST_LOG_MS', default=0, cast=int)
+
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
@@ -120,6 +231,30 @@ CACHES = {
     }
 }
 
+# Redis (produção): compartilha tokens e limite de requisições entre os workers
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES['default'] = {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': REDIS_URL,
+        'TIMEOUT': 3600,
+        'OPTIONS': {
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+        },
+    }
+
+# Cache próprio do índice de identificadores (milhares de códigos e números):
+# no cache padrão as entradas descartariam os tokens OAuth (LocMem guarda 300 chaves)
+CACHES['identifiers'] = {
+    **CACHES['default'],
+    'KEY_PREFIX': 'idx',
+}
+if not REDIS_URL:
+    CACHES['identifiers'].update({
+        'LOCATION': 'bling-identifiers',
+        'OPTIONS': {'MAX_ENTRIES': config('BLING_IDENTIFIER_INDEX_MAX_ENTRIES', default=100000, cast=int)},
+    })
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
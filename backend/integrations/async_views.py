@@ -0,0 +1,43 @@
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+
+from . import views
+
+
+# Views assíncronas: só têm efeito quando servidas via ASGI (app/asgi.py)
+#
+# Cada uma executa a view síncrona correspondente em uma thread do executor
+# padrão, sem bloquear o event loop enquanto aguarda o Bling. Assim a mesma
+# URL responde igual via ASGI ou WSGI: espelho local, paginação por cursor,
+# busca local, projeção de campos e ETag vêm todos de views.py.
+
+
+def _async_view(view_func):
+    """
+    Versão assíncrona de uma view síncrona de views.py
+    """
+
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        return await sync_to_async(view_func, thread_sensitive=False)(request, *args, **kwargs)
+
+    return wrapper
+
+
+# PRODUTOS
+get_products = _async_view(views.get_products)
+get_product_detail = _async_view(views.get_product_detail)
+
+# PEDIDOS
+get_orders = _async_view(views.get_orders)
+get_order_detail = _async_view(views.get_order_detail)
+
+# CATEGORIAS
+get_categories = _async_view(views.get_categories)
+
+# CONTATOS
+get_contacts = _async_view(views.get_contacts)
+
+# RELATÓRIOS E RESUMOS
+get_dashboard_summary = _async_view(views.get_dashboard_summary)
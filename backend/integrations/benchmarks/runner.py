@@ -0,0 +1,273 @@
+import os
+import sys
+import time
+import platform
+import threading
+import subprocess
+
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from django.conf import settings
+from django.core.cache import caches
+from django.test import Client
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from ..services.bling_api import BlingAPIService
+from ..services.bling_oauth import BlingOAuthService
+
+
+# Endpoints da integração: (nome, caminho); {n} recebe 1, 2, 3... para variar os IDs
+ENDPOINTS = [
+    ('products', '/integrations/products/?limit=100'),
+    ('product_detail', '/integrations/products/{n}/'),
+    ('orders', '/integrations/orders/?limit=100'),
+    ('order_detail', '/integrations/orders/{n}/'),
+    ('orders_batch', '/integrations/orders/batch/?ids=1,2,3,4,5,6,7,8,9,10'),
+    ('categories', '/integrations/categories/'),
+    ('contacts', '/integrations/contacts/'),
+    ('dashboard', '/integrations/dashboard/'),
+]
+
+# Chamadas diretas aos serviços (sem a camada HTTP do Django)
+SERVICES = ('get_all_products', 'get_all_orders', 'token_refresh')
+
+
+def percentile(values, pct):
+    """
+    Percentil pelo método nearest-rank sobre uma lista já ordenada
+    """
+    if not values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(values) + 0.5)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+def summarize(latencies, errors, wall_time, concurrency):
+    """
+    Vazão e latências (ms) de uma série de execuções
+    """
+    values = sorted(latencies)
+    total = len(values)
+
+    def ms(seconds):
+        return round(seconds * 1000, 3)
+
+    return {
+        'requests': total,
+        'errors': errors,
+        'concurrency': concurrency,
+        'wall_time_s': round(wall_time, 4),
+        'throughput_rps': round(total / wall_time, 2) if wall_time else 0.0,
+        'latency_ms': {
+            'mean': ms(sum(values) / total) if total else 0.0,
+            'p50': ms(percentile(values, 50)),
+            'p95': ms(percentile(values, 95)),
+            'p99': ms(percentile(values, 99)),
+            'max': ms(values[-1]) if values else 0.0,
+        },
+    }
+
+
+def measure(call, requests, concurrency=1, warmup=0):
+    """
+    Executa `call(n)` `requests` vezes em `concurrency` threads
+
+    Execuções que levantam exceção contam como erro e não entram nas latências.
+    """
+    for n in range(warmup):
+        call(n + 1)
+
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def run(n):
+        nonlocal errors
+        started = time.perf_counter()
+        try:
+            call(n + 1)
+        except Exception:
+            with lock:
+                errors += 1
+            return
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(run, range(requests)))
+    wall_time = time.perf_counter() - started
+
+    return summarize(latencies, errors, wall_time, concurrency)
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, timeout=5, check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+class BenchmarkRunner:
+    """
+    Mede os endpoints e serviços da integração contra o Bling simulado
+
+    Cache, tokens e limitador ficam em um LocMemCache próprio durante a
+    execução, então os tokens reais (e o Redis, se configurado) não são
+    tocados. O limitador de requisições e o espelho local ficam desligados
+    por padrão para que o resultado reflita o código, não as esperas.
+    """
+
+    def __init__(self, stub, requests=200, concurrency=8, warmup=5, bulk_requests=5,
+                 response_cache=False, rate_limit=False):
+        self.stub = stub
+        self.requests = requests
+        self.concurrency = concurrency
+        self.warmup = warmup
+        self.bulk_requests = bulk_requests
+        self.response_cache = response_cache
+        self.rate_limit = rate_limit
+        self._local = threading.local()
+
+    def settings_overrides(self):
+        overrides = {
+            'BLING_API_BASE_URL': self.stub.url,
+            'CACHES': {
+                'default': {
+                    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                    'LOCATION': 'bling-benchmark',
+                    'TIMEOUT': 3600,
+                    # Com --response-cache cada página e detalhe vira uma entrada
+                    'OPTIONS': {'MAX_ENTRIES': 100000},
+                },
+                settings.BLING_IDENTIFIER_INDEX_CACHE: {
+                    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                    'LOCATION': 'bling-benchmark-identifiers',
+                    'OPTIONS': {'MAX_ENTRIES': 100000},
+                },
+            },
+            'BLING_RESPONSE_CACHE_ENABLED': self.response_cache,
+            'BLING_SERVE_FROM_MIRROR': False,
+            'BLING_MIRROR_WRITE_THROUGH': False,
+            'BLING_SINGLE_FLIGHT_DISTRIBUTED': False,
+        }
+        if not self.rate_limit:
+            overrides['BLING_RATE_LIMIT_PER_SECOND'] = 0
+        return overrides
+
+    def _clear_caches(self):
+        for alias in ('default', settings.BLING_IDENTIFIER_INDEX_CACHE):
+            caches[alias].clear()
+
+    def _client(self):
+        # O Client do Django não é thread-safe: um por thread
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = Client(HTTP_ACCEPT_ENCODING='br, gzip')
+        return client
+
+    def _endpoint_call(self, path):
+        ids = min(self.stub.config['products'], self.stub.config['orders'], 50) or 1
+
+        def call(n):
+            response = self._client().get(path.format(n=(n - 1) % ids + 1))
+            if response.status_code >= 400:
+                raise RuntimeError(f'HTTP {response.status_code}')
+            if response.streaming:
+                b''.join(response.streaming_content)
+
+        return call
+
+    def _service_call(self, name):
+        if name == 'token_refresh':
+            return lambda n: BlingOAuthService().refresh_access_token()
+        return lambda n: getattr(BlingAPIService(), name)()
+
+    def _record(self, results, name, call, requests, concurrency, warmup):
+        self.stub.calls(reset=True)
+        result = measure(call, requests, concurrency, warmup)
+        calls = self.stub.calls(reset=True)
+
+        # Chamadas ao Bling por execução (o aquecimento também passa pelo Bling simulado)
+        runs = (requests + warmup) or 1
+        result['upstream_calls_per_request'] = round(sum(calls.values()) / runs, 2)
+        result['upstream_calls'] = calls
+        results[name] = result
+        return result
+
+    def run(self, only=None, progress=None):
+        """
+        Executa os cenários (todos ou apenas os nomes em `only`)
+
+        Returns:
+            dict: {'meta': {...}, 'results': {nome: métricas}}
+        """
+        results = {}
+
+        with override_settings(**self.settings_overrides()):
+            self._clear_caches()
+            BlingOAuthService()._store_tokens({'access_token': 'benchmark', 'refresh_token': 'benchmark', 'expires_in': 21600})
+
+            for name, path in ENDPOINTS:
+                if only and name not in only:
+                    continue
+                result = self._record(results, name, self._endpoint_call(path), self.requests, self.concurrency, self.warmup)
+                if progress:
+                    progress(name, result)
+
+            for name in SERVICES:
+                if only and name not in only:
+                    continue
+                result = self._record(results, name, self._service_call(name), self.bulk_requests, 1, 1)
+                if progress:
+                    progress(name, result)
+
+            self._clear_caches()
+
+        return {'meta': self.meta(), 'results': results}
+
+    def meta(self):
+        return {
+            'revision': git_revision(),
+            'timestamp': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'argv': sys.argv[1:],
+            'options': {
+                'requests': self.requests,
+                'concurrency': self.concurrency,
+                'warmup': self.warmup,
+                'bulk_requests': self.bulk_requests,
+                'response_cache': self.response_cache,
+                'rate_limit': self.rate_limit,
+            },
+            'stub': self.stub.config,
+        }
+
+
+def compare(baseline, current):
+    """
+    Compara dois resultados (JSON de execuções anteriores)
+
+    Returns:
+        list: [(nome, p50 antes, p50 depois, variação %, vazão antes, vazão depois)]
+    """
+    rows = []
+    for name, after in current['results'].items():
+        before = baseline.get('results', {}).get(name)
+        if before is None:
+            continue
+
+        p50_before = before['latency_ms']['p50']
+        p50_after = after['latency_ms']['p50']
+        change = round((p50_after - p50_before) / p50_before * 100, 1) if p50_before else 0.0
+        rows.append((name, p50_before, p50_after, change, before['throughput_rps'], after['throughput_rps']))
+    return rows
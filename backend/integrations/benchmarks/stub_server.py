@@ -0,0 +1,221 @@
+import json
+import time
+import threading
+
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from ..services.metrics import endpoint_label
+
+
+API_PREFIX = '/Api/v3'
+
+DEFAULT_CONFIG = {
+    # Segundos de espera por endpoint (o prefixo mais longo vence); "default" vale para os demais
+    'latency': {'default': 0.03, '/oauth/token': 0.08},
+    # Quantidade de registros de cada recurso (define o número de páginas)
+    'products': 500,
+    'orders': 500,
+    'contacts': 200,
+    'categories': 20,
+    'items_per_order': 3,
+    # Bytes extras em cada produto/pedido (campo "observacoes"), para simular payloads maiores
+    'payload_bytes': 0,
+}
+
+
+class StubBling:
+    """
+    Bling simulado em uma thread do próprio processo
+
+    Responde produtos, pedidos, contatos, categorias e a renovação de token
+    com dados determinísticos, paginados por "pagina"/"limite" como a API
+    v3. Os corpos são gerados uma vez por URL, então o custo do servidor
+    simulado fica restrito à latência configurada.
+    """
+
+    def __init__(self, config=None):
+        config = dict(config or {})
+        self.config = {**DEFAULT_CONFIG, **config}
+        self.config['latency'] = {**DEFAULT_CONFIG['latency'], **config.get('latency', {})}
+
+        # Prefixos mais longos primeiro para que /pedidos/vendas vença /pedidos
+        self._latency = sorted(
+            ((prefix, seconds) for prefix, seconds in self.config['latency'].items() if prefix != 'default'),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+        self._bodies = {}
+        self._lock = threading.Lock()
+        self._calls = Counter()
+        self._server = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}{API_PREFIX}'
+
+    def start(self, host='127.0.0.1', port=0):
+        """
+        Inicia o servidor e retorna a URL base (equivalente a BLING_API_BASE_URL)
+        """
+        handler = type('StubHandler', (_StubHandler,), {'stub': self})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name='stub-bling', daemon=True).start()
+        return self.url
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def calls(self, reset=False):
+        """
+        Chamadas recebidas por "MÉTODO endpoint" (IDs trocados por {id})
+        """
+        with self._lock:
+            calls = dict(self._calls)
+            if reset:
+                self._calls.clear()
+        return calls
+
+    def latency_for(self, path):
+        for prefix, seconds in self._latency:
+            if path.startswith(prefix):
+                return seconds
+        return self.config['latency'].get('default', 0)
+
+    # RESPOSTAS
+    def respond(self, method, path, query):
+        """
+        Retorna (status, corpo em bytes) para uma chamada
+        """
+        with self._lock:
+            self._calls[f'{method} {endpoint_label(path)}'] += 1
+
+        delay = self.latency_for(path)
+        if delay:
+            time.sleep(delay)
+
+        if method == 'POST' and path == '/oauth/token':
+            token = {'access_token': f'stub-{time.time_ns()}', 'refresh_token': 'stub-refresh', 'expires_in': 21600}
+            return 200, json.dumps(token).encode()
+
+        key = (method, path, tuple(sorted(query.items())))
+        body = self._bodies.get(key)
+        if body is None:
+            status, data = self._build(method, path, query)
+            body = self._bodies[key] = (status, json.dumps(data, ensure_ascii=False).encode())
+        return body
+
+    def _build(self, method, path, query):
+        if method != 'GET':
+            return 405, {'error': {'type': 'METHOD_NOT_ALLOWED'}}
+
+        parts = [part for part in path.split('/') if part]
+        page = int(query.get('pagina', 1))
+        limit = int(query.get('limite', 100))
+
+        if parts == ['produtos']:
+            return 200, self._page(self.config['products'], self._product, page, limit)
+        if parts == ['pedidos', 'vendas']:
+            return 200, self._page(self.config['orders'], self._order, page, limit)
+        if parts == ['contatos']:
+            return 200, self._page(self.config['contacts'], self._contact, page, limit)
+        if parts == ['categorias', 'produtos']:
+            return 200, self._page(self.config['categories'], self._category, page, limit)
+
+        if len(parts) == 2 and parts[0] == 'produtos' and parts[1].isdigit():
+            return self._detail(int(parts[1]), self.config['products'], self._product)
+        if len(parts) == 3 and parts[:2] == ['pedidos', 'vendas'] and parts[2].isdigit():
+            return self._detail(int(parts[2]), self.config['orders'], lambda i: self._order(i, detail=True))
+
+        return 404, {'error': {'type': 'RESOURCE_NOT_FOUND', 'message': 'Recurso não encontrado'}}
+
+    def _page(self, total, build, page, limit):
+        start = (page - 1) * limit + 1
+        return {'data': [build(i) for i in range(start, min(start + limit - 1, total) + 1)]}
+
+    def _detail(self, entity_id, total, build):
+        if not 1 <= entity_id <= total:
+            return 404, {'error': {'type': 'RESOURCE_NOT_FOUND', 'message': 'Recurso não encontrado'}}
+        return 200, {'data': build(entity_id)}
+
+    def _padding(self):
+        return 'x' * self.config['payload_bytes']
+
+    def _product(self, i):
+        return {
+            'id': i,
+            'nome': f'Produto {i}',
+            'codigo': f'SKU-{i:05d}',
+            'preco': round(9.9 + i * 1.5, 2),
+            'tipo': 'P',
+            'situacao': 'A',
+            'formato': 'S',
+            'gtin': f'789{i:010d}',
+            'categoria': {'id': i % max(self.config['categories'], 1) + 1},
+            'estoque': {'saldoVirtualTotal': i % 40},
+            'observacoes': self._padding(),
+        }
+
+    def _order(self, i, detail=False):
+        order = {
+            'id': i,
+            'numero': 1000 + i,
+            'data': f'2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}',
+            'dataSaida': '',
+            'total': round(50 + i * 3.75, 2),
+            'totalProdutos': round(50 + i * 3.75, 2),
+            'situacao': {'id': (6, 9, 15)[i % 3], 'valor': 0},
+            'contato': {'id': i % max(self.config['contacts'], 1) + 1, 'nome': f'Cliente {i}', 'numeroDocumento': ''},
+            'observacoes': self._padding(),
+        }
+        if detail:
+            order['itens'] = [
+                {'codigo': f'SKU-{(i + n) % 1000:05d}', 'descricao': f'Produto {i + n}', 'quantidade': n + 1, 'valor': 10.0 + n}
+                for n in range(self.config['items_per_order'])
+            ]
+        return order
+
+    def _contact(self, i):
+        return {'id': i, 'nome': f'Cliente {i}', 'codigo': f'C{i:05d}', 'situacao': 'A', 'numeroDocumento': '', 'telefone': ''}
+
+    def _category(self, i):
+        return {'id': i, 'descricao': f'Categoria {i}', 'categoriaPai': {'id': 0}}
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, como a API real
+    # Cabeçalhos e corpo saem em escritas separadas: sem isso o Nagle segura o
+    # corpo até o ACK atrasado do cliente (~40 ms por requisição em keep-alive)
+    disable_nagle_algorithm = True
+    stub = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _handle(self, method):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+
+        url = urlparse(self.path)
+        path = url.path[len(API_PREFIX):] if url.path.startswith(API_PREFIX) else url.path
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        status, body = self.stub.respond(method, path, query)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
@@ -0,0 +1,84 @@
+import time
+import hashlib
+import threading
+
+from functools import wraps
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+from .services import timing
+
+
+class ETagStats:
+    """
+    Custo do cálculo das ETags e bytes economizados pelas respostas 304
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {'responses': 0, 'not_modified': 0, 'bytes_hashed': 0, 'bytes_saved': 0, 'hash_seconds': 0.0}
+
+    def record(self, size, elapsed, not_modified):
+        with self._lock:
+            self._stats['responses'] += 1
+            self._stats['bytes_hashed'] += size
+            self._stats['hash_seconds'] += elapsed
+            if not_modified:
+                self._stats['not_modified'] += 1
+                self._stats['bytes_saved'] += size
+
+    def stats(self):
+        with self._lock:
+            data = dict(self._stats)
+
+        data['hash_seconds'] = round(data['hash_seconds'], 6)
+        data['hash_ms_avg'] = round(data['hash_seconds'] * 1000 / data['responses'], 4) if data['responses'] else 0.0
+        data['not_modified_ratio'] = round(data['not_modified'] / data['responses'], 4) if data['responses'] else 0.0
+        return data
+
+
+etag_stats = ETagStats()
+
+
+def content_etag(view_func):
+    """
+    Adiciona ETag (hash do corpo) às respostas GET e responde 304 Not Modified
+    quando o If-None-Match do cliente coincide
+
+    Deve ficar acima de @api_view: a resposta do DRF é renderizada aqui para
+    que o hash seja do JSON que seria enviado. O corpo ainda é gerado a cada
+    chamada; o ganho é não transferi-lo quando nada mudou.
+    """
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        response = view_func(request, *args, **kwargs)
+
+        if (
+            not settings.BLING_ETAG_ENABLED
+            or request.method not in ('GET', 'HEAD')
+            or response.status_code != 200
+            or response.streaming
+            or response.has_header('ETag')
+        ):
+            return response
+
+        if hasattr(response, 'render') and not response.is_rendered:
+            with timing.span('render'):
+                response.render()
+
+        started = time.perf_counter()
+        etag = quote_etag(hashlib.blake2b(response.content, digest_size=16).hexdigest())
+        elapsed = time.perf_counter() - started
+
+        response['ETag'] = etag
+        # Permite guardar a resposta, mas obriga o navegador a revalidar a cada uso
+        patch_cache_control(response, private=True, no_cache=True)
+
+        conditional = get_conditional_response(request, etag=etag, response=response)
+        etag_stats.record(len(response.content), elapsed, conditional is not response)
+        return conditional
+
+    return wrapper
@@ -0,0 +1,120 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from integrations.benchmarks.runner import ENDPOINTS, SERVICES, BenchmarkRunner, compare
+from integrations.benchmarks.stub_server import StubBling
+
+
+class Command(BaseCommand):
+    help = 'Mede vazão e latência (p50/p95/p99) da integração contra um Bling simulado no próprio processo'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Requisições por endpoint')
+        parser.add_argument('--concurrency', type=int, default=8, help='Requisições simultâneas por endpoint')
+        parser.add_argument('--warmup', type=int, default=5, help='Requisições de aquecimento (não medidas)')
+        parser.add_argument(
+            '--bulk-requests', type=int, default=5,
+            help='Execuções de get_all_products, get_all_orders e da renovação de token',
+        )
+        parser.add_argument(
+            '--only', default='',
+            help=f"Cenários separados por vírgula: {', '.join([name for name, _ in ENDPOINTS] + list(SERVICES))}",
+        )
+        parser.add_argument('--latency', type=float, default=None, help='Latência padrão do Bling simulado (segundos)')
+        parser.add_argument(
+            '--endpoint-latency', action='append', default=[], metavar='PREFIXO=SEGUNDOS',
+            help='Latência de um endpoint, ex: /pedidos/vendas=0.2 (pode repetir)',
+        )
+        parser.add_argument('--products', type=int, default=None, help='Produtos no Bling simulado')
+        parser.add_argument('--orders', type=int, default=None, help='Pedidos no Bling simulado')
+        parser.add_argument('--payload-bytes', type=int, default=None, help='Bytes extras por produto/pedido')
+        parser.add_argument('--response-cache', action='store_true', help='Mantém o cache de respostas ligado')
+        parser.add_argument('--rate-limit', action='store_true', help='Mantém o limitador de requisições ligado')
+        parser.add_argument('--output', default=None, help='Arquivo JSON com os resultados')
+        parser.add_argument('--compare', default=None, help='JSON de uma execução anterior para comparar')
+        parser.add_argument(
+            '--max-regression', type=float, default=None,
+            help='Falha se o p50 de algum cenário piorar mais que este percentual em relação ao --compare',
+        )
+
+    def handle(self, *args, **options):
+        only = {name.strip() for name in options['only'].split(',') if name.strip()}
+        invalid = only - {name for name, _ in ENDPOINTS} - set(SERVICES)
+        if invalid:
+            raise CommandError(f"Cenários inválidos: {', '.join(sorted(invalid))}")
+
+        stub = StubBling(self._stub_config(options))
+        stub.start()
+
+        runner = BenchmarkRunner(
+            stub,
+            requests=options['requests'],
+            concurrency=options['concurrency'],
+            warmup=options['warmup'],
+            bulk_requests=options['bulk_requests'],
+            response_cache=options['response_cache'],
+            rate_limit=options['rate_limit'],
+        )
+
+        self.stdout.write(f'Bling simulado em {stub.url}')
+        self.stdout.write(f"{'cenário':<18} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'erros':>6} {'bling/req':>10}")
+
+        try:
+            data = runner.run(only=only or None, progress=self._print_result)
+        finally:
+            stub.stop()
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump(data, output, indent=2, ensure_ascii=False)
+            self.stdout.write(self.style.SUCCESS(f"Resultados gravados em {options['output']}"))
+
+        if options['compare']:
+            self._compare(options['compare'], data, options['max_regression'])
+
+    def _stub_config(self, options):
+        config = {'latency': {}}
+        if options['latency'] is not None:
+            config['latency']['default'] = options['latency']
+
+        for value in options['endpoint_latency']:
+            prefix, _, seconds = value.partition('=')
+            try:
+                config['latency'][prefix] = float(seconds)
+            except ValueError:
+                raise CommandError(f'--endpoint-latency inválido: {value} (use PREFIXO=SEGUNDOS)')
+
+        for option, key in (('products', 'products'), ('orders', 'orders'), ('payload_bytes', 'payload_bytes')):
+            if options[option] is not None:
+                config[key] = options[option]
+        return config
+
+    def _print_result(self, name, result):
+        latency = result['latency_ms']
+        self.stdout.write(
+            f"{name:<18} {result['throughput_rps']:>9.1f} {latency['p50']:>9.1f} {latency['p95']:>9.1f} "
+            f"{latency['p99']:>9.1f} {result['errors']:>6} {result['upstream_calls_per_request']:>10}"
+        )
+
+    def _compare(self, path, data, max_regression):
+        try:
+            with open(path, encoding='utf-8') as baseline_file:
+                baseline = json.load(baseline_file)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Não foi possível ler {path}: {e}')
+
+        revision = baseline.get('meta', {}).get('revision') or path
+        self.stdout.write(f'\nComparação com {revision}:')
+        self.stdout.write(f"{'cenário':<18} {'p50 antes':>10} {'p50 agora':>10} {'variação':>9} {'req/s antes':>12} {'req/s agora':>12}")
+
+        regressions = []
+        for name, before, after, change, rps_before, rps_after in compare(baseline, data):
+            line = f'{name:<18} {before:>10.1f} {after:>10.1f} {change:>+8.1f}% {rps_before:>12.1f} {rps_after:>12.1f}'
+            if max_regression is not None and change > max_regression:
+                regressions.append(name)
+                line = self.style.ERROR(line)
+            self.stdout.write(line)
+
+        if regressions:
+            raise CommandError(f"p50 piorou mais de {max_regression}% em: {', '.join(regressions)}")
@@ -0,0 +1,38 @@
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from integrations.services.jobs import JobWorker
+
+
+class Command(BaseCommand):
+    help = 'Executa as tarefas em segundo plano (sincronização, exportação) e os agendamentos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads', type=int, default=settings.BLING_WORKER_THREADS,
+            help='Tarefas executadas em paralelo',
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=settings.BLING_WORKER_POLL_INTERVAL,
+            help='Segundos entre as consultas à fila',
+        )
+        parser.add_argument('--once', action='store_true', help='Executa um único ciclo e aguarda as tarefas')
+
+    def handle(self, *args, **options):
+        stop_event = threading.Event()
+
+        def stop(signum, frame):
+            self.stdout.write('Encerrando: aguardando as tarefas em andamento...')
+            stop_event.set()
+
+        signal.signal(signal.SIGINT, stop)
+        signal.signal(signal.SIGTERM, stop)
+
+        worker = JobWorker(threads=options['threads'])
+        self.stdout.write(self.style.SUCCESS(f'Worker {worker.name} iniciado com {worker.threads} threads'))
+
+        worker.run(poll_interval=options['poll_interval'], stop_event=stop_event, once=options['once'])
+        self.stdout.write(self.style.SUCCESS('Worker encerrado'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from integrations.services.product_search import ProductSearchIndex
+
+
+class Command(BaseCommand):
+    help = 'Recria o índice de busca textual (FTS5) a partir dos produtos do espelho local'
+
+    def handle(self, *args, **options):
+        index = ProductSearchIndex()
+        if not index.available():
+            raise CommandError('Busca local indisponível: requer SQLite com a migração 0007 aplicada')
+
+        total = index.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'{total} produtos indexados'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from integrations.services.sales_rollup import SalesRollupService
+
+
+class Command(BaseCommand):
+    help = 'Recalcula os agregados diários de vendas a partir dos pedidos do espelho local'
+
+    def handle(self, *args, **options):
+        total = SalesRollupService().rebuild()
+        self.stdout.write(self.style.SUCCESS(f'{total} linhas de vendas por dia geradas'))
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from integrations.services.sync import BlingSyncService
+
+
+class Command(BaseCommand):
+    help = 'Sincroniza produtos, pedidos, categorias e contatos do Bling com o banco local'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--resources',
+            default=','.join(BlingSyncService.RESOURCES),
+            help='Recursos separados por vírgula (padrão: todos)',
+        )
+        parser.add_argument('--batch-size', type=int, default=None, help='Itens gravados por lote')
+        parser.add_argument('--max-pages', type=int, default=None, help='Limite de páginas por recurso')
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help="Busca apenas produtos e pedidos alterados desde a última execução (marca d'água)",
+        )
+
+    def handle(self, *args, **options):
+        resources = [r.strip() for r in options['resources'].split(',') if r.strip()]
+        invalid = set(resources) - set(BlingSyncService.RESOURCES)
+        if invalid:
+            raise CommandError(f"Recursos inválidos: {', '.join(sorted(invalid))}")
+
+        def progress(resource, total):
+            self.stdout.write(f'  {resource}: {total} itens gravados')
+
+        try:
+            results = BlingSyncService().sync_all(
+                resources,
+                batch_size=options['batch_size'],
+                max_pages=options['max_pages'],
+                progress=progress,
+                incremental=options['incremental'],
+            )
+        except Exception as e:
+            raise CommandError(f'Erro na sincronização: {e}')
+
+        for resource, total in results.items():
+            self.stdout.write(self.style.SUCCESS(f'{resource}: {total} itens sincronizados'))
@@ -0,0 +1,235 @@
+import re
+import time
+import gzip
+import zlib
+import logging
+import threading
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional: sem ele, apenas gzip
+    brotli = None
+
+from .services import timing
+
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/')
+
+_accept_encoding_re = re.compile(r'\s*([^\s;,]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?')
+
+
+class CompressionStats:
+    """
+    Bytes antes/depois da compressão, por codificação
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {'skipped': 0}
+
+    def record(self, encoding, size_in, size_out):
+        with self._lock:
+            entry = self._stats.setdefault(encoding, {'responses': 0, 'bytes_in': 0, 'bytes_out': 0})
+            entry['responses'] += 1
+            entry['bytes_in'] += size_in
+            entry['bytes_out'] += size_out
+
+    def skip(self):
+        with self._lock:
+            self._stats['skipped'] += 1
+
+    def stats(self):
+        with self._lock:
+            data = {key: dict(value) if isinstance(value, dict) else value for key, value in self._stats.items()}
+
+        for value in data.values():
+            if isinstance(value, dict):
+                value['ratio'] = round(value['bytes_out'] / value['bytes_in'], 4) if value['bytes_in'] else 0.0
+        return data
+
+
+compression_stats = CompressionStats()
+
+
+def accepted_encodings(header):
+    """
+    Codificações aceitas pelo cliente no Accept-Encoding, com q > 0
+    """
+    accepted = set()
+    for name, quality in _accept_encoding_re.findall(header or ''):
+        try:
+            if quality and float(quality) <= 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(name.lower())
+    return accepted
+
+
+class _GzipStream:
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data):
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliStream:
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compressão negociada (brotli ou gzip) das respostas JSON da integração
+
+    Aplica-se às rotas em COMPRESSION_PATH_PREFIXES acima de
+    COMPRESSION_MIN_BYTES, inclusive às respostas em streaming (cada bloco é
+    descarregado em seguida, para o cliente continuar recebendo as linhas
+    NDJSON conforme são geradas). Os níveis padrão priorizam latência em
+    vez da taxa máxima de compressão.
+    """
+
+    def process_response(self, request, response):
+        if not any(request.path.startswith(prefix) for prefix in settings.COMPRESSION_PATH_PREFIXES):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        if not self._should_compress(response):
+            return response
+
+        encoding = self._negotiate(request)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = self._compress_stream(response.streaming_content, encoding)
+            del response['Content-Length']
+        else:
+            original = response.content
+            with timing.span('compress', encoding):
+                compressed = self._compress(original, encoding)
+            if len(compressed) >= len(original):
+                compression_stats.skip()
+                return response
+
+            compression_stats.record(encoding, len(original), len(compressed))
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        # O corpo mudou: a ETag forte passa a ser fraca (mesma regra do GZipMiddleware do Django)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+
+        response['Content-Encoding'] = encoding
+        return response
+
+    def _should_compress(self, response):
+        if response.status_code != 200 or response.has_header('Content-Encoding'):
+            return False
+        if not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES):
+            return False
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_BYTES:
+            compression_stats.skip()
+            return False
+        return True
+
+    def _negotiate(self, request):
+        accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING'))
+        if brotli is not None and 'br' in accepted:
+            return 'br'
+        if 'gzip' in accepted or '*' in accepted:
+            return 'gzip'
+        return None
+
+    def _compress(self, data, encoding):
+        if encoding == 'br':
+            return brotli.compress(data, quality=settings.COMPRESSION_BROTLI_QUALITY)
+        return gzip.compress(data, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+    def _compress_stream(self, chunks, encoding):
+        if encoding == 'br':
+            stream = _BrotliStream(settings.COMPRESSION_BROTLI_QUALITY)
+        else:
+            stream = _GzipStream(settings.COMPRESSION_GZIP_LEVEL)
+
+        size_in = size_out = 0
+        try:
+            for chunk in chunks:
+                size_in += len(chunk)
+                data = stream.compress(chunk)
+                size_out += len(data)
+                if data:
+                    yield data
+
+            data = stream.finish()
+            size_out += len(data)
+            yield data
+        finally:
+            compression_stats.record(encoding, size_in, size_out)
+
+
+class ServerTimingMiddleware(MiddlewareMixin):
+    """
+    Header Server-Timing com a linha do tempo da requisição
+
+    Soma por categoria o tempo de autenticação (auth), espera no limite de
+    requisições (wait), consultas ao cache de respostas (cache), chamadas ao
+    Bling (bling, também listadas uma a uma), serialização (render) e
+    compressão (compress). Com SLOW_REQUEST_LOG_MS, requisições acima do
+    limite têm a linha do tempo completa gravada no log.
+
+    Em respostas em streaming o header sai antes do corpo, então cobre
+    apenas o trecho até o início do envio.
+    """
+
+    def process_request(self, request):
+        if not settings.SERVER_TIMING_ENABLED:
+            return
+        if not any(request.path.startswith(prefix) for prefix in settings.SERVER_TIMING_PATH_PREFIXES):
+            return
+        request.timeline = timing.start()
+
+    def process_template_response(self, request, response):
+        timeline = getattr(request, 'timeline', None)
+        if timeline is not None and not response.is_rendered:
+            # O Django renderiza logo após este método; o callback marca o fim
+            started = time.perf_counter()
+            response.add_post_render_callback(
+                lambda rendered: timeline.add('render', time.perf_counter() - started, '', started)
+            )
+        return response
+
+    def process_response(self, request, response):
+        timeline = getattr(request, 'timeline', None)
+        if timeline is None:
+            return response
+
+        timing.finish()
+        response['Server-Timing'] = timeline.server_timing(settings.SERVER_TIMING_MAX_ENTRIES)
+
+        elapsed_ms = timeline.elapsed() * 1000
+        if settings.SLOW_REQUEST_LOG_MS and elapsed_ms >= settings.SLOW_REQUEST_LOG_MS:
+            lines = '\n'.join(timeline.breakdown())
+            logger.warning(
+                f"Requisição lenta: {request.method} {request.get_full_path()} -> {response.status_code} "
+                f"em {elapsed_ms:.1f} ms\n{lines}"
+            )
+        return response
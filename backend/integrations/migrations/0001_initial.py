@@ -0,0 +1,119 @@
+# Generated by Django 5.2.5 on 2026-10-17 00:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Category',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bling_id', models.BigIntegerField(unique=True)),
+                ('descricao', models.CharField(blank=True, max_length=255)),
+                ('categoria_pai_id', models.BigIntegerField(blank=True, null=True)),
+                ('raw', models.JSONField(default=dict)),
+                ('synced_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'categoria',
+                'verbose_name_plural': 'categorias',
+            },
+        ),
+        migrations.CreateModel(
+            name='Contact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bling_id', models.BigIntegerField(unique=True)),
+                ('nome', models.CharField(blank=True, max_length=255)),
+                ('codigo', models.CharField(blank=True, max_length=120)),
+                ('numero_documento', models.CharField(blank=True, db_index=True, max_length=30)),
+                ('situacao', models.CharField(blank=True, max_length=10)),
+                ('raw', models.JSONField(default=dict)),
+                ('synced_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'contato',
+                'verbose_name_plural': 'contatos',
+            },
+        ),
+        migrations.CreateModel(
+            name='Order',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bling_id', models.BigIntegerField(unique=True)),
+                ('numero', models.CharField(blank=True, db_index=True, max_length=50)),
+                ('data', models.DateField(blank=True, db_index=True, null=True)),
+                ('total', models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True)),
+                ('situacao_id', models.BigIntegerField(blank=True, db_index=True, null=True)),
+                ('contato_id', models.BigIntegerField(blank=True, null=True)),
+                ('contato_nome', models.CharField(blank=True, max_length=255)),
+                ('raw', models.JSONField(default=dict)),
+                ('synced_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'pedido',
+                'verbose_name_plural': 'pedidos',
+            },
+        ),
+        migrations.CreateModel(
+            name='Product',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bling_id', models.BigIntegerField(unique=True)),
+                ('codigo', models.CharField(blank=True, db_index=True, max_length=120)),
+                ('nome', models.CharField(blank=True, max_length=255)),
+                ('preco', models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True)),
+                ('tipo', models.CharField(blank=True, max_length=10)),
+                ('situacao', models.CharField(blank=True, max_length=10)),
+                ('formato', models.CharField(blank=True, max_length=10)),
+                ('categoria_id', models.BigIntegerField(blank=True, db_index=True, null=True)),
+                ('raw', models.JSONField(default=dict)),
+                ('synced_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'produto',
+                'verbose_name_plural': 'produtos',
+            },
+        ),
+        migrations.CreateModel(
+            name='OrderItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('produto_id', models.BigIntegerField(blank=True, null=True)),
+                ('codigo', models.CharField(blank=True, max_length=120)),
+                ('descricao', models.CharField(blank=True, max_length=255)),
+                ('quantidade', models.DecimalField(blank=True, decimal_places=4, max_digits=14, null=True)),
+                ('valor', models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True)),
+                ('raw', models.JSONField(default=dict)),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='integrations.order')),
+            ],
+            options={
+                'verbose_name': 'item de pedido',
+                'verbose_name_plural': 'itens de pedido',
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductVariation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bling_id', models.BigIntegerField(unique=True)),
+                ('codigo', models.CharField(blank=True, db_index=True, max_length=120)),
+                ('nome', models.CharField(blank=True, max_length=255)),
+                ('raw', models.JSONField(default=dict)),
+                ('synced_at', models.DateTimeField(auto_now=True)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='variations', to='integrations.product')),
+            ],
+            options={
+                'verbose_name': 'variação de produto',
+                'verbose_name_plural': 'variações de produto',
+            },
+        ),
+    ]
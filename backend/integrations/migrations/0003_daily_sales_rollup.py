@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-17 00:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integrations', '0002_sync_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('situacao_id', models.BigIntegerField(default=0)),
+                ('order_count', models.IntegerField(default=0)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+            ],
+            options={
+                'verbose_name': 'vendas do dia',
+                'verbose_name_plural': 'vendas por dia',
+                'constraints': [models.UniqueConstraint(fields=('day', 'situacao_id'), name='unique_sales_rollup_day_situacao')],
+            },
+        ),
+    ]
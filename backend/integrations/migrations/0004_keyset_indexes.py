@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-17 00:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integrations', '0003_daily_sales_rollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['nome', 'bling_id'], name='contact_nome_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['-data', '-bling_id'], name='order_data_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-17 00:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integrations', '0004_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebhookEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.CharField(max_length=100, unique=True)),
+                ('event', models.CharField(max_length=50)),
+                ('resource', models.CharField(max_length=30)),
+                ('entity_id', models.BigIntegerField(blank=True, null=True)),
+                ('occurred_at', models.DateTimeField(blank=True, null=True)),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('status', models.CharField(blank=True, choices=[('applied', 'aplicado'), ('stale', 'desatualizado'), ('ignored', 'ignorado'), ('failed', 'falhou')], max_length=10)),
+                ('error', models.TextField(blank=True)),
+                ('payload', models.JSONField(default=dict)),
+            ],
+            options={
+                'verbose_name': 'evento de webhook',
+                'verbose_name_plural': 'eventos de webhook',
+                'indexes': [models.Index(fields=['resource', 'entity_id', 'occurred_at'], name='webhook_entity_order_idx')],
+            },
+        ),
+    ]
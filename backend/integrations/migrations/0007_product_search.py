@@ -0,0 +1,43 @@
+from django.db import migrations
+
+
+# Busca textual dos produtos (SQLite FTS5): sem acentos e com índices de prefixo.
+# Em outros bancos a tabela não é criada e a busca do espelho usa icontains.
+CREATE_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS integrations_product_search USING fts5(
+    nome, codigo, gtin, categoria,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3 4'
+)
+"""
+
+POPULATE_SQL = """
+INSERT INTO integrations_product_search (rowid, nome, codigo, gtin, categoria)
+SELECT p.id, p.nome, p.codigo, COALESCE(json_extract(p.raw, '$.gtin'), ''), COALESCE(c.descricao, '')
+FROM integrations_product p
+LEFT JOIN integrations_category c ON c.bling_id = p.categoria_id
+"""
+
+
+def create_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(CREATE_SQL)
+    schema_editor.execute(POPULATE_SQL)
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute('DROP TABLE IF EXISTS integrations_product_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integrations', '0006_jobs'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
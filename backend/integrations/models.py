@@ -0,0 +1,280 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Category(models.Model):
+    """
+    Categoria de produtos espelhada do Bling
+    """
+
+    bling_id = models.BigIntegerField(unique=True)
+    descricao = models.CharField(max_length=255, blank=True)
+    categoria_pai_id = models.BigIntegerField(null=True, blank=True)
+    raw = models.JSONField(default=dict)
+    synced_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'categoria'
+        verbose_name_plural = 'categorias'
+
+    def __str__(self):
+        return self.descricao or str(self.bling_id)
+
+
+class Product(models.Model):
+    """
+    Produto espelhado do Bling (payload completo em raw)
+    """
+
+    bling_id = models.BigIntegerField(unique=True)
+    codigo = models.CharField(max_length=120, blank=True, db_index=True)
+    nome = models.CharField(max_length=255, blank=True)
+    preco = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    tipo = models.CharField(max_length=10, blank=True)
+    situacao = models.CharField(max_length=10, blank=True)
+    formato = models.CharField(max_length=10, blank=True)
+    categoria_id = models.BigIntegerField(null=True, blank=True, db_index=True)
+    raw = models.JSONField(default=dict)
+    synced_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'produto'
+        verbose_name_plural = 'produtos'
+
+    def __str__(self):
+        return f'{self.codigo} - {self.nome}'
+
+
+class ProductVariation(models.Model):
+    """
+    Variação de um produto (vem em "variacoes" no detalhe do produto)
+    """
+
+    bling_id = models.BigIntegerField(unique=True)
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='variations')
+    codigo = models.CharField(max_length=120, blank=True, db_index=True)
+    nome = models.CharField(max_length=255, blank=True)
+    raw = models.JSONField(default=dict)
+    synced_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'variação de produto'
+        verbose_name_plural = 'variações de produto'
+
+    def __str__(self):
+        return f'{self.codigo} - {self.nome}'
+
+
+class Contact(models.Model):
+    """
+    Contato (cliente/fornecedor) espelhado do Bling
+    """
+
+    bling_id = models.BigIntegerField(unique=True)
+    nome = models.CharField(max_length=255, blank=True)
+    codigo = models.CharField(max_length=120, blank=True)
+    numero_documento = models.CharField(max_length=30, blank=True, db_index=True)
+    situacao = models.CharField(max_length=10, blank=True)
+    raw = models.JSONField(default=dict)
+    synced_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'contato'
+        verbose_name_plural = 'contatos'
+        indexes = [
+            models.Index(fields=['nome', 'bling_id'], name='contact_nome_keyset_idx'),
+        ]
+
+    def __str__(self):
+        return self.nome or str(self.bling_id)
+
+
+class Order(models.Model):
+    """
+    Pedido de venda espelhado do Bling
+    """
+
+    bling_id = models.BigIntegerField(unique=True)
+    numero = models.CharField(max_length=50, blank=True, db_index=True)
+    data = models.DateField(null=True, blank=True, db_index=True)
+    total = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    situacao_id = models.BigIntegerField(null=True, blank=True, db_index=True)
+    contato_id = models.BigIntegerField(null=True, blank=True)
+    contato_nome = models.CharField(max_length=255, blank=True)
+    raw = models.JSONField(default=dict)
+    synced_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'pedido'
+        verbose_name_plural = 'pedidos'
+        indexes = [
+            # Paginação por cursor (mais recentes primeiro)
+            models.Index(fields=['-data', '-bling_id'], name='order_data_keyset_idx'),
+        ]
+
+    def __str__(self):
+        return f'Pedido {self.numero or self.bling_id}'
+
+
+class OrderItem(models.Model):
+    """
+    Item de um pedido (disponível apenas no detalhe do pedido)
+    """
+
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='items')
+    produto_id = models.BigIntegerField(null=True, blank=True)
+    codigo = models.CharField(max_length=120, blank=True)
+    descricao = models.CharField(max_length=255, blank=True)
+    quantidade = models.DecimalField(max_digits=14, decimal_places=4, null=True, blank=True)
+    valor = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    raw = models.JSONField(default=dict)
+
+    class Meta:
+        verbose_name = 'item de pedido'
+        verbose_name_plural = 'itens de pedido'
+
+    def __str__(self):
+        return f'{self.codigo} x {self.quantidade}'
+
+
+class SyncState(models.Model):
+    """
+    Marca d'água da sincronização incremental de cada recurso
+    """
+
+    resource = models.CharField(max_length=50, unique=True)
+    watermark = models.DateTimeField(null=True, blank=True)
+    last_run_at = models.DateTimeField(null=True, blank=True)
+    last_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'estado de sincronização'
+        verbose_name_plural = 'estados de sincronização'
+
+    def __str__(self):
+        return f'{self.resource} ({self.watermark})'
+
+
+class DailySalesRollup(models.Model):
+    """
+    Vendas agregadas por dia e situação, mantidas a cada gravação de pedidos
+    """
+
+    day = models.DateField()
+    # 0 = pedido sem situação (evita NULL na restrição de unicidade)
+    situacao_id = models.BigIntegerField(default=0)
+    order_count = models.IntegerField(default=0)
+    total = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+
+    class Meta:
+        verbose_name = 'vendas do dia'
+        verbose_name_plural = 'vendas por dia'
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'situacao_id'], name='unique_sales_rollup_day_situacao'),
+        ]
+
+    def __str__(self):
+        return f'{self.day} ({self.situacao_id}): {self.order_count} pedidos'
+
+
+class WebhookEvent(models.Model):
+    """
+    Evento recebido pelo webhook do Bling (deduplicação e ordem por entidade)
+    """
+
+    STATUS_APPLIED = 'applied'
+    STATUS_STALE = 'stale'
+    STATUS_IGNORED = 'ignored'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_APPLIED, 'aplicado'),
+        (STATUS_STALE, 'desatualizado'),
+        (STATUS_IGNORED, 'ignorado'),
+        (STATUS_FAILED, 'falhou'),
+    ]
+
+    event_id = models.CharField(max_length=100, unique=True)
+    event = models.CharField(max_length=50)
+    resource = models.CharField(max_length=30)
+    entity_id = models.BigIntegerField(null=True, blank=True)
+    occurred_at = models.DateTimeField(null=True, blank=True)
+    received_at = models.DateTimeField(auto_now_add=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, blank=True)
+    error = models.TextField(blank=True)
+    payload = models.JSONField(default=dict)
+
+    class Meta:
+        verbose_name = 'evento de webhook'
+        verbose_name_plural = 'eventos de webhook'
+        indexes = [
+            models.Index(fields=['resource', 'entity_id', 'occurred_at'], name='webhook_entity_order_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.event} {self.entity_id} ({self.event_id})'
+
+
+class Schedule(models.Model):
+    """
+    Agendamento periódico de uma tarefa (BLING_JOB_SCHEDULES)
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    kind = models.CharField(max_length=50)
+    params = models.JSONField(default=dict, blank=True)
+    interval_seconds = models.PositiveIntegerField()
+    enabled = models.BooleanField(default=True)
+    next_run_at = models.DateTimeField(default=timezone.now)
+    last_enqueued_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'agendamento'
+        verbose_name_plural = 'agendamentos'
+
+    def __str__(self):
+        return f'{self.name} (a cada {self.interval_seconds}s)'
+
+
+class Job(models.Model):
+    """
+    Tarefa em segundo plano executada pelo manage.py bling_worker
+    """
+
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'na fila'),
+        (STATUS_RUNNING, 'em execução'),
+        (STATUS_SUCCEEDED, 'concluída'),
+        (STATUS_FAILED, 'falhou'),
+    ]
+
+    kind = models.CharField(max_length=50)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    run_after = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    progress_current = models.BigIntegerField(default=0)
+    progress_total = models.BigIntegerField(null=True, blank=True)
+    progress_message = models.CharField(max_length=255, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    worker = models.CharField(max_length=100, blank=True)
+    schedule = models.ForeignKey(Schedule, null=True, blank=True, on_delete=models.SET_NULL, related_name='jobs')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'tarefa'
+        verbose_name_plural = 'tarefas'
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='job_claim_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} #{self.pk} ({self.status})'
@@ -1,7 +1,23 @@
+import time
 import requests
 import logging
 
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+
 from .bling_oauth import BlingOAuthService
+from .http_client import get_http_client
+from .rate_limiter import BlingRateLimiter, retry_delay
+from .response_cache import BlingResponseCache
+from .single_flight import get_single_flight
+from .cache_lock import acquire_lock, release_lock
+from .identifier_index import IdentifierIndex
+from .metrics import get_metrics, endpoint_label
+from .circuit_breaker import BlingCircuitBreaker, UpstreamUnavailable
+from . import timing
+from ..models import Order, Product, SyncState
 
 
 logger = logging.getLogger(__name__)
@@ -12,39 +28,215 @@ class BlingAPIService:
     Serviço para consumir a API do Bling ERP
     """
 
+    # Limite máximo de itens por página na API v3
+    PAGE_SIZE = 100
+
     def __init__(self):
         # URL correta da API do Bling
-        self.api_url = "https://www.bling.com.br/Api/v3"
+        self.api_url = settings.BLING_API_BASE_URL
         self.oauth_service = BlingOAuthService()
+        self.http = get_http_client()
+        self.rate_limiter = BlingRateLimiter()
+        self.max_retries = settings.BLING_RATE_LIMIT_MAX_RETRIES
+        self.response_cache = BlingResponseCache()
+        self.single_flight = get_single_flight()
+        self.identifier_index = IdentifierIndex()
+        self.metrics = get_metrics()
+        self.circuit_breaker = BlingCircuitBreaker()
 
-    def _make_request(self, method, endpoint, params=None, data=None):
+        # Tempo aguardando o limite de requisições (última chamada e acumulado)
+        self.last_wait_time = 0.0
+        self.total_wait_time = 0.0
+
+    def _make_request(self, method, endpoint, params=None, data=None, use_cache=True, on_fetch=None):
         """
         Faz requisições autenticadas para a API do Bling
+
+        GETs passam pelo cache de respostas (TTL por recurso); escritas
+        invalidam o cache do recurso afetado. on_fetch é chamado com a
+        resposta apenas quando ela veio do Bling, não em acertos do cache.
+        """
+        if method.upper() == 'GET':
+            if not use_cache:
+                return self._coalesced_get(endpoint, params, on_fetch)
+            return self.response_cache.fetch(
+                endpoint,
+                params,
+                lambda: self._coalesced_get(endpoint, params, on_fetch),
+            )
+
+        result = self._send_request(method, endpoint, params, data)
+
+        if method.upper() != 'GET':
+            self.response_cache.invalidate(endpoint)
+
+        return result
+
+    def _record_products(self, response):
+        # Só respostas vindas do Bling: acertos do cache já foram indexados
+        self.identifier_index.record_products((response or {}).get('data'))
+
+    def _record_orders(self, response):
+        self.identifier_index.record_orders((response or {}).get('data'))
+
+    def _on_orders_fetched(self, response):
+        # Listagem vinda do Bling: indexa e grava no espelho (acertos do cache já foram gravados)
+        self._record_orders(response)
+        self._write_through_orders((response or {}).get('data'))
+
+    def _on_order_fetched(self, response):
+        if response and response.get('data'):
+            self._write_through_orders([response['data']])
+
+    def invalidate_cache(self, endpoint=None):
+        """
+        Invalida as respostas em cache de um recurso (ou de todos)
+        """
+        self.response_cache.invalidate(endpoint)
+
+    def _coalesced_get(self, endpoint, params=None, on_fetch=None):
+        """
+        GET agrupado: chamadas idênticas simultâneas compartilham uma requisição
+        """
+        key = self.response_cache.make_key(endpoint, params)
+        return self.single_flight.do(key, lambda: self._leader_get(endpoint, params, key, on_fetch))
+
+    def _fetch(self, endpoint, params, on_fetch=None):
+        """
+        GET no Bling, repassando a resposta ao on_fetch
+        """
+        data = self._send_request('GET', endpoint, params)
+        if on_fetch:
+            on_fetch(data)
+        return data
+
+    def _leader_get(self, endpoint, params, key, on_fetch=None):
+        """
+        Executa o GET; no modo distribuído, aguarda o resultado de outro worker
+        que já esteja buscando a mesma resposta
+        """
+        distributed = (
+            settings.BLING_SINGLE_FLIGHT_DISTRIBUTED
+            and self.response_cache.enabled
+            and self.response_cache.policy_for(endpoint)
+        )
+        if not distributed:
+            return self._fetch(endpoint, params, on_fetch)
+
+        lock_key = f'bling_inflight:{key}'
+        token = acquire_lock(lock_key, timeout=int(settings.BLING_SINGLE_FLIGHT_WAIT) + 1)
+
+        if token is None:
+            data = self._wait_remote_result(endpoint, params, lock_key)
+            if data is not None:
+                self.single_flight.add_remote_collapse()
+                return data
+
+        try:
+            data = self._fetch(endpoint, params, on_fetch)
+            # Grava antes de liberar a trava: quem está aguardando só vê a
+            # trava livre depois que a resposta já está no cache
+            self.response_cache.set(endpoint, params, data)
+            return data
+        finally:
+            release_lock(lock_key, token)
+
+    def _wait_remote_result(self, endpoint, params, lock_key):
+        """
+        Aguarda outro worker salvar a resposta no cache (None se não salvar a tempo)
+        """
+        deadline = time.monotonic() + settings.BLING_SINGLE_FLIGHT_WAIT
+
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            leader_done = cache.get(lock_key) is None
+
+            data, state = self.response_cache.get(endpoint, params)
+            if state == 'fresh':
+                return data
+            if leader_done:
+                return None
+
+        return None
+
+    def _send_request(self, method, endpoint, params=None, data=None):
+        """
+        Envia a requisição ao Bling respeitando o limite de requisições
+
+        Raises:
+            UpstreamUnavailable: Timeout, falha de conexão, HTTP 5xx ou
+                circuito do recurso aberto (CircuitOpen)
         """
         try:
-            access_token = self.oauth_service.get_valid_access_token()
+            with timing.span('auth'):
+                access_token = self.oauth_service.get_valid_access_token()
         except ValueError as e:
             raise Exception(f"Erro de autenticação: {e}")
 
         headers = {
             'Authorization': f'Bearer {access_token}',
-            'Accept': 'application/json',
             'Content-Type': 'application/json'
         }
 
         url = f"{self.api_url}{endpoint}"
 
+        if method.upper() not in ('GET', 'POST', 'PUT', 'DELETE'):
+            raise ValueError(f"Método HTTP {method} não suportado")
+
+        waited = 0.0
+        labels = {'method': method.upper(), 'endpoint': endpoint_label(endpoint)}
+
+        resource = self.circuit_breaker.resource_for(endpoint)
+        self.circuit_breaker.before_call(resource)
+
         try:
-            if method.upper() == 'GET':
-                response = requests.get(url, headers=headers, params=params)
-            elif method.upper() == 'POST':
-                response = requests.post(url, headers=headers, json=data, params=params)
-            elif method.upper() == 'PUT':
-                response = requests.put(url, headers=headers, json=data, params=params)
-            elif method.upper() == 'DELETE':
-                response = requests.delete(url, headers=headers, params=params)
+            for attempt in range(self.max_retries + 1):
+                wait = self.rate_limiter.acquire()
+                waited += wait
+                if wait:
+                    timing.record('wait', wait, labels['endpoint'])
+
+                started = time.perf_counter()
+                outcome = 'error'
+                try:
+                    if method.upper() in ('POST', 'PUT'):
+                        response = self.http.request(method, url, headers=headers, json=data, params=params)
+                    else:
+                        response = self.http.request(method, url, headers=headers, params=params)
+                    outcome = str(response.status_code)
+                except requests.exceptions.RequestException:
+                    self.metrics.inc('bling_upstream_responses_total', status='error', **labels)
+                    raise
+                finally:
+                    elapsed = time.perf_counter() - started
+                    self.metrics.observe('bling_upstream_request_duration_seconds', elapsed, **labels)
+                    timing.record('bling', elapsed, f"{labels['method']} {labels['endpoint']} {outcome}")
+
+                self.metrics.inc('bling_upstream_responses_total', status=outcome, **labels)
+
+                if response.status_code != 429 or attempt == self.max_retries:
+                    break
+
+                self.metrics.inc('bling_upstream_retries_total', **labels)
+
+                # 429: suspende todos os workers e tenta novamente após o Retry-After
+                delay = retry_delay(response, attempt)
+                logger.warning(
+                    f"Limite de requisições do Bling atingido em {endpoint}, "
+                    f"nova tentativa em {delay:.2f}s ({attempt + 1}/{self.max_retries})"
+                )
+                self.rate_limiter.block_for(delay)
+
+            self.last_wait_time = waited
+            self.total_wait_time += waited
+            if waited > 0:
+                self.metrics.inc('bling_rate_limit_wait_seconds_total', waited)
+                logger.info(f"Aguardou {waited:.3f}s pelo limite de requisições do Bling ({method.upper()} {endpoint})")
+
+            if response.status_code >= 500:
+                self.circuit_breaker.record_failure(resource, f'HTTP {response.status_code}')
             else:
-                raise ValueError(f"Método HTTP {method} não suportado")
+                self.circuit_breaker.record_success(resource, elapsed)
 
             response.raise_for_status()
 
@@ -52,18 +244,27 @@ class BlingAPIService:
             if response.status_code == 204:
                 return None
 
-            return response.json()
+            try:
+                return response.json()
+            except ValueError as e:
+                # O Bling respondeu: corpo inválido não conta como indisponibilidade no circuito
+                # (o JSONDecodeError do requests também é um RequestException)
+                logger.error(f"Resposta inválida da API do Bling em {endpoint}: {response.text[:500]}")
+                raise Exception(f"Resposta inválida da API do Bling: {e}")
 
         except requests.exceptions.HTTPError as e:
             logger.error(f"Erro HTTP na API do Bling: {e}")
             logger.error(f"Resposta: {response.text}")
+            if response.status_code >= 500:
+                raise UpstreamUnavailable(f"Erro na API do Bling: {e}")
             raise Exception(f"Erro na API do Bling: {e}")
         except requests.exceptions.RequestException as e:
             logger.error(f"Erro de requisição: {e}")
-            raise Exception(f"Erro de conexão: {e}")
+            self.circuit_breaker.record_failure(resource, str(e))
+            raise UpstreamUnavailable(f"Erro de conexão: {e}")
 
     # PRODUTOS
-    def get_products(self, page=1, limit=100, filters=None):
+    def get_products(self, page=1, limit=100, filters=None, use_cache=True):
         """
         Lista produtos
         
@@ -71,6 +272,7 @@ class BlingAPIService:
             page (int): Número da página
             limit (int): Itens por página (max 100)
             filters (dict): Filtros adicionais
+            use_cache (bool): False ignora o cache de respostas e vai ao Bling
         """
         params = {
             'pagina': page,
@@ -80,7 +282,7 @@ class BlingAPIService:
         if filters:
             params.update(filters)
 
-        return self._make_request('GET', '/produtos', params=params)
+        return self._make_request('GET', '/produtos', params=params, use_cache=use_cache, on_fetch=self._record_products)
 
     def get_product(self, product_id):
         """
@@ -99,7 +301,46 @@ class BlingAPIService:
             'termo': query
         }
 
-        return self._make_request('GET', '/produtos', params=params)
+        return self._make_request('GET', '/produtos', params=params, on_fetch=self._record_products)
+
+    def find_product_by_code(self, code):
+        """
+        Procura um produto pelo código (SKU) exato
+
+        Returns:
+            dict: Dados do produto ou None se não encontrado
+        """
+        product_id = self.identifier_index.product_id(code)
+        if product_id:
+            response = self.get_product(product_id)
+            if response and (response.get('data') or {}).get('codigo') == code:
+                return response['data']
+            # Código mudou de produto: descarta a entrada e busca no Bling
+            self.identifier_index.forget_product(code)
+
+        response = self.search_products(code)
+        if not response or 'data' not in response:
+            return None
+
+        for product in response['data']:
+            if product.get('codigo') == code:
+                return product
+
+        return None
+
+    def resolve_product_id(self, code):
+        """
+        Converte o código (SKU) no ID do produto, sem chamar o Bling se já indexado
+
+        Returns:
+            int: ID do produto ou None se não encontrado
+        """
+        product_id = self.identifier_index.product_id(code)
+        if product_id:
+            return product_id
+
+        product = self.find_product_by_code(code)
+        return product['id'] if product else None
 
     # VARIAÇÕES DE PRODUTO
     def get_product_variations(self, product_id, page=1, limit=100):
@@ -119,8 +360,80 @@ class BlingAPIService:
         """
         return self._make_request('GET', f'/produtos/{product_id}/variacoes/{variation_id}')
 
+    # Separadores usados nos códigos das variações (ex: CAMISA-P, CAMISA_P, CAMISA P)
+    VARIATION_CODE_SEPARATORS = ('-', '_', ' ')
+
+    def _is_variation_code(self, code, parent_code):
+        suffix = code[len(parent_code):] if code.startswith(parent_code) else ''
+        return bool(suffix) and suffix[0] in self.VARIATION_CODE_SEPARATORS
+
+    def find_variations_by_code(self, product_id):
+        """
+        Busca alternativa de variações: produtos cujo código começa com o
+        código do pai seguido de um separador
+
+        Com o produto pai no espelho local, responde por uma consulta de
+        intervalo no índice de codigo, sem chamar o Bling. Caso contrário faz
+        as buscas de cada separador em paralelo e remove duplicados.
+
+        O resultado local vazio só é confiável com o catálogo inteiro no
+        espelho (leitura do espelho ou sincronização completa de produtos):
+        webhooks e detalhes gravam produtos avulsos, sem as variações.
+
+        Returns:
+            dict: {'data', 'parent_code', 'method'} ou None se o pai não existir
+        """
+        parent_code = Product.objects.filter(bling_id=product_id).values_list('codigo', flat=True).first()
+
+        if parent_code:
+            # Intervalo [codigo, codigo + U+FFFF) usa o índice B-tree em qualquer banco
+            candidates = Product.objects.filter(
+                codigo__gte=parent_code,
+                codigo__lt=parent_code + '\uffff',
+            ).exclude(bling_id=product_id).order_by('codigo')
+
+            variations = [
+                raw for code, raw in candidates.values_list('codigo', 'raw')
+                if self._is_variation_code(code, parent_code)
+            ]
+            if variations or self._catalog_mirrored():
+                return {'data': variations, 'parent_code': parent_code, 'method': 'local_prefix_index'}
+        else:
+            product_response = self.get_product(product_id)
+            if not product_response or not product_response.get('data'):
+                return None
+
+            parent_code = product_response['data'].get('codigo', '')
+
+        def search(pattern):
+            try:
+                return (self.search_products(pattern) or {}).get('data') or []
+            except Exception as e:
+                logger.warning(f"Busca de variações por '{pattern}' falhou: {e}")
+                return []
+
+        patterns = [f"{parent_code}{separator}" for separator in self.VARIATION_CODE_SEPARATORS]
+        with ThreadPoolExecutor(max_workers=len(patterns)) as executor:
+            results = list(executor.map(timing.propagate(search), patterns))
+
+        variations = {}
+        for items in results:
+            for item in items:
+                if item.get('id') != product_id and self._is_variation_code(item.get('codigo', ''), parent_code):
+                    variations.setdefault(item['id'], item)
+
+        return {'data': list(variations.values()), 'parent_code': parent_code, 'method': 'alternative_search'}
+
+    def _catalog_mirrored(self):
+        """
+        O espelho tem todos os produtos? (lido do espelho ou já sincronizado por completo)
+        """
+        return settings.BLING_SERVE_FROM_MIRROR or SyncState.objects.filter(
+            resource='products', last_run_at__isnull=False,
+        ).exists()
+
     # PEDIDOS
-    def get_orders(self, page=1, limit=100, filters=None):
+    def get_orders(self, page=1, limit=100, filters=None, use_cache=True):
         """
         Lista pedidos
 
@@ -128,6 +441,7 @@ class BlingAPIService:
             page (int): Número da página
             limit (int): Itens por página (max 100)
             filters (dict): Filtros como data_inicial, data_final, situacao, etc.
+            use_cache (bool): False ignora o cache de respostas e vai ao Bling
         """
         params = {
             'pagina': page,
@@ -137,23 +451,105 @@ class BlingAPIService:
         if filters:
             params.update(filters)
 
-        return self._make_request('GET', '/pedidos/vendas', params=params)
+        return self._make_request(
+            'GET', '/pedidos/vendas', params=params, use_cache=use_cache, on_fetch=self._on_orders_fetched,
+        )
 
     def get_order(self, order_id):
         """
         Obtém um pedido específico pelo ID
         """
-        return self._make_request('GET', f'/pedidos/vendas/{order_id}')
+        return self._make_request('GET', f'/pedidos/vendas/{order_id}', on_fetch=self._on_order_fetched)
+
+    def get_orders_batch(self, order_ids, concurrency=None):
+        """
+        Obtém o detalhe de vários pedidos de uma vez
+
+        Detalhes já em cache são servidos sem chamar o Bling; os demais são
+        buscados em paralelo, limitado por BLING_BATCH_CONCURRENCY e pelo
+        orçamento de requisições. A falha de um pedido não interrompe os outros.
+
+        Args:
+            order_ids (list): IDs dos pedidos
+            concurrency (int): Buscas simultâneas (padrão: BLING_BATCH_CONCURRENCY)
+
+        Returns:
+            dict: {'data': [pedidos], 'errors': [{'id', 'error'}], 'meta': {...}}
+        """
+        order_ids = list(dict.fromkeys(order_ids))
+        results, errors = {}, {}
+
+        def load(order_id):
+            try:
+                response = self.get_order(order_id)
+                if response and response.get('data'):
+                    results[order_id] = response['data']
+                else:
+                    errors[order_id] = 'Pedido não encontrado'
+            except Exception as e:
+                errors[order_id] = str(e)
+
+        cached = [
+            order_id for order_id in order_ids
+            if self.response_cache.get(f'/pedidos/vendas/{order_id}')[1]
+        ]
+        cached_ids = set(cached)
+        missing = [order_id for order_id in order_ids if order_id not in cached_ids]
+
+        # Em cache: get_order responde sem ir ao Bling (e revalida se estiver stale)
+        for order_id in cached:
+            load(order_id)
+
+        if missing:
+            concurrency = self._pagination_concurrency(
+                settings.BLING_BATCH_CONCURRENCY if concurrency is None else concurrency
+            )
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(missing))) as executor:
+                list(executor.map(timing.propagate(load), missing))
+
+        return {
+            'data': [results[order_id] for order_id in order_ids if order_id in results],
+            'errors': [{'id': order_id, 'error': errors[order_id]} for order_id in order_ids if order_id in errors],
+            'meta': {'requested': len(order_ids), 'cached': len(cached), 'fetched': len(missing)},
+        }
+
+    def _write_through_orders(self, orders):
+        """
+        Grava os pedidos recebidos no espelho, mantendo os agregados de vendas
+        """
+        if not orders or not settings.BLING_MIRROR_WRITE_THROUGH:
+            return
+
+        from .mirror import BlingMirrorService
+
+        try:
+            BlingMirrorService(api_service=self).upsert_orders(orders)
+        except Exception as e:
+            # Falha ao gravar o espelho não deve impedir a resposta
+            logger.warning(f"Erro ao gravar pedidos no espelho: {e}")
 
     def search_orders_by_number(self, order_number):
         """
         Busca pedido por número
+
+        Números já indexados são respondidos pelo espelho local ou pelo
+        detalhe do pedido, sem a busca no Bling.
         """
+        order_id = self.identifier_index.order_id(order_number)
+        if order_id:
+            raw = Order.objects.filter(bling_id=order_id).values_list('raw', flat=True).first()
+            if raw is not None:
+                return {'data': [raw]}
+
+            response = self.get_order(order_id)
+            if response and response.get('data'):
+                return {'data': [response['data']]}
+
         params = {
             'numero': order_number
         }
 
-        return self._make_request('GET', '/pedidos/vendas', params=params)
+        return self._make_request('GET', '/pedidos/vendas', params=params, on_fetch=self._record_orders)
 
     def get_orders_by_date_range(self, start_date, end_date, page=1, limit=100):
         """
@@ -184,7 +580,7 @@ class BlingAPIService:
         return self.get_orders(page=page, limit=limit, filters=filters)
 
     # CATEGORIAS DE PRODUTOS
-    def get_categories(self, page=1, limit=100):
+    def get_categories(self, page=1, limit=100, use_cache=True):
         """
         Lista categorias de produtos
         """
@@ -193,7 +589,7 @@ class BlingAPIService:
             'limite': limit
         }
 
-        return self._make_request('GET', '/categorias/produtos', params=params)
+        return self._make_request('GET', '/categorias/produtos', params=params, use_cache=use_cache)
 
     def get_category(self, category_id):
         """
@@ -202,7 +598,7 @@ class BlingAPIService:
         return self._make_request('GET', f'/categorias/produtos/{category_id}')
 
     # CONTATOS (CLIENTES/FORNECEDORES)
-    def get_contacts(self, page=1, limit=100, filters=None):
+    def get_contacts(self, page=1, limit=100, filters=None, use_cache=True):
         """
         Lista contatos
         """
@@ -214,7 +610,7 @@ class BlingAPIService:
         if filters:
             params.update(filters)
 
-        return self._make_request('GET', '/contatos', params=params)
+        return self._make_request('GET', '/contatos', params=params, use_cache=use_cache)
 
     def get_contact(self, contact_id):
         """
@@ -236,62 +632,178 @@ class BlingAPIService:
         return self._make_request('GET', '/contatos', params=params)
 
     # MÉTODOS AUXILIARES PARA PAGINAÇÃO
-    def get_all_products(self, filters=None, max_pages=None):
+    def _pagination_concurrency(self, concurrency=None):
         """
-        Obtém todos os produtos (com paginação automática)
+        Número de páginas buscadas em paralelo, limitado pelo orçamento de requisições
         """
-        all_products = []
-        page = 1
+        if concurrency is None:
+            concurrency = settings.BLING_PAGINATION_CONCURRENCY
 
-        while True:
-            if max_pages and page > max_pages:
-                break
+        if self.rate_limiter.rate > 0:
+            concurrency = min(concurrency, max(self.rate_limiter.burst, 1))
 
-            response = self.get_products(page=page, filters=filters)
+        return max(int(concurrency), 1)
 
+    def _fetch_all_pages(self, fetch_page, max_pages=None, concurrency=None):
+        """
+        Percorre todas as páginas de um recurso, preservando a ordem dos itens
+
+        A primeira página é buscada sozinha; se ela trouxer meta.totalPages, as
+        demais são buscadas em paralelo. Caso contrário, busca janelas de
+        páginas à frente até encontrar uma página incompleta.
+
+        Args:
+            fetch_page (callable): Recebe o número da página e retorna a resposta
+            max_pages (int): Limite de páginas
+            concurrency (int): Páginas simultâneas (padrão: BLING_PAGINATION_CONCURRENCY)
+        """
+        concurrency = self._pagination_concurrency(concurrency)
+
+        def page_items(response):
             if not response or 'data' not in response:
-                break
+                return []
+            return response['data'] or []
 
-            products = response['data']
-            if not products:
-                break
+        first_response = fetch_page(1)
+        all_items = page_items(first_response)
 
-            all_products.extend(products)
+        # Se retornou menos que o limite, é a última página
+        if len(all_items) < self.PAGE_SIZE or max_pages == 1:
+            return all_items
 
-            # Verifica se há mais páginas
-            if len(products) < 100:  # Se retornou menos que o limite, é a última página
-                break
+        total_pages = (first_response.get('meta') or {}).get('totalPages')
+        if max_pages:
+            total_pages = min(total_pages, max_pages) if total_pages else None
 
-            page += 1
+        if concurrency == 1:
+            page = 2
+            while not (max_pages and page > max_pages):
+                items = page_items(fetch_page(page))
+                all_items.extend(items)
+                if len(items) < self.PAGE_SIZE:
+                    break
+                page += 1
+            return all_items
+
+        fetch_page = timing.propagate(fetch_page)
 
-        return all_products
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            if total_pages:
+                for items in executor.map(fetch_page, range(2, total_pages + 1)):
+                    all_items.extend(page_items(items))
+                return all_items
 
-    def get_all_orders(self, filters=None, max_pages=None):
+            # Sem totalPages: busca janelas de páginas até achar o fim
+            next_page = 2
+            while not (max_pages and next_page > max_pages):
+                last_page = next_page + concurrency - 1
+                if max_pages:
+                    last_page = min(last_page, max_pages)
+
+                for response in executor.map(fetch_page, range(next_page, last_page + 1)):
+                    items = page_items(response)
+                    all_items.extend(items)
+                    if len(items) < self.PAGE_SIZE:
+                        return all_items
+
+                next_page = last_page + 1
+
+        return all_items
+
+    def _iter_pages(self, fetch_page, max_pages=None):
         """
-        Obtém todos os pedidos (com paginação automática)
+        Gera os itens página a página, mantendo apenas uma página em memória
         """
-        all_orders = []
         page = 1
 
-        while True:
-            if max_pages and page > max_pages:
-                break
- 
-            response = self.get_orders(page=page, filters=filters)
+        while not (max_pages and page > max_pages):
+            response = fetch_page(page)
 
             if not response or 'data' not in response:
-                break
+                return
 
-            orders = response['data']
-            if not orders:
-                break
+            items = response['data']
+            if not items:
+                return
 
-            all_orders.extend(orders)
+            yield from items
 
-            # Verifica se há mais páginas
-            if len(orders) < 100:  # Se retornou menos que o limite, é a última página
-                break
+            # Se retornou menos que o limite, é a última página
+            if len(items) < self.PAGE_SIZE:
+                return
 
             page += 1
 
-        return all_orders
+    def iter_products(self, filters=None, max_pages=None, use_cache=True):
+        """
+        Itera sobre todos os produtos sem acumulá-los em memória
+
+        use_cache=False lê cada página direto do Bling (sincronização do espelho).
+        """
+        return self._iter_pages(
+            lambda page: self.get_products(page=page, limit=self.PAGE_SIZE, filters=filters, use_cache=use_cache),
+            max_pages=max_pages,
+        )
+
+    def iter_orders(self, filters=None, max_pages=None, use_cache=True):
+        """
+        Itera sobre todos os pedidos sem acumulá-los em memória
+
+        use_cache=False lê cada página direto do Bling (sincronização do espelho).
+        """
+        return self._iter_pages(
+            lambda page: self.get_orders(page=page, limit=self.PAGE_SIZE, filters=filters, use_cache=use_cache),
+            max_pages=max_pages,
+        )
+
+    def iter_contacts(self, filters=None, max_pages=None, use_cache=True):
+        """
+        Itera sobre todos os contatos sem acumulá-los em memória
+
+        use_cache=False lê cada página direto do Bling (sincronização do espelho).
+        """
+        return self._iter_pages(
+            lambda page: self.get_contacts(page=page, limit=self.PAGE_SIZE, filters=filters, use_cache=use_cache),
+            max_pages=max_pages,
+        )
+
+    def iter_categories(self, max_pages=None, use_cache=True):
+        """
+        Itera sobre todas as categorias sem acumulá-las em memória
+
+        use_cache=False lê cada página direto do Bling (sincronização do espelho).
+        """
+        return self._iter_pages(
+            lambda page: self.get_categories(page=page, limit=self.PAGE_SIZE, use_cache=use_cache),
+            max_pages=max_pages,
+        )
+
+    def get_all_products(self, filters=None, max_pages=None, concurrency=None):
+        """
+        Obtém todos os produtos (com paginação automática)
+
+        Args:
+            filters (dict): Filtros adicionais
+            max_pages (int): Limite de páginas
+            concurrency (int): Páginas buscadas em paralelo (1 = sequencial)
+        """
+        return self._fetch_all_pages(
+            lambda page: self.get_products(page=page, limit=self.PAGE_SIZE, filters=filters),
+            max_pages=max_pages,
+            concurrency=concurrency,
+        )
+
+    def get_all_orders(self, filters=None, max_pages=None, concurrency=None):
+        """
+        Obtém todos os pedidos (com paginação automática)
+
+        Args:
+            filters (dict): Filtros como dataInicial, dataFinal, situacao, etc.
+            max_pages (int): Limite de páginas
+            concurrency (int): Páginas buscadas em paralelo (1 = sequencial)
+        """
+        return self._fetch_all_pages(
+            lambda page: self.get_orders(page=page, limit=self.PAGE_SIZE, filters=filters),
+            max_pages=max_pages,
+            concurrency=concurrency,
+        )
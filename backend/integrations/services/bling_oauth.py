@@ -1,5 +1,7 @@
+import time
 import requests
 import secrets
+import threading
 
 from urllib.parse import urlencode
 
@@ -7,6 +9,11 @@ from django.conf import settings
 from django.core.cache import cache
 import logging
 
+from .http_client import get_http_client
+from .response_cache import BlingResponseCache
+from .cache_lock import acquire_lock, release_lock
+from .metrics import get_metrics
+
 
 logger = logging.getLogger(__name__)
 
@@ -16,11 +23,17 @@ class BlingOAuthService:
     Serviço para gerenciar autenticação OAuth 2.0 com o Bling ERP
     """
 
+    # Metadados do access token (emissão e validade) para a renovação antecipada
+    TOKEN_META_KEY = 'bling_access_token_meta'
+    # Lock distribuído: apenas um worker renova por vez (o refresh token é rotativo)
+    REFRESH_LOCK_KEY = 'bling_token_refresh_lock'
+
     def __init__(self):
         self.api_url = settings.BLING_API_URL
         self.client_id = settings.BLING_CLIENT_ID
         self.client_secret = settings.BLING_CLIENT_SECRET
         self.redirect_uri = settings.BLING_REDIRECT_URI
+        self.http = get_http_client()
 
     def generate_auth_url(self):
         """
@@ -40,7 +53,7 @@ class BlingOAuthService:
             'scope': 'read write'  # Ajuste os escopos conforme necessário
         }
 
-        auth_url = f"https://www.bling.com.br/Api/v3/oauth/authorize?{urlencode(params)}"
+        auth_url = f"{settings.BLING_API_BASE_URL}/oauth/authorize?{urlencode(params)}"
         return auth_url, state
 
     def validate_state(self, state):
@@ -60,7 +73,7 @@ class BlingOAuthService:
         if not self.validate_state(state):
             raise ValueError("State inválido ou expirado")
 
-        token_url = "https://www.bling.com.br/Api/v3/oauth/token"
+        token_url = f"{settings.BLING_API_BASE_URL}/oauth/token"
 
         # Credenciais no formato Basic Auth (Base64)
         import base64
@@ -81,7 +94,7 @@ class BlingOAuthService:
         }
 
         try:
-            response = requests.post(token_url, data=data, headers=headers, timeout=30)
+            response = self.http.post(token_url, data=data, headers=headers, timeout=30)
 
             # Log da requisição para debug (sem mostrar credenciais completas)
             logger.info(f"Token request URL: {token_url}")
@@ -92,14 +105,7 @@ class BlingOAuthService:
             response.raise_for_status()
 
             tokens = response.json()
-
-            # Salva os tokens no cache (ajuste o tempo conforme o expires_in)
-            expires_in = tokens.get('expires_in', 3600)
-            cache.set('bling_access_token', tokens['access_token'], expires_in - 60)
-
-            if 'refresh_token' in tokens:
-                # Refresh token geralmente tem vida útil maior
-                cache.set('bling_refresh_token', tokens['refresh_token'], expires_in * 24)
+            self._store_tokens(tokens)
 
             logger.info("Tokens OAuth obtidos com sucesso")
             return tokens
@@ -129,7 +135,7 @@ class BlingOAuthService:
         if not refresh_token:
             raise ValueError("Refresh token não encontrado. Necessário reautenticar.")
 
-        token_url = "https://www.bling.com.br/Api/v3/oauth/token"
+        token_url = f"{settings.BLING_API_BASE_URL}/oauth/token"
 
         # Credenciais no formato Basic Auth (Base64)
         import base64
@@ -148,39 +154,118 @@ class BlingOAuthService:
             'User-Agent': 'Bling-Integration/1.0'
         }
 
+        metrics = get_metrics()
+        started = time.perf_counter()
+
         try:
-            response = requests.post(token_url, data=data, headers=headers)
+            response = self.http.post(token_url, data=data, headers=headers, timeout=30)
             response.raise_for_status()
 
             tokens = response.json()
+            self._store_tokens(tokens)
 
-            # Atualiza os tokens no cache
-            expires_in = tokens.get('expires_in', 3600)
-            cache.set('bling_access_token', tokens['access_token'], expires_in - 60)
-
-            if 'refresh_token' in tokens:
-                cache.set('bling_refresh_token', tokens['refresh_token'], expires_in * 24)
-
+            metrics.inc('bling_token_refresh_total', result='success')
             logger.info("Access token renovado com sucesso")
             return tokens
 
         except requests.exceptions.RequestException as e:
+            metrics.inc('bling_token_refresh_total', result='failure')
             logger.error(f"Erro ao renovar token: {e}")
             raise Exception(f"Erro ao renovar token: {e}")
+        finally:
+            metrics.observe('bling_token_refresh_duration_seconds', time.perf_counter() - started)
+
+    def _store_tokens(self, tokens):
+        """
+        Salva os tokens no cache junto com o instante de emissão
+        """
+        expires_in = tokens.get('expires_in', 3600)
+        cache.set('bling_access_token', tokens['access_token'], expires_in - 60)
+        cache.set(self.TOKEN_META_KEY, {'issued_at': time.time(), 'expires_in': expires_in}, expires_in - 60)
+
+        if 'refresh_token' in tokens:
+            # Refresh token geralmente tem vida útil maior
+            cache.set('bling_refresh_token', tokens['refresh_token'], expires_in * 24)
+
+    def _should_refresh(self):
+        """
+        Indica se o token já passou da fração de vida configurada para renovação
+        """
+        meta = cache.get(self.TOKEN_META_KEY)
+        if not meta:
+            return False
+
+        age = time.time() - meta['issued_at']
+        return age >= meta['expires_in'] * settings.BLING_TOKEN_REFRESH_FRACTION
+
+    def _refresh_in_background(self):
+        """
+        Renova o token em uma thread, se nenhum outro worker já estiver renovando
+        """
+        lock_token = acquire_lock(self.REFRESH_LOCK_KEY, timeout=60)
+        if lock_token is None:
+            return
+
+        def refresh():
+            try:
+                # Outro worker pode ter renovado entre a checagem e o lock
+                if self._should_refresh():
+                    self.refresh_access_token()
+            except Exception as e:
+                logger.warning(f"Falha na renovação antecipada do token: {e}")
+            finally:
+                release_lock(self.REFRESH_LOCK_KEY, lock_token)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _refresh_with_lock(self):
+        """
+        Renova o token expirado garantindo uma única renovação no cluster;
+        quem não obtém o lock aguarda o token renovado por outro worker
+        """
+        lock_token = acquire_lock(self.REFRESH_LOCK_KEY, timeout=60)
+
+        if lock_token is not None:
+            try:
+                access_token = cache.get('bling_access_token')
+                if access_token:
+                    return access_token
+                return self.refresh_access_token()['access_token']
+            finally:
+                release_lock(self.REFRESH_LOCK_KEY, lock_token)
+
+        deadline = time.monotonic() + settings.BLING_TOKEN_REFRESH_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+
+            access_token = cache.get('bling_access_token')
+            if access_token:
+                return access_token
+
+            # Quem renovava terminou sem sucesso: tenta assumir a renovação
+            if cache.get(self.REFRESH_LOCK_KEY) is None:
+                return self._refresh_with_lock()
+
+        raise ValueError("Timeout aguardando renovação do token")
 
     def get_valid_access_token(self):
         """
         Retorna um access token válido, renovando se necessário
+
+        A renovação é antecipada: ao passar de BLING_TOKEN_REFRESH_FRACTION da
+        validade, o token atual continua sendo usado enquanto um novo é obtido
+        em segundo plano.
         """
         access_token = cache.get('bling_access_token')
-        
+
         if access_token:
+            if self._should_refresh():
+                self._refresh_in_background()
             return access_token
 
         # Tenta renovar o token
         try:
-            tokens = self.refresh_access_token()
-            return tokens['access_token']
+            return self._refresh_with_lock()
         except:
             # Se não conseguir renovar, precisa reautenticar
             raise ValueError("Token expirado. Necessário reautenticar.")
@@ -200,15 +285,17 @@ class BlingOAuthService:
             }
 
             try:
-                response = requests.post(revoke_url, headers=headers)
+                response = self.http.post(revoke_url, headers=headers)
                 response.raise_for_status()
                 logger.info("Tokens revogados com sucesso")
             except requests.exceptions.RequestException as e:
                 logger.warning(f"Erro ao revogar tokens: {e}")
 
-        # Remove do cache
+        # Remove do cache, incluindo as respostas da conta desconectada
         cache.delete('bling_access_token')
         cache.delete('bling_refresh_token')
+        cache.delete(self.TOKEN_META_KEY)
+        BlingResponseCache().invalidate()
 
     def is_authenticated(self):
         """
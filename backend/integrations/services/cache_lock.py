@@ -0,0 +1,56 @@
+import time
+import secrets
+
+from contextlib import contextmanager
+
+from django.core.cache import cache
+
+
+class CacheLockTimeout(Exception):
+    """
+    Não foi possível obter o lock dentro do tempo de espera
+    """
+
+
+def acquire_lock(key, timeout=10):
+    """
+    Tenta obter o lock uma única vez. Retorna o token do dono ou None
+    """
+    token = secrets.token_hex(8)
+    if cache.add(key, token, timeout):
+        return token
+    return None
+
+
+def release_lock(key, token):
+    """
+    Libera o lock somente se ele ainda pertencer ao token informado
+    """
+    if token and cache.get(key) == token:
+        cache.delete(key)
+
+
+@contextmanager
+def cache_lock(key, timeout=10, wait=5, interval=0.01):
+    """
+    Lock distribuído simples baseado em cache.add (atômico no Redis e no LocMem)
+
+    Args:
+        key (str): Chave do lock no cache
+        timeout (int): Tempo de vida do lock, protege contra donos que morreram
+        wait (float): Tempo máximo aguardando o lock
+        interval (float): Intervalo entre tentativas
+    """
+    deadline = time.monotonic() + wait
+
+    token = acquire_lock(key, timeout)
+    while token is None:
+        if time.monotonic() >= deadline:
+            raise CacheLockTimeout(f"Timeout aguardando lock {key}")
+        time.sleep(interval)
+        token = acquire_lock(key, timeout)
+
+    try:
+        yield token
+    finally:
+        release_lock(key, token)
@@ -0,0 +1,156 @@
+import time
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .metrics import get_metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+class UpstreamUnavailable(Exception):
+    """
+    O Bling não respondeu (timeout, falha de conexão ou HTTP 5xx)
+    """
+
+
+class CircuitOpen(UpstreamUnavailable):
+    """
+    Chamada recusada sem ir ao Bling: o circuito do recurso está aberto
+    """
+
+    def __init__(self, resource, retry_after):
+        self.resource = resource
+        self.retry_after = max(int(retry_after), 1)
+        super().__init__(f"Bling indisponível para {resource} (circuito aberto, nova tentativa em {self.retry_after}s)")
+
+
+class BlingCircuitBreaker:
+    """
+    Circuit breaker por recurso do Bling (/produtos, /pedidos/vendas...)
+
+    Depois de BLING_CIRCUIT_FAILURE_THRESHOLD falhas seguidas (timeouts,
+    erros de conexão, HTTP 5xx ou respostas mais lentas que
+    BLING_CIRCUIT_SLOW_SECONDS) o circuito abre e as chamadas ao recurso
+    falham na hora, sem ocupar a thread esperando o Bling. Passados
+    BLING_CIRCUIT_RESET_SECONDS, uma única chamada de teste (half-open) vai
+    ao Bling: se der certo o circuito fecha, senão abre de novo.
+
+    O estado fica no cache, então todos os workers abrem e fecham juntos.
+    """
+
+    PREFIX = 'bling_circuit'
+
+    def __init__(self, enabled=None, failure_threshold=None, slow_seconds=None, reset_seconds=None):
+        self.enabled = settings.BLING_CIRCUIT_ENABLED if enabled is None else enabled
+        self.failure_threshold = failure_threshold or settings.BLING_CIRCUIT_FAILURE_THRESHOLD
+        self.slow_seconds = settings.BLING_CIRCUIT_SLOW_SECONDS if slow_seconds is None else slow_seconds
+        self.reset_seconds = reset_seconds or settings.BLING_CIRCUIT_RESET_SECONDS
+        self.metrics = get_metrics()
+
+        # Mesmos recursos do cache de respostas; prefixos mais longos primeiro
+        self.resources = sorted(settings.BLING_CACHE_POLICIES, key=len, reverse=True)
+
+    def resource_for(self, endpoint):
+        path = endpoint.split('?', 1)[0]
+        for resource in self.resources:
+            if path == resource or path.startswith(resource + '/'):
+                return resource
+        return '/' + path.strip('/').split('/', 1)[0]
+
+    def _key(self, resource, field):
+        return f'{self.PREFIX}:{resource}:{field}'
+
+    def before_call(self, resource):
+        """
+        Libera a chamada ou levanta CircuitOpen
+
+        Raises:
+            CircuitOpen: Circuito aberto, ou em teste por outra chamada
+        """
+        if not self.enabled:
+            return
+
+        open_until = cache.get(self._key(resource, 'open_until'))
+        if open_until is None:
+            return
+
+        remaining = open_until - time.time()
+        # Half-open: apenas uma chamada de teste por vez no cluster
+        if remaining > 0 or not cache.add(self._key(resource, 'probe'), 1, settings.BLING_HTTP_TIMEOUT + 5):
+            self.metrics.inc('bling_circuit_rejected_total', resource=resource)
+            raise CircuitOpen(resource, remaining if remaining > 0 else self.reset_seconds)
+
+        logger.info(f"Circuito de {resource} em teste (half-open)")
+
+    def record_success(self, resource, elapsed):
+        if not self.enabled:
+            return
+
+        if self.slow_seconds and elapsed >= self.slow_seconds:
+            self.record_failure(resource, f'resposta lenta ({elapsed:.1f}s)')
+            return
+
+        keys = [self._key(resource, field) for field in ('open_until', 'failures')]
+        values = cache.get_many(keys)
+        if not values:
+            return
+
+        cache.delete_many(keys + [self._key(resource, 'probe')])
+        if keys[0] in values:
+            self.metrics.inc('bling_circuit_transitions_total', resource=resource, state='closed')
+            logger.info(f"Circuito de {resource} fechado: Bling respondeu normalmente")
+
+    def record_failure(self, resource, reason):
+        if not self.enabled:
+            return
+
+        open_key = self._key(resource, 'open_until')
+        failures_key = self._key(resource, 'failures')
+
+        if cache.get(open_key) is not None:
+            # A chamada de teste falhou: abre de novo
+            failures = self.failure_threshold
+        else:
+            cache.add(failures_key, 0, self.reset_seconds * 2)
+            try:
+                failures = cache.incr(failures_key)
+            except ValueError:  # Expirou entre o add e o incr
+                failures = 1
+
+        if failures < self.failure_threshold:
+            return
+
+        cache.set(open_key, time.time() + self.reset_seconds, None)
+        cache.delete_many([failures_key, self._key(resource, 'probe')])
+        self.metrics.inc('bling_circuit_transitions_total', resource=resource, state='open')
+        logger.warning(f"Circuito de {resource} aberto por {self.reset_seconds}s após {failures} falhas: {reason}")
+
+    def stats(self):
+        """
+        Estado do circuito de cada recurso
+        """
+        keys = {
+            resource: (self._key(resource, 'open_until'), self._key(resource, 'failures'))
+            for resource in self.resources
+        }
+        values = cache.get_many([key for pair in keys.values() for key in pair])
+        now = time.time()
+
+        data = {}
+        for resource, (open_key, failures_key) in keys.items():
+            open_until = values.get(open_key)
+            if open_until is None:
+                state = 'closed'
+            elif open_until > now:
+                state = 'open'
+            else:
+                state = 'half_open'
+            data[resource] = {
+                'state': state,
+                'failures': values.get(failures_key, 0),
+                'retry_in': round(max(open_until - now, 0), 1) if open_until else 0,
+            }
+        return data
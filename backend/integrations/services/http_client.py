@@ -0,0 +1,160 @@
+import threading
+import logging
+
+import requests
+
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class _ConnectionStats:
+    """
+    Contadores de uso das conexões do pool (compartilhados pelo processo)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+
+    def add_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def add_connection(self):
+        with self._lock:
+            self.connections_opened += 1
+
+    def snapshot(self):
+        with self._lock:
+            requests_count = self.requests
+            opened = self.connections_opened
+
+        reused = max(requests_count - opened, 0)
+        return {
+            'requests': requests_count,
+            'connections_opened': opened,
+            'connections_reused': reused,
+            'reuse_ratio': round(reused / requests_count, 4) if requests_count else 0.0,
+        }
+
+
+_stats = _ConnectionStats()
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):
+        _stats.add_connection()
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        _stats.add_connection()
+        return super()._new_conn()
+
+
+class _PooledAdapter(HTTPAdapter):
+    """
+    Adapter que conta cada nova conexão TCP/TLS aberta pelo pool
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _CountingHTTPConnectionPool,
+            'https': _CountingHTTPSConnectionPool,
+        }
+
+
+class BlingHTTPClient:
+    """
+    Cliente HTTP compartilhado pelo processo, com pool de conexões keep-alive
+    para a API do Bling
+    """
+
+    DEFAULT_HEADERS = {
+        'Accept': 'application/json',
+        'User-Agent': 'Bling-Integration/1.0',
+        'Connection': 'keep-alive',
+    }
+
+    def __init__(self, pool_connections=None, pool_maxsize=None, pool_block=None):
+        self.pool_connections = pool_connections or settings.BLING_HTTP_POOL_CONNECTIONS
+        self.pool_maxsize = pool_maxsize or settings.BLING_HTTP_POOL_MAXSIZE
+        self.pool_block = settings.BLING_HTTP_POOL_BLOCK if pool_block is None else pool_block
+
+        self.session = requests.Session()
+        self.session.headers.update(self.DEFAULT_HEADERS)
+
+        adapter = _PooledAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def request(self, method, url, **kwargs):
+        """
+        Executa uma requisição reutilizando as conexões do pool
+
+        Sem timeout explícito usa BLING_HTTP_CONNECT_TIMEOUT/BLING_HTTP_TIMEOUT,
+        para que um Bling travado não prenda a thread indefinidamente.
+        """
+        _stats.add_request()
+        kwargs.setdefault('timeout', (settings.BLING_HTTP_CONNECT_TIMEOUT, settings.BLING_HTTP_TIMEOUT))
+        return self.session.request(method.upper(), url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def stats(self):
+        """
+        Retorna os contadores de reutilização de conexões
+        """
+        data = _stats.snapshot()
+        data.update({
+            'pool_connections': self.pool_connections,
+            'pool_maxsize': self.pool_maxsize,
+        })
+        return data
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """
+    Retorna o cliente HTTP único do processo (criado sob demanda)
+    """
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = BlingHTTPClient()
+                logger.info(
+                    f"Pool HTTP do Bling criado (hosts={_client.pool_connections}, "
+                    f"conexões por host={_client.pool_maxsize})"
+                )
+
+    return _client
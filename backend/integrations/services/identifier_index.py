@@ -0,0 +1,79 @@
+import logging
+
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.cache import caches
+
+from ..models import Product, Order
+
+
+logger = logging.getLogger(__name__)
+
+
+class IdentifierIndex:
+    """
+    Índice código (SKU) -> ID de produto e número -> ID de pedido
+
+    Alimentado a cada listagem recebida do Bling e pela sincronização do
+    espelho. A consulta olha o cache, depois o espelho local, e só então
+    quem chamou precisa recorrer ao Bling.
+
+    Fica no cache BLING_IDENTIFIER_INDEX_CACHE, separado do cache padrão:
+    as entradas do índice não podem descartar os tokens OAuth.
+    """
+
+    PRODUCT_CODE_PREFIX = 'bling_idx:product_code'
+    ORDER_NUMBER_PREFIX = 'bling_idx:order_number'
+
+    def __init__(self, timeout=None):
+        self.timeout = settings.BLING_IDENTIFIER_INDEX_TTL if timeout is None else timeout
+        self.cache = caches[settings.BLING_IDENTIFIER_INDEX_CACHE]
+
+    def _key(self, prefix, value):
+        return f'{prefix}:{quote(str(value), safe="")}'
+
+    def _record(self, prefix, field, items):
+        entries = {
+            self._key(prefix, item[field]): item['id']
+            for item in (items or [])
+            if isinstance(item, dict) and item.get(field) and item.get('id')
+        }
+        if entries:
+            self.cache.set_many(entries, self.timeout)
+
+    def record_products(self, items):
+        self._record(self.PRODUCT_CODE_PREFIX, 'codigo', items)
+
+    def record_orders(self, items):
+        self._record(self.ORDER_NUMBER_PREFIX, 'numero', items)
+
+    def _lookup(self, prefix, value, model, field):
+        key = self._key(prefix, value)
+
+        bling_id = self.cache.get(key)
+        if bling_id:
+            return bling_id
+
+        bling_id = model.objects.filter(**{field: value}).values_list('bling_id', flat=True).first()
+        if bling_id:
+            self.cache.set(key, bling_id, self.timeout)
+        return bling_id
+
+    def product_id(self, code):
+        """
+        ID do produto com o código exato, ou None se não indexado
+        """
+        return self._lookup(self.PRODUCT_CODE_PREFIX, code, Product, 'codigo')
+
+    def order_id(self, number):
+        """
+        ID do pedido com o número informado, ou None se não indexado
+        """
+        return self._lookup(self.ORDER_NUMBER_PREFIX, number, Order, 'numero')
+
+    def forget_product(self, code):
+        self.cache.delete(self._key(self.PRODUCT_CODE_PREFIX, code))
+
+    def forget_order(self, number):
+        self.cache.delete(self._key(self.ORDER_NUMBER_PREFIX, number))
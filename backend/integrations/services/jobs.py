@@ -0,0 +1,368 @@
+import os
+import json
+import time
+import socket
+import logging
+import threading
+
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import Job, Schedule
+
+
+logger = logging.getLogger(__name__)
+
+
+# TAREFAS DISPONÍVEIS
+# Cada tarefa recebe (job, progress) e retorna um resultado serializável em JSON
+
+def _sync_job(job, progress):
+    from .sync import BlingSyncService
+
+    params = job.params
+    return BlingSyncService().sync_all(
+        params.get('resources'),
+        batch_size=params.get('batch_size'),
+        max_pages=params.get('max_pages'),
+        progress=lambda resource, total: progress(total, message=resource),
+        incremental=params.get('incremental', False),
+    )
+
+
+def _rebuild_sales_rollups_job(job, progress):
+    from .sales_rollup import SalesRollupService
+
+    return {'rows': SalesRollupService().rebuild()}
+
+
+def _export_orders_job(job, progress):
+    """
+    Exporta os pedidos (filtros da listagem do Bling) para um arquivo NDJSON
+    """
+    from .bling_api import BlingAPIService
+
+    os.makedirs(settings.BLING_EXPORT_DIR, exist_ok=True)
+    filename = f'pedidos-{job.pk}.ndjson'
+    path = os.path.join(settings.BLING_EXPORT_DIR, filename)
+
+    count = 0
+    with open(path, 'w', encoding='utf-8') as output:
+        for order in BlingAPIService().iter_orders(job.params.get('filters'), job.params.get('max_pages')):
+            output.write(json.dumps(order, ensure_ascii=False) + '\n')
+            count += 1
+            if count % 100 == 0:
+                progress(count, message='pedidos exportados')
+
+    return {'file': filename, 'count': count}
+
+
+JOB_HANDLERS = {
+    'sync': _sync_job,
+    'rebuild_sales_rollups': _rebuild_sales_rollups_job,
+    'export_orders': _export_orders_job,
+}
+
+
+def enqueue(kind, params=None, run_after=None, max_attempts=None, schedule=None):
+    """
+    Coloca uma tarefa na fila
+
+    Raises:
+        ValueError: Se a tarefa não existe em JOB_HANDLERS
+    """
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Tarefa {kind} não suportada")
+
+    return Job.objects.create(
+        kind=kind,
+        params=params or {},
+        run_after=run_after or timezone.now(),
+        max_attempts=settings.BLING_JOB_MAX_ATTEMPTS if max_attempts is None else max_attempts,
+        schedule=schedule,
+    )
+
+
+def serialize_job(job):
+    return {
+        'id': job.pk,
+        'kind': job.kind,
+        'params': job.params,
+        'status': job.status,
+        'attempts': job.attempts,
+        'max_attempts': job.max_attempts,
+        'progress': {
+            'current': job.progress_current,
+            'total': job.progress_total,
+            'message': job.progress_message,
+        },
+        'result': job.result,
+        'error': job.error,
+        'schedule': job.schedule.name if job.schedule_id else None,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+        'run_after': job.run_after,
+    }
+
+
+def _current_run(job):
+    """
+    A tarefa, desde que ainda esteja nesta execução (mesmo worker e tentativa)
+
+    Uma tarefa dada como abandonada volta para a fila e pode ser reservada
+    por outro worker; o worker original, se ainda estiver rodando, não pode
+    sobrescrever status, resultado ou progresso da nova execução.
+    """
+    return Job.objects.filter(pk=job.pk, status=Job.STATUS_RUNNING, worker=job.worker, attempts=job.attempts)
+
+
+class JobProgress:
+    """
+    Grava o progresso da tarefa no banco, no máximo uma vez por intervalo
+
+    Cada gravação também serve de sinal de vida (updated_at) para que a
+    tarefa não seja considerada abandonada.
+    """
+
+    def __init__(self, job, interval=1.0):
+        self.job = job
+        self.interval = interval
+        self._last_save = 0.0
+
+    def __call__(self, current, total=None, message=''):
+        now = time.monotonic()
+        if now - self._last_save < self.interval:
+            return
+        self._last_save = now
+
+        fields = {'progress_current': current, 'progress_message': str(message)[:255], 'updated_at': timezone.now()}
+        if total is not None:
+            fields['progress_total'] = total
+        _current_run(self.job).update(**fields)
+
+
+class JobWorker:
+    """
+    Executa as tarefas da fila em um pool de threads
+
+    As tarefas são reservadas com um UPDATE condicional (status ainda
+    "queued"), então vários processos bling_worker podem rodar ao mesmo
+    tempo sem executar a mesma tarefa duas vezes. O mesmo vale para os
+    agendamentos: só quem avança next_run_at coloca a tarefa na fila.
+    """
+
+    def __init__(self, threads=None, name=None):
+        self.threads = threads or settings.BLING_WORKER_THREADS
+        self.name = name or f'{socket.gethostname()}:{os.getpid()}'
+        self._active = set()
+        self._lock = threading.Lock()
+
+    # AGENDAMENTOS
+    def sync_schedules(self, schedules=None):
+        """
+        Cria/atualiza os agendamentos definidos em BLING_JOB_SCHEDULES
+        """
+        schedules = settings.BLING_JOB_SCHEDULES if schedules is None else schedules
+
+        for name, config in schedules.items():
+            Schedule.objects.update_or_create(
+                name=name,
+                defaults={
+                    'kind': config['kind'],
+                    'params': config.get('params', {}),
+                    'interval_seconds': config['interval'],
+                    'enabled': config.get('enabled', True),
+                },
+            )
+
+    def run_schedules(self):
+        """
+        Coloca na fila as tarefas dos agendamentos vencidos
+
+        Returns:
+            int: Quantidade de tarefas criadas
+        """
+        now = timezone.now()
+        created = 0
+
+        for schedule in Schedule.objects.filter(enabled=True, next_run_at__lte=now):
+            claimed = Schedule.objects.filter(pk=schedule.pk, next_run_at=schedule.next_run_at).update(
+                next_run_at=now + timedelta(seconds=schedule.interval_seconds),
+                last_enqueued_at=now,
+            )
+            if not claimed:
+                continue  # Outro worker já colocou na fila
+
+            # Não acumula execuções se a anterior ainda não terminou
+            if schedule.jobs.filter(status__in=(Job.STATUS_QUEUED, Job.STATUS_RUNNING)).exists():
+                continue
+
+            enqueue(schedule.kind, schedule.params, schedule=schedule)
+            created += 1
+
+        return created
+
+    # FILA
+    def heartbeat(self):
+        """
+        Renova o sinal de vida das tarefas em execução neste worker
+        """
+        with self._lock:
+            active = list(self._active)
+        if active:
+            Job.objects.filter(pk__in=active, status=Job.STATUS_RUNNING, worker=self.name).update(
+                updated_at=timezone.now()
+            )
+
+    def requeue_stale(self):
+        """
+        Devolve à fila tarefas "running" sem sinal de vida (worker morreu)
+
+        Tarefas que já esgotaram as tentativas são marcadas como falhas: uma
+        tarefa que sempre derruba o worker (ex: falta de memória) não volta
+        para a fila indefinidamente.
+        """
+        now = timezone.now()
+        stale = Job.objects.filter(
+            status=Job.STATUS_RUNNING,
+            updated_at__lt=now - timedelta(seconds=settings.BLING_JOB_STALE_SECONDS),
+        )
+
+        failed = stale.filter(attempts__gte=F('max_attempts')).update(
+            status=Job.STATUS_FAILED,
+            error='Tarefa abandonada pelo worker (tentativas esgotadas)',
+            finished_at=now,
+        )
+        if failed:
+            logger.error(f"{failed} tarefas abandonadas falharam definitivamente")
+
+        count = stale.filter(attempts__lt=F('max_attempts')).update(
+            status=Job.STATUS_QUEUED, worker='', error='Tarefa abandonada pelo worker',
+        )
+        if count:
+            logger.warning(f"{count} tarefas abandonadas voltaram para a fila")
+        return count
+
+    def claim(self, limit):
+        """
+        Reserva até `limit` tarefas prontas para execução
+        """
+        now = timezone.now()
+        candidates = Job.objects.filter(status=Job.STATUS_QUEUED, run_after__lte=now).order_by('run_after', 'pk')
+
+        claimed = []
+        for job_id in candidates.values_list('pk', flat=True)[:limit * 2]:
+            if len(claimed) >= limit:
+                break
+
+            updated = Job.objects.filter(pk=job_id, status=Job.STATUS_QUEUED).update(
+                status=Job.STATUS_RUNNING,
+                worker=self.name,
+                attempts=F('attempts') + 1,
+                started_at=now,
+                finished_at=None,
+                updated_at=now,  # update() não atualiza auto_now: conta como sinal de vida
+            )
+            if updated:
+                claimed.append(Job.objects.get(pk=job_id))
+
+        return claimed
+
+    def run_job(self, job):
+        """
+        Executa uma tarefa reservada, registrando resultado, erro e novas tentativas
+        """
+        close_old_connections()
+        logger.info(f"Iniciando tarefa {job.kind} #{job.pk} (tentativa {job.attempts})")
+
+        try:
+            result = JOB_HANDLERS[job.kind](job, JobProgress(job))
+        except Exception as e:
+            self._fail(job, e)
+        else:
+            updated = _current_run(job).update(
+                status=Job.STATUS_SUCCEEDED,
+                result=result,
+                error='',
+                finished_at=timezone.now(),
+            )
+            if updated:
+                logger.info(f"Tarefa {job.kind} #{job.pk} concluída")
+            else:
+                logger.warning(f"Tarefa {job.kind} #{job.pk} concluída, mas já foi retomada por outro worker")
+        finally:
+            with self._lock:
+                self._active.discard(job.pk)
+            close_old_connections()
+
+    def _fail(self, job, error):
+        retry = job.attempts < job.max_attempts
+        if retry:
+            delay = settings.BLING_JOB_RETRY_BACKOFF * (2 ** (job.attempts - 1))
+            updated = _current_run(job).update(
+                status=Job.STATUS_QUEUED,
+                error=str(error),
+                run_after=timezone.now() + timedelta(seconds=delay),
+            )
+        else:
+            updated = _current_run(job).update(
+                status=Job.STATUS_FAILED,
+                error=str(error),
+                finished_at=timezone.now(),
+            )
+
+        if not updated:
+            logger.warning(f"Tarefa {job.kind} #{job.pk} falhou, mas já foi retomada por outro worker: {error}")
+        elif retry:
+            logger.warning(f"Tarefa {job.kind} #{job.pk} falhou, nova tentativa em {delay:.0f}s: {error}")
+        else:
+            logger.error(f"Tarefa {job.kind} #{job.pk} falhou definitivamente: {error}")
+
+    def tick(self, executor):
+        """
+        Um ciclo do worker: agendamentos, tarefas abandonadas e novas reservas
+        """
+        self.run_schedules()
+        self.heartbeat()
+        self.requeue_stale()
+
+        with self._lock:
+            free = self.threads - len(self._active)
+        if free <= 0:
+            return 0
+
+        jobs = self.claim(free)
+        for job in jobs:
+            with self._lock:
+                self._active.add(job.pk)
+            executor.submit(self.run_job, job)
+        return len(jobs)
+
+    def run(self, poll_interval=None, stop_event=None, once=False):
+        """
+        Laço principal; termina quando stop_event é sinalizado (ou após um ciclo com once)
+        """
+        poll_interval = settings.BLING_WORKER_POLL_INTERVAL if poll_interval is None else poll_interval
+        stop_event = stop_event or threading.Event()
+
+        self.sync_schedules()
+
+        # Ao sair do bloco o executor aguarda as tarefas em andamento
+        with ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix='bling-job') as executor:
+            while not stop_event.is_set():
+                try:
+                    self.tick(executor)
+                except Exception as e:
+                    logger.error(f"Erro no ciclo do worker: {e}")
+                finally:
+                    close_old_connections()
+
+                if once:
+                    break
+                stop_event.wait(poll_interval)
@@ -0,0 +1,219 @@
+import os
+import re
+import time
+import socket
+import logging
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .cache_lock import cache_lock
+
+
+logger = logging.getLogger(__name__)
+
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# nome -> (tipo, descrição, buckets)
+METRICS = {
+    'bling_upstream_request_duration_seconds': (
+        'histogram', 'Duração das chamadas HTTP ao Bling', LATENCY_BUCKETS,
+    ),
+    'bling_upstream_responses_total': (
+        'counter', 'Respostas do Bling por status HTTP ("error" para falhas de conexão)', None,
+    ),
+    'bling_upstream_retries_total': (
+        'counter', 'Novas tentativas após HTTP 429', None,
+    ),
+    'bling_rate_limit_wait_seconds_total': (
+        'counter', 'Tempo aguardando o limite de requisições do Bling', None,
+    ),
+    'bling_token_refresh_total': (
+        'counter', 'Renovações do access token por resultado', None,
+    ),
+    'bling_token_refresh_duration_seconds': (
+        'histogram', 'Duração da renovação do access token', LATENCY_BUCKETS,
+    ),
+    'bling_circuit_transitions_total': (
+        'counter', 'Aberturas e fechamentos do circuit breaker por recurso', None,
+    ),
+    'bling_circuit_rejected_total': (
+        'counter', 'Chamadas recusadas com o circuito aberto', None,
+    ),
+}
+
+_id_segment = re.compile(r'/\d+(?=/|$)')
+
+
+def endpoint_label(endpoint):
+    """
+    Endpoint sem IDs (/pedidos/vendas/123 -> /pedidos/vendas/{id}), para limitar as séries
+    """
+    return _id_segment.sub('/{id}', endpoint.split('?', 1)[0])
+
+
+class MetricsRegistry:
+    """
+    Contadores e histogramas do processo, agregados entre workers pelo cache
+
+    Cada processo acumula seus valores em memória e, no máximo a cada
+    BLING_METRICS_FLUSH_INTERVAL segundos, grava o total acumulado no cache
+    sob uma chave própria. O endpoint /metrics/ soma as cópias de todos os
+    workers ativos.
+    """
+
+    WORKERS_KEY = 'bling_metrics:workers'
+    WORKER_PREFIX = 'bling_metrics:worker'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._last_flush = 0.0
+
+    @property
+    def worker_id(self):
+        # Calculado a cada uso: após um fork (gunicorn --preload) o PID muda
+        return f'{socket.gethostname()}:{os.getpid()}'
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+        self._maybe_flush()
+
+    def observe(self, name, value, **labels):
+        buckets = METRICS[name][2]
+        key = (name, tuple(sorted(labels.items())))
+
+        with self._lock:
+            entry = self._histograms.get(key)
+            if entry is None:
+                entry = self._histograms[key] = {'buckets': [0] * len(buckets), 'sum': 0.0, 'count': 0}
+
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    entry['buckets'][index] += 1
+            entry['sum'] += value
+            entry['count'] += 1
+        self._maybe_flush()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'counters': [[name, list(labels), value] for (name, labels), value in self._counters.items()],
+                'histograms': [
+                    [name, list(labels), dict(entry, buckets=list(entry['buckets']))]
+                    for (name, labels), entry in self._histograms.items()
+                ],
+            }
+
+    def _maybe_flush(self):
+        if time.monotonic() - self._last_flush >= settings.BLING_METRICS_FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        """
+        Grava os totais deste processo no cache compartilhado
+        """
+        self._last_flush = time.monotonic()
+        worker_id = self.worker_id
+
+        try:
+            cache.set(f'{self.WORKER_PREFIX}:{worker_id}', self.snapshot(), settings.BLING_METRICS_TTL)
+
+            workers = cache.get(self.WORKERS_KEY) or []
+            if worker_id not in workers:
+                with cache_lock(f'{self.WORKERS_KEY}:lock', timeout=5, wait=1):
+                    workers = cache.get(self.WORKERS_KEY) or []
+                    if worker_id not in workers:
+                        cache.set(self.WORKERS_KEY, workers + [worker_id], None)
+        except Exception as e:
+            # Métricas nunca devem derrubar uma requisição
+            logger.warning(f"Erro ao gravar métricas no cache: {e}")
+
+    def collect(self):
+        """
+        Soma os totais de todos os workers que gravaram recentemente
+        """
+        self.flush()
+
+        counters, histograms = {}, {}
+        workers = cache.get(self.WORKERS_KEY) or []
+        snapshots = cache.get_many([f'{self.WORKER_PREFIX}:{worker_id}' for worker_id in workers])
+
+        for snapshot in snapshots.values():
+            for name, labels, value in snapshot['counters']:
+                key = (name, tuple(tuple(label) for label in labels))
+                counters[key] = counters.get(key, 0) + value
+
+            for name, labels, entry in snapshot['histograms']:
+                key = (name, tuple(tuple(label) for label in labels))
+                total = histograms.setdefault(key, {'buckets': [0] * len(entry['buckets']), 'sum': 0.0, 'count': 0})
+                total['buckets'] = [a + b for a, b in zip(total['buckets'], entry['buckets'])]
+                total['sum'] += entry['sum']
+                total['count'] += entry['count']
+
+        # Remove da lista os workers cujas métricas expiraram
+        alive = [worker_id for worker_id in workers if f'{self.WORKER_PREFIX}:{worker_id}' in snapshots]
+        if len(alive) != len(workers):
+            cache.set(self.WORKERS_KEY, alive, None)
+
+        return counters, histograms, len(alive)
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics():
+    """
+    Retorna o registro de métricas do processo
+    """
+    return _registry
+
+
+def _labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in items)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(items, escaped)) + '}'
+
+
+def render_prometheus(counters, histograms, extra=()):
+    """
+    Formato de texto do Prometheus (0.0.4)
+
+    Args:
+        extra: Métricas adicionais [(nome, tipo, descrição, [(labels, valor)])]
+    """
+    lines = []
+
+    for name, (kind, description, buckets) in METRICS.items():
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+
+        if kind == 'counter':
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f'{name}{_labels(labels)} {value}')
+            continue
+
+        for (metric, labels), entry in sorted(histograms.items()):
+            if metric != name:
+                continue
+            for bound, count in zip(buckets, entry['buckets']):
+                lines.append(f'{name}_bucket{_labels(labels, [("le", bound)])} {count}')
+            lines.append(f'{name}_bucket{_labels(labels, [("le", "+Inf")])} {entry["count"]}')
+            lines.append(f'{name}_sum{_labels(labels)} {entry["sum"]}')
+            lines.append(f'{name}_count{_labels(labels)} {entry["count"]}')
+
+    for name, kind, description, samples in extra:
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in samples:
+            lines.append(f'{name}{_labels(labels)} {value}')
+
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,572 @@
+import json
+import math
+import base64
+import logging
+
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.expressions import RawSQL
+from django.utils.dateparse import parse_date
+
+from ..models import Category, Product, ProductVariation, Contact, Order, OrderItem
+from .identifier_index import IdentifierIndex
+from .product_search import ProductSearchIndex
+from .sales_rollup import SalesRollupService
+
+
+logger = logging.getLogger(__name__)
+
+
+def _decimal(value):
+    if value in (None, ''):
+        return None
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def _date(value):
+    # O Bling usa "0000-00-00" para datas vazias
+    try:
+        return parse_date(value) if value else None
+    except ValueError:
+        return None
+
+
+def _nested_id(value):
+    if isinstance(value, dict):
+        return value.get('id') or None
+    return None
+
+
+def _text(value, max_length):
+    return str(value or '')[:max_length]
+
+
+def encode_cursor(values):
+    """
+    Cursor opaco com os valores da chave de ordenação do último item
+    """
+    raw = json.dumps([value.isoformat() if isinstance(value, date) else value for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, size):
+    """
+    Valores do cursor; ValueError se ele for inválido
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise ValueError('Cursor inválido')
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError('Cursor inválido')
+    return values
+
+
+class BlingMirrorService:
+    """
+    Espelho local dos dados do Bling (produtos, pedidos, categorias e contatos)
+
+    Oferece a mesma interface de leitura do BlingAPIService, então as views
+    podem usar um ou outro. Detalhes ausentes no espelho são buscados no
+    Bling e gravados localmente.
+    """
+
+    PAGE_SIZE = 100
+
+    def __init__(self, api_service=None):
+        self._api_service = api_service
+        # Compatibilidade com BlingAPIService: leituras locais nunca aguardam o rate limit
+        self.last_wait_time = 0.0
+
+    @property
+    def api_service(self):
+        if self._api_service is None:
+            from .bling_api import BlingAPIService
+            self._api_service = BlingAPIService()
+        return self._api_service
+
+    def has_data(self, model=Product):
+        return model.objects.exists()
+
+    # ESCRITA (UPSERT EM LOTE)
+    def _merge_raw(self, model, items):
+        """
+        Combina o payload recebido com o já salvo, para que uma listagem
+        (payload resumido) não apague campos vindos do detalhe
+        """
+        items = [item for item in items if item and item.get('id')]
+        existing = dict(
+            model.objects.filter(bling_id__in=[item['id'] for item in items]).values_list('bling_id', 'raw')
+        )
+
+        merged = {}
+        for item in items:
+            raw = dict(existing.get(item['id']) or {})
+            raw.update(item)
+            merged[item['id']] = raw
+
+        return list(merged.values())
+
+    def _bulk_upsert(self, model, objects, update_fields):
+        model.objects.bulk_create(
+            objects,
+            update_conflicts=True,
+            unique_fields=['bling_id'],
+            update_fields=update_fields + ['raw', 'synced_at'],
+        )
+
+    @transaction.atomic
+    def upsert_categories(self, items):
+        rows = self._merge_raw(Category, items)
+        self._bulk_upsert(Category, [
+            Category(
+                bling_id=raw['id'],
+                descricao=_text(raw.get('descricao'), 255),
+                categoria_pai_id=_nested_id(raw.get('categoriaPai')),
+                raw=raw,
+            )
+            for raw in rows
+        ], ['descricao', 'categoria_pai_id'])
+
+        ProductSearchIndex().update_categories([raw['id'] for raw in rows])
+        return len(rows)
+
+    @transaction.atomic
+    def upsert_products(self, items):
+        rows = self._merge_raw(Product, items)
+        self._bulk_upsert(Product, [
+            Product(
+                bling_id=raw['id'],
+                codigo=_text(raw.get('codigo'), 120),
+                nome=_text(raw.get('nome'), 255),
+                preco=_decimal(raw.get('preco')),
+                tipo=_text(raw.get('tipo'), 10),
+                situacao=_text(raw.get('situacao'), 10),
+                formato=_text(raw.get('formato'), 10),
+                categoria_id=_nested_id(raw.get('categoria')),
+                raw=raw,
+            )
+            for raw in rows
+        ], ['codigo', 'nome', 'preco', 'tipo', 'situacao', 'formato', 'categoria_id'])
+
+        IdentifierIndex().record_products(rows)
+        ProductSearchIndex().update([raw['id'] for raw in rows])
+
+        self._upsert_variations([item for item in items if item and item.get('variacoes')])
+        return len(rows)
+
+    def _upsert_variations(self, products):
+        if not products:
+            return
+
+        product_pks = dict(
+            Product.objects.filter(bling_id__in=[p['id'] for p in products]).values_list('bling_id', 'pk')
+        )
+
+        variations = []
+        for product in products:
+            for variation in product['variacoes']:
+                if not variation.get('id'):
+                    continue
+                variations.append(ProductVariation(
+                    bling_id=variation['id'],
+                    product_id=product_pks[product['id']],
+                    codigo=_text(variation.get('codigo'), 120),
+                    nome=_text(variation.get('nome'), 255),
+                    raw=variation,
+                ))
+
+        self._bulk_upsert(ProductVariation, variations, ['product', 'codigo', 'nome'])
+
+    @transaction.atomic
+    def upsert_contacts(self, items):
+        rows = self._merge_raw(Contact, items)
+        self._bulk_upsert(Contact, [
+            Contact(
+                bling_id=raw['id'],
+                nome=_text(raw.get('nome'), 255),
+                codigo=_text(raw.get('codigo'), 120),
+                numero_documento=_text(raw.get('numeroDocumento'), 30),
+                situacao=_text(raw.get('situacao'), 10),
+                raw=raw,
+            )
+            for raw in rows
+        ], ['nome', 'codigo', 'numero_documento', 'situacao'])
+        return len(rows)
+
+    @transaction.atomic
+    def upsert_orders(self, items):
+        rows = self._merge_raw(Order, items)
+
+        # Estado anterior dos pedidos, para atualizar os agregados de vendas pela diferença
+        rollups = SalesRollupService()
+        ids = [raw['id'] for raw in rows]
+        before = rollups.snapshot(ids)
+
+        self._bulk_upsert(Order, [
+            Order(
+                bling_id=raw['id'],
+                numero=_text(raw.get('numero'), 50),
+                data=_date(raw.get('data')),
+                total=_decimal(raw.get('total')),
+                situacao_id=_nested_id(raw.get('situacao')),
+                contato_id=_nested_id(raw.get('contato')),
+                contato_nome=_text((raw.get('contato') or {}).get('nome'), 255),
+                raw=raw,
+            )
+            for raw in rows
+        ], ['numero', 'data', 'total', 'situacao_id', 'contato_id', 'contato_nome'])
+
+        rollups.apply_changes(before, rollups.snapshot(ids))
+        IdentifierIndex().record_orders(rows)
+
+        self._replace_order_items([item for item in items if item and 'itens' in item])
+        return len(rows)
+
+    def _replace_order_items(self, orders):
+        if not orders:
+            return
+
+        order_pks = dict(
+            Order.objects.filter(bling_id__in=[o['id'] for o in orders]).values_list('bling_id', 'pk')
+        )
+        OrderItem.objects.filter(order_id__in=order_pks.values()).delete()
+
+        OrderItem.objects.bulk_create([
+            OrderItem(
+                order_id=order_pks[order['id']],
+                produto_id=_nested_id(item.get('produto')),
+                codigo=_text(item.get('codigo'), 120),
+                descricao=_text(item.get('descricao'), 255),
+                quantidade=_decimal(item.get('quantidade')),
+                valor=_decimal(item.get('valor')),
+                raw=item,
+            )
+            for order in orders
+            for item in (order.get('itens') or [])
+        ])
+
+    @transaction.atomic
+    def delete_products(self, product_ids):
+        """
+        Remove produtos (e variações) do espelho e do índice de códigos
+        """
+        queryset = Product.objects.filter(bling_id__in=product_ids)
+        pks, codes = [], []
+        for pk, code in queryset.values_list('pk', 'codigo'):
+            pks.append(pk)
+            codes.append(code)
+
+        ProductSearchIndex().remove(pks)
+        queryset.delete()
+
+        index = IdentifierIndex()
+        for code in filter(None, codes):
+            index.forget_product(code)
+        return len(codes)
+
+    @transaction.atomic
+    def delete_orders(self, order_ids):
+        """
+        Remove pedidos (e itens) do espelho, dos agregados de vendas e do índice de números
+        """
+        rollups = SalesRollupService()
+        before = rollups.snapshot(order_ids)
+
+        queryset = Order.objects.filter(bling_id__in=order_ids)
+        numbers = list(queryset.values_list('numero', flat=True))
+        queryset.delete()
+
+        rollups.apply_changes(before, {})
+
+        index = IdentifierIndex()
+        for number in filter(None, numbers):
+            index.forget_order(number)
+        return len(numbers)
+
+    def update_stock(self, product_id, stock):
+        """
+        Atualiza o saldo de estoque guardado no payload do produto
+
+        Returns:
+            bool: False se o produto não está no espelho
+        """
+        product = Product.objects.filter(bling_id=product_id).first()
+        if product is None:
+            return False
+
+        raw = dict(product.raw)
+        raw['estoque'] = {**(raw.get('estoque') or {}), **stock}
+        product.raw = raw
+        product.save(update_fields=['raw', 'synced_at'])
+        return True
+
+    # LEITURA (MESMA INTERFACE DO BlingAPIService)
+    def _page(self, queryset, page, limit):
+        total = queryset.count()
+        offset = (max(page, 1) - 1) * limit
+        rows = list(queryset.values_list('raw', flat=True)[offset:offset + limit])
+
+        return {
+            'data': rows,
+            'meta': {
+                'total': total,
+                'totalPages': math.ceil(total / limit) if limit else 0,
+                'source': 'mirror',
+            },
+        }
+
+    def _keyset_page(self, queryset, keys, cursor=None, limit=100):
+        """
+        Página por cursor (keyset): busca os itens após a chave do último item
+
+        O custo não depende da profundidade da página (a condição vira uma
+        busca por intervalo no índice), e itens novos não deslocam as páginas
+        seguintes.
+
+        Args:
+            queryset: Consulta já filtrada
+            keys (tuple): Campos de ordenação (prefixo "-" para decrescente);
+                apenas o primeiro pode ser nulo, e os nulos ficam por último
+            cursor (str): Cursor devolvido na página anterior (None na primeira)
+            limit (int): Itens por página
+        """
+        fields = [key.lstrip('-') for key in keys]
+        queryset = queryset.order_by(*[
+            F(field).desc(nulls_last=True) if key.startswith('-') else F(field).asc(nulls_last=True)
+            for key, field in zip(keys, fields)
+        ])
+
+        def fetch(queryset, size):
+            return list(queryset.values_list('raw', *fields)[:size])
+
+        if not cursor:
+            rows = fetch(queryset, limit + 1)
+        else:
+            values = self._cursor_values(queryset.model, fields, cursor)
+
+            null_region = queryset.filter(**{f'{fields[0]}__isnull': True})
+
+            if values[0] is None:
+                rows = fetch(null_region.filter(self._after(keys[1:], fields[1:], values[1:])), limit + 1)
+            else:
+                rows = fetch(queryset.filter(self._after(keys, fields, values)), limit + 1)
+                # Acabaram os valores não nulos: continua pelos nulos
+                if len(rows) <= limit and queryset.model._meta.get_field(fields[0]).null:
+                    rows += fetch(null_region, limit + 1 - len(rows))
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        return {
+            'data': [row[0] for row in rows],
+            'meta': {
+                'limit': limit,
+                'has_more': has_more,
+                'next_cursor': encode_cursor(rows[-1][1:]) if has_more else None,
+                'source': 'mirror',
+            },
+        }
+
+    def _cursor_values(self, model, fields, cursor):
+        """
+        Valores do cursor convertidos para os campos de ordenação
+
+        O cursor vem do cliente: cada valor precisa ser escalar, e nulo só
+        no primeiro campo quando ele aceita nulos. ValueError caso contrário.
+        """
+        values = []
+
+        for position, (field, value) in enumerate(zip(fields, decode_cursor(cursor, len(fields)))):
+            model_field = model._meta.get_field(field)
+
+            if value is None and position == 0 and model_field.null:
+                values.append(None)
+                continue
+            if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+                raise ValueError('Cursor inválido')
+
+            try:
+                values.append(model_field.to_python(value))
+            except (ValidationError, TypeError, ValueError):
+                raise ValueError('Cursor inválido')
+
+        return values
+
+    def _after(self, keys, fields, values):
+        """
+        Condição "vem depois de values" na ordenação de keys (valores não nulos)
+
+        Equivale a (a, b) < (va, vb), escrita como a <= va AND (a < va OR
+        (a = va AND b < vb)) para que o banco use o índice composto.
+        """
+        condition = Q(pk__in=[])
+        equal = Q()
+
+        for key, field, value in zip(keys, fields, values):
+            lookup = 'lt' if key.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{field}__{lookup}': value})
+            equal &= Q(**{field: value})
+
+        bound = 'lte' if keys[0].startswith('-') else 'gte'
+        return Q(**{f'{fields[0]}__{bound}': values[0]}) & condition
+
+    def _detail(self, model, bling_id, fetch):
+        raw = model.objects.filter(bling_id=bling_id).values_list('raw', flat=True).first()
+        if raw is not None:
+            return {'data': raw}
+
+        # Não está no espelho: busca no Bling e grava
+        return fetch(bling_id)
+
+    # PRODUTOS
+    def _products_queryset(self, filters=None):
+        queryset = Product.objects.all()
+        filters = filters or {}
+
+        if str(filters.get('criterio')) == '5' and filters.get('termo'):
+            queryset = queryset.filter(categoria_id=filters['termo'])
+        elif str(filters.get('criterio')) == '1' and filters.get('termo'):
+            search = ProductSearchIndex()
+            matching = search.matching_pks(filters['termo']) if search.available() else None
+            if matching:
+                queryset = queryset.filter(pk__in=RawSQL(*matching))
+            else:
+                queryset = queryset.filter(Q(nome__icontains=filters['termo']) | Q(codigo__icontains=filters['termo']))
+        return queryset
+
+    def get_products(self, page=1, limit=100, filters=None):
+        return self._page(self._products_queryset(filters).order_by('bling_id'), page, limit)
+
+    def get_products_page(self, cursor=None, limit=100, filters=None):
+        """
+        Produtos por cursor, em ordem de ID (filtros como get_products)
+        """
+        return self._keyset_page(self._products_queryset(filters), ('bling_id',), cursor, limit)
+
+    def get_product(self, product_id):
+        return self._detail(Product, product_id, self._fetch_product)
+
+    def _fetch_product(self, product_id):
+        response = self.api_service.get_product(product_id)
+        if response and response.get('data'):
+            self.upsert_products([response['data']])
+        return response
+
+    def search_products(self, query, page=1, limit=100):
+        search = ProductSearchIndex()
+        if search.available():
+            return search.search(query, page, limit)
+        return self.get_products(page, limit, {'criterio': 1, 'termo': query})
+
+    def find_product_by_code(self, code):
+        raw = Product.objects.filter(codigo=code).values_list('raw', flat=True).first()
+        if raw is not None:
+            return raw
+        return self.api_service.find_product_by_code(code)
+
+    def resolve_product_id(self, code):
+        product_id = Product.objects.filter(codigo=code).values_list('bling_id', flat=True).first()
+        return product_id or self.api_service.resolve_product_id(code)
+
+    # PEDIDOS
+    def _orders_queryset(self, filters=None):
+        queryset = Order.objects.all()
+        filters = filters or {}
+
+        if filters.get('dataInicial'):
+            queryset = queryset.filter(data__gte=filters['dataInicial'])
+        if filters.get('dataFinal'):
+            queryset = queryset.filter(data__lte=filters['dataFinal'])
+        if filters.get('situacao'):
+            queryset = queryset.filter(situacao_id=filters['situacao'])
+        if filters.get('numero'):
+            queryset = queryset.filter(numero=filters['numero'])
+        return queryset
+
+    def get_orders(self, page=1, limit=100, filters=None):
+        return self._page(self._orders_queryset(filters).order_by('-data', '-bling_id'), page, limit)
+
+    def get_orders_page(self, cursor=None, limit=100, filters=None):
+        """
+        Pedidos por cursor, mais recentes primeiro (data, ID)
+        """
+        return self._keyset_page(self._orders_queryset(filters), ('-data', '-bling_id'), cursor, limit)
+
+    def get_order(self, order_id):
+        raw = Order.objects.filter(bling_id=order_id).values_list('raw', flat=True).first()
+
+        # A listagem não traz os itens: sem eles, busca o detalhe no Bling
+        if raw is not None and 'itens' in raw:
+            return {'data': raw}
+
+        response = self.api_service.get_order(order_id)
+        if response and response.get('data'):
+            self.upsert_orders([response['data']])
+        return response
+
+    def get_orders_batch(self, order_ids, concurrency=None):
+        order_ids = list(dict.fromkeys(order_ids))
+        stored = dict(Order.objects.filter(bling_id__in=order_ids).values_list('bling_id', 'raw'))
+
+        # Apenas pedidos já gravados com itens são servidos localmente
+        orders = {order_id: stored[order_id] for order_id in order_ids if 'itens' in (stored.get(order_id) or {})}
+        missing = [order_id for order_id in order_ids if order_id not in orders]
+
+        meta = {'requested': len(order_ids), 'cached': len(orders), 'fetched': 0}
+        errors = []
+
+        if missing:
+            remote = self.api_service.get_orders_batch(missing, concurrency)
+            if remote['data']:
+                self.upsert_orders(remote['data'])
+            orders.update((order['id'], order) for order in remote['data'])
+            errors = remote['errors']
+            meta['cached'] += remote['meta']['cached']
+            meta['fetched'] = remote['meta']['fetched']
+
+        return {
+            'data': [orders[order_id] for order_id in order_ids if order_id in orders],
+            'errors': errors,
+            'meta': meta,
+        }
+
+    def search_orders_by_number(self, order_number):
+        return self.get_orders(filters={'numero': order_number})
+
+    # CATEGORIAS DE PRODUTOS
+    def get_categories(self, page=1, limit=100):
+        return self._page(Category.objects.order_by('descricao', 'bling_id'), page, limit)
+
+    def get_category(self, category_id):
+        return self._detail(Category, category_id, self.api_service.get_category)
+
+    # CONTATOS (CLIENTES/FORNECEDORES)
+    def _contacts_queryset(self, query=None):
+        queryset = Contact.objects.all()
+        if query:
+            queryset = queryset.filter(Q(nome__icontains=query) | Q(numero_documento__icontains=query))
+        return queryset
+
+    def get_contacts(self, page=1, limit=100, filters=None):
+        return self._page(self._contacts_queryset().order_by('nome', 'bling_id'), page, limit)
+
+    def get_contacts_page(self, cursor=None, limit=100, query=None):
+        """
+        Contatos por cursor, em ordem de nome (e ID para desempatar)
+        """
+        return self._keyset_page(self._contacts_queryset(query), ('nome', 'bling_id'), cursor, limit)
+
+    def get_contact(self, contact_id):
+        return self._detail(Contact, contact_id, self.api_service.get_contact)
+
+    def search_contacts(self, query, page=1, limit=100):
+        return self._page(self._contacts_queryset(query).order_by('nome', 'bling_id'), page, limit)
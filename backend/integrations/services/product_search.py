@@ -0,0 +1,183 @@
+import re
+import math
+import logging
+
+from django.db import connection
+
+from ..models import Product, SyncState
+
+
+logger = logging.getLogger(__name__)
+
+
+_token_re = re.compile(r'\w+')
+
+
+def match_expression(query, max_terms=8):
+    """
+    Converte o texto digitado em uma consulta FTS5: cada palavra vira um
+    prefixo ("cam" acha "Camiseta") e todas precisam aparecer
+
+    Returns:
+        str: Expressão MATCH ou '' se não houver palavras
+    """
+    terms = _token_re.findall(query or '')[:max_terms]
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+class ProductSearchIndex:
+    """
+    Busca textual local dos produtos do espelho (SQLite FTS5)
+
+    A tabela integrations_product_search (migração 0007) indexa nome,
+    código, GTIN e descrição da categoria, sem acentos ("acao" acha "Ação")
+    e com índices de prefixo. Os resultados são ordenados por bm25, com
+    peso maior para código e GTIN. É mantida a cada gravação de produtos ou
+    categorias no espelho; em outros bancos a busca fica indisponível e o
+    espelho volta ao filtro por icontains.
+    """
+
+    TABLE = 'integrations_product_search'
+    # Pesos do bm25 na ordem das colunas: nome, codigo, gtin, categoria
+    WEIGHTS = (1.0, 4.0, 4.0, 0.5)
+    # Variáveis por comando (o SQLite antigo limita em 999)
+    CHUNK_SIZE = 500
+
+    _available = None
+
+    def available(self):
+        """
+        Indica se o banco é SQLite e a tabela FTS5 existe
+        """
+        if ProductSearchIndex._available is None:
+            if connection.vendor != 'sqlite':
+                ProductSearchIndex._available = False
+            else:
+                ProductSearchIndex._available = self.TABLE in connection.introspection.table_names()
+        return ProductSearchIndex._available
+
+    def populated(self):
+        """
+        Indica se o índice cobre o catálogo inteiro (sincronização completa de produtos concluída)
+
+        Webhooks e detalhes gravam produtos avulsos: antes da primeira cópia
+        completa o índice existe, mas só conhece parte do catálogo.
+        """
+        return SyncState.objects.filter(resource='products', last_run_at__isnull=False).exists()
+
+    # MANUTENÇÃO
+    def _select(self, where=''):
+        return f"""
+            SELECT p.id, p.nome, p.codigo, COALESCE(json_extract(p.raw, '$.gtin'), ''), COALESCE(c.descricao, '')
+            FROM integrations_product p
+            LEFT JOIN integrations_category c ON c.bling_id = p.categoria_id
+            {where}
+        """
+
+    def update(self, product_ids):
+        """
+        Reindexa produtos pelo ID do Bling (após gravá-los no espelho)
+        """
+        if not product_ids or not self.available():
+            return
+
+        with connection.cursor() as cursor:
+            for start in range(0, len(product_ids), self.CHUNK_SIZE):
+                chunk = list(product_ids[start:start + self.CHUNK_SIZE])
+                marks = ', '.join(['%s'] * len(chunk))
+                cursor.execute(
+                    f'DELETE FROM {self.TABLE} WHERE rowid IN '
+                    f'(SELECT id FROM integrations_product WHERE bling_id IN ({marks}))',
+                    chunk,
+                )
+                cursor.execute(
+                    f'INSERT INTO {self.TABLE} (rowid, nome, codigo, gtin, categoria) '
+                    + self._select(f'WHERE p.bling_id IN ({marks})'),
+                    chunk,
+                )
+
+    def update_categories(self, category_ids):
+        """
+        Reindexa os produtos das categorias alteradas (a descrição faz parte do índice)
+        """
+        if not category_ids or not self.available():
+            return
+        product_ids = list(Product.objects.filter(categoria_id__in=category_ids).values_list('bling_id', flat=True))
+        self.update(product_ids)
+
+    def remove(self, pks):
+        """
+        Remove do índice produtos pela chave primária do espelho
+        """
+        if not pks or not self.available():
+            return
+
+        with connection.cursor() as cursor:
+            for start in range(0, len(pks), self.CHUNK_SIZE):
+                chunk = list(pks[start:start + self.CHUNK_SIZE])
+                cursor.execute(f"DELETE FROM {self.TABLE} WHERE rowid IN ({', '.join(['%s'] * len(chunk))})", chunk)
+
+    def rebuild(self):
+        """
+        Recria o índice a partir de todos os produtos do espelho
+
+        Returns:
+            int: Produtos indexados
+        """
+        if not self.available():
+            return 0
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.TABLE}')
+            cursor.execute(f'INSERT INTO {self.TABLE} (rowid, nome, codigo, gtin, categoria) ' + self._select())
+            cursor.execute(f"INSERT INTO {self.TABLE} ({self.TABLE}) VALUES ('optimize')")
+            cursor.execute(f'SELECT count(*) FROM {self.TABLE}')
+            return cursor.fetchone()[0]
+
+    # CONSULTA
+    def matching_pks(self, query):
+        """
+        SQL com as chaves primárias que casam com a busca, para usar em pk__in
+
+        Returns:
+            tuple: (sql, params) ou None se a busca não tem palavras
+        """
+        expression = match_expression(query)
+        if not expression:
+            return None
+        return f'SELECT rowid FROM {self.TABLE} WHERE {self.TABLE} MATCH %s', [expression]
+
+    def search(self, query, page=1, limit=100):
+        """
+        Produtos mais relevantes para a busca, no formato da listagem do Bling
+
+        Returns:
+            dict: {'data': [...], 'meta': {'total', 'totalPages', 'source'}}
+        """
+        expression = match_expression(query)
+        if not expression:
+            return {'data': [], 'meta': {'total': 0, 'totalPages': 0, 'source': 'search'}}
+
+        offset = (max(page, 1) - 1) * limit
+        weights = ', '.join(str(weight) for weight in self.WEIGHTS)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {self.TABLE} WHERE {self.TABLE} MATCH %s '
+                f'ORDER BY bm25({self.TABLE}, {weights}) LIMIT %s OFFSET %s',
+                [expression, limit, offset],
+            )
+            pks = [row[0] for row in cursor.fetchall()]
+
+            cursor.execute(f'SELECT count(*) FROM {self.TABLE} WHERE {self.TABLE} MATCH %s', [expression])
+            total = cursor.fetchone()[0]
+
+        raws = dict(Product.objects.filter(pk__in=pks).values_list('pk', 'raw'))
+        return {
+            'data': [raws[pk] for pk in pks if pk in raws],
+            'meta': {
+                'total': total,
+                'totalPages': math.ceil(total / limit) if limit else 0,
+                'source': 'search',
+            },
+        }
@@ -0,0 +1,38 @@
+def parse_fields(value):
+    """
+    Converte "id,numero,contato.nome" em uma árvore {campo: {subcampos}}
+
+    Retorna None quando nenhum campo é informado (resposta completa). O
+    campo "id" é sempre incluído para que o cliente continue identificando
+    os itens.
+    """
+    paths = [path.strip() for path in (value or '').split(',') if path.strip()]
+    if not paths:
+        return None
+
+    tree = {'id': {}}
+    for path in paths:
+        node = tree
+        parts = [part for part in path.split('.') if part]
+        for index, part in enumerate(parts):
+            # Um caminho mais curto já pediu o objeto inteiro
+            if part in node and not node[part]:
+                break
+            if index == len(parts) - 1:
+                node[part] = {}
+            else:
+                node = node.setdefault(part, {})
+    return tree
+
+
+def project(value, tree):
+    """
+    Mantém apenas os campos da árvore; listas são projetadas item a item
+    """
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [project(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {key: project(value[key], subtree) for key, subtree in tree.items() if key in value}
+    return value
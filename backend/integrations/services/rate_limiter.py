@@ -0,0 +1,98 @@
+import time
+import random
+import logging
+
+from email.utils import parsedate_to_datetime
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .cache_lock import cache_lock, CacheLockTimeout
+
+
+logger = logging.getLogger(__name__)
+
+
+class BlingRateLimiter:
+    """
+    Token bucket compartilhado entre os workers através do cache do Django
+
+    O estado (tokens disponíveis e instante da última atualização) fica no
+    cache, então todos os processos consomem o mesmo orçamento de requisições.
+    Os tokens podem ficar negativos: cada chamada reserva sua vaga e dorme o
+    tempo necessário fora do lock.
+    """
+
+    STATE_KEY = 'bling_rate_limit_state'
+    LOCK_KEY = 'bling_rate_limit_lock'
+    BLOCKED_KEY = 'bling_rate_limit_blocked_until'
+
+    def __init__(self, rate=None, burst=None):
+        self.rate = settings.BLING_RATE_LIMIT_PER_SECOND if rate is None else rate
+        self.burst = settings.BLING_RATE_LIMIT_BURST if burst is None else burst
+
+    def acquire(self):
+        """
+        Consome um token, aguardando se necessário
+
+        Returns:
+            float: Segundos aguardados antes de liberar a chamada
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        now = time.time()
+
+        try:
+            with cache_lock(self.LOCK_KEY, timeout=2, wait=2):
+                state = cache.get(self.STATE_KEY) or {'tokens': self.burst, 'updated': now}
+                elapsed = max(now - state['updated'], 0)
+                tokens = min(self.burst, state['tokens'] + elapsed * self.rate) - 1
+                cache.set(self.STATE_KEY, {'tokens': tokens, 'updated': now}, 3600)
+        except CacheLockTimeout:
+            logger.warning("Lock do rate limiter indisponível, seguindo sem limitar")
+            return 0.0
+
+        wait = max(-tokens / self.rate, 0.0)
+
+        # Bloqueio global após um 429, com jitter para não liberar todos juntos
+        blocked_until = cache.get(self.BLOCKED_KEY)
+        if blocked_until and blocked_until > now:
+            blocked_wait = blocked_until - now
+            wait = max(wait, blocked_wait + random.uniform(0, blocked_wait * 0.25))
+
+        if wait > 0:
+            time.sleep(wait)
+
+        return wait
+
+    def block_for(self, seconds):
+        """
+        Suspende as chamadas de todos os workers pelo tempo informado
+        """
+        until = time.time() + seconds
+        current = cache.get(self.BLOCKED_KEY)
+        if not current or current < until:
+            cache.set(self.BLOCKED_KEY, until, int(seconds) + 1)
+
+
+def retry_delay(response, attempt, backoff=None):
+    """
+    Calcula o tempo de espera após um 429, respeitando o header Retry-After
+    """
+    backoff = settings.BLING_RATE_LIMIT_BACKOFF if backoff is None else backoff
+    delay = backoff * (2 ** attempt)
+
+    retry_after = response.headers.get('Retry-After')
+    if retry_after:
+        try:
+            delay = max(delay, float(retry_after))
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(retry_after).timestamp()
+                delay = max(delay, retry_at - time.time())
+            except (TypeError, ValueError):
+                pass
+
+    # Jitter para espalhar as novas tentativas
+    return delay + random.uniform(0, delay * 0.5)
@@ -0,0 +1,214 @@
+import json
+import time
+import hashlib
+import logging
+import threading
+
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .cache_lock import acquire_lock, release_lock
+from .circuit_breaker import UpstreamUnavailable
+from . import timing
+
+
+logger = logging.getLogger(__name__)
+
+
+class BlingResponseCache:
+    """
+    Cache das respostas GET do Bling com TTL por recurso e stale-while-revalidate
+
+    Cada recurso (prefixo do endpoint) tem um TTL e uma janela "stale": dentro
+    do TTL a resposta é servida direto do cache; dentro da janela stale ela
+    ainda é servida, mas uma thread em segundo plano busca a versão nova.
+    A invalidação incrementa a geração do recurso, o que torna todas as
+    chaves antigas inacessíveis sem precisar listá-las.
+
+    Passada a janela stale, a resposta ainda fica guardada por
+    BLING_CACHE_FALLBACK_SECONDS: se o Bling estiver fora (ou o circuito do
+    recurso aberto), ela é servida marcada com "_stale".
+    """
+
+    KEY_PREFIX = 'bling_response'
+    GENERATION_PREFIX = 'bling_response_gen'
+    STATS_PREFIX = 'bling_response_stats'
+    STATS_FIELDS = ('hits', 'stale_hits', 'misses', 'fallbacks')
+
+    def __init__(self, policies=None, enabled=None):
+        self.enabled = settings.BLING_RESPONSE_CACHE_ENABLED if enabled is None else enabled
+        policies = settings.BLING_CACHE_POLICIES if policies is None else policies
+
+        # Prefixos mais longos primeiro para que /categorias/produtos vença /produtos
+        self.policies = sorted(policies.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def policy_for(self, endpoint):
+        """
+        Retorna (recurso, ttl, stale_ttl) do endpoint ou None se não for cacheável
+        """
+        for resource, (ttl, stale_ttl) in self.policies:
+            if endpoint == resource or endpoint.startswith(resource + '/'):
+                return resource, ttl, stale_ttl
+        return None
+
+    def _generation(self, resource):
+        return cache.get(f'{self.GENERATION_PREFIX}:{resource}', 0)
+
+    def make_key(self, endpoint, params=None):
+        policy = self.policy_for(endpoint)
+        resource = policy[0] if policy else endpoint
+
+        raw = json.dumps([endpoint, params or {}], sort_keys=True, default=str)
+        digest = hashlib.sha1(raw.encode()).hexdigest()
+        return f'{self.KEY_PREFIX}:{self._generation(resource)}:{digest}'
+
+    def _incr(self, field):
+        key = f'{self.STATS_PREFIX}:{field}'
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 0, None)
+            cache.incr(key)
+
+    def get(self, endpoint, params=None):
+        """
+        Retorna (dados, estado) onde estado é 'fresh', 'stale' ou None (ausente)
+        """
+        policy = self.policy_for(endpoint)
+        if not self.enabled or not policy:
+            return None, None
+
+        entry = cache.get(self.make_key(endpoint, params))
+        if not entry:
+            return None, None
+
+        age = time.time() - entry['stored_at']
+        if age < policy[1]:
+            return entry['data'], 'fresh'
+        if age < policy[1] + policy[2]:
+            return entry['data'], 'stale'
+        return None, None
+
+    def set(self, endpoint, params, data):
+        policy = self.policy_for(endpoint)
+        if not self.enabled or not policy:
+            return
+
+        _, ttl, stale_ttl = policy
+        entry = {'data': data, 'stored_at': time.time()}
+        cache.set(self.make_key(endpoint, params), entry, ttl + stale_ttl + settings.BLING_CACHE_FALLBACK_SECONDS)
+
+    def get_fallback(self, endpoint, params=None):
+        """
+        Última resposta guardada, de qualquer idade, marcada com "_stale"
+
+        Só o momento da gravação vai no corpo: a idade mudaria a cada segundo
+        e, com ela, a ETag da resposta.
+        """
+        if not self.enabled or not self.policy_for(endpoint):
+            return None
+
+        entry = cache.get(self.make_key(endpoint, params))
+        if not entry or not isinstance(entry['data'], dict):
+            return None
+
+        data = entry['data']
+        data['_stale'] = {
+            'stored_at': datetime.fromtimestamp(entry['stored_at'], tz=dt_timezone.utc).isoformat(),
+        }
+        return data
+
+    def fetch(self, endpoint, params, loader):
+        """
+        Retorna a resposta do cache ou chama o loader, salvando o resultado
+
+        Args:
+            endpoint (str): Endpoint do Bling (ex: /pedidos/vendas)
+            params (dict): Parâmetros da query string
+            loader (callable): Busca a resposta no Bling
+        """
+        if not self.enabled or not self.policy_for(endpoint):
+            return loader()
+
+        started = time.perf_counter()
+        data, state = self.get(endpoint, params)
+        timing.record('cache', time.perf_counter() - started, f"{state or 'miss'} {endpoint}")
+
+        if state == 'fresh':
+            self._incr('hits')
+            return data
+
+        if state == 'stale':
+            self._incr('stale_hits')
+            self._revalidate(endpoint, params, loader)
+            return data
+
+        self._incr('misses')
+        try:
+            data = loader()
+        except UpstreamUnavailable as e:
+            data = self.get_fallback(endpoint, params)
+            if data is None:
+                raise
+            self._incr('fallbacks')
+            logger.warning(f"Bling indisponível, servindo resposta guardada de {endpoint}: {e}")
+            return data
+
+        self.set(endpoint, params, data)
+        return data
+
+    def _revalidate(self, endpoint, params, loader):
+        """
+        Atualiza a entrada em segundo plano (apenas uma thread por chave no cluster)
+        """
+        lock_key = f'{self.make_key(endpoint, params)}:refresh'
+        token = acquire_lock(lock_key, timeout=60)
+        if token is None:
+            return
+
+        def refresh():
+            try:
+                self.set(endpoint, params, loader())
+            except Exception as e:
+                logger.warning(f"Falha ao revalidar cache de {endpoint}: {e}")
+            finally:
+                release_lock(lock_key, token)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def delete(self, endpoint, params=None):
+        """
+        Remove uma única resposta (ex: o detalhe de um pedido alterado)
+        """
+        if self.enabled and self.policy_for(endpoint):
+            cache.delete(self.make_key(endpoint, params))
+
+    def invalidate(self, endpoint=None):
+        """
+        Invalida as respostas do recurso do endpoint, ou de todos os recursos
+        """
+        if endpoint is None:
+            resources = [resource for resource, _ in self.policies]
+        else:
+            policy = self.policy_for(endpoint)
+            resources = [policy[0] if policy else endpoint]
+
+        for resource in resources:
+            key = f'{self.GENERATION_PREFIX}:{resource}'
+            cache.add(key, 0, None)
+            cache.incr(key)
+            logger.info(f"Cache de respostas invalidado: {resource}")
+
+    def stats(self):
+        """
+        Contadores de acertos/erros compartilhados entre os workers
+        """
+        values = cache.get_many([f'{self.STATS_PREFIX}:{field}' for field in self.STATS_FIELDS])
+        data = {field: values.get(f'{self.STATS_PREFIX}:{field}', 0) for field in self.STATS_FIELDS}
+
+        # Fallbacks já contam como miss
+        total = data['hits'] + data['stale_hits'] + data['misses']
+        data['hit_ratio'] = round((data['hits'] + data['stale_hits']) / total, 4) if total else 0.0
+        return data
@@ -0,0 +1,186 @@
+import logging
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncWeek, TruncMonth
+
+from ..models import Order, DailySalesRollup, SyncState
+
+
+logger = logging.getLogger(__name__)
+
+
+class SalesRollupService:
+    """
+    Agregados diários de vendas (dia x situação) para o dashboard
+
+    Cada gravação de pedidos no espelho informa o estado anterior e o novo
+    de cada pedido; a diferença é aplicada nas linhas do dia, então as
+    consultas nunca precisam varrer a tabela de pedidos.
+    """
+
+    GRANULARITIES = {
+        'day': None,
+        'week': TruncWeek,
+        'month': TruncMonth,
+    }
+
+    def snapshot(self, bling_ids):
+        """
+        Contribuição atual de cada pedido: {bling_id: (dia, situação, total)}
+        """
+        return {
+            bling_id: (data, situacao_id or 0, total or Decimal('0'))
+            for bling_id, data, situacao_id, total in Order.objects.filter(
+                bling_id__in=list(bling_ids)
+            ).values_list('bling_id', 'data', 'situacao_id', 'total')
+        }
+
+    def apply_changes(self, before, after):
+        """
+        Aplica a diferença entre dois snapshots (pedidos novos, alterados ou removidos)
+        """
+        deltas = defaultdict(lambda: [0, Decimal('0')])
+
+        for bling_id in set(before) | set(after):
+            old, new = before.get(bling_id), after.get(bling_id)
+            if old == new:
+                continue
+            if old and old[0]:
+                deltas[(old[0], old[1])][0] -= 1
+                deltas[(old[0], old[1])][1] -= old[2]
+            if new and new[0]:
+                deltas[(new[0], new[1])][0] += 1
+                deltas[(new[0], new[1])][1] += new[2]
+
+        with transaction.atomic():
+            for (day, situacao_id), (count, total) in deltas.items():
+                if not count and not total:
+                    continue
+
+                updated = DailySalesRollup.objects.filter(day=day, situacao_id=situacao_id).update(
+                    order_count=F('order_count') + count,
+                    total=F('total') + total,
+                )
+                if not updated:
+                    self._create(day, situacao_id, count, total)
+                elif count < 0:
+                    # Sem pedidos restantes no dia/situação: remove a linha
+                    DailySalesRollup.objects.filter(day=day, situacao_id=situacao_id, order_count__lte=0).delete()
+
+        return len(deltas)
+
+    def _create(self, day, situacao_id, count, total):
+        """
+        Cria a linha do dia/situação; se outro worker criou a mesma linha ao
+        mesmo tempo, soma a diferença na linha dele
+        """
+        try:
+            # Savepoint: o IntegrityError não invalida a transação de apply_changes
+            with transaction.atomic():
+                DailySalesRollup.objects.create(day=day, situacao_id=situacao_id, order_count=count, total=total)
+        except IntegrityError:
+            DailySalesRollup.objects.filter(day=day, situacao_id=situacao_id).update(
+                order_count=F('order_count') + count,
+                total=F('total') + total,
+            )
+
+    def available(self):
+        """
+        Indica se os agregados refletem as vendas atuais
+
+        Os agregados só são mantidos pelas gravações no espelho: é preciso
+        ler do espelho, gravar os pedidos buscados ao vivo
+        (BLING_MIRROR_WRITE_THROUGH) ou sincronizar os pedidos com
+        sync_bling --incremental, e a tabela não pode estar vazia.
+        """
+        mirror_in_use = (
+            settings.BLING_SERVE_FROM_MIRROR
+            or settings.BLING_MIRROR_WRITE_THROUGH
+            or SyncState.objects.filter(resource='orders', last_run_at__isnull=False).exists()
+        )
+        return bool(mirror_in_use) and DailySalesRollup.objects.exists()
+
+    @transaction.atomic
+    def rebuild(self):
+        """
+        Recalcula todos os agregados a partir dos pedidos do espelho
+
+        Returns:
+            int: Quantidade de linhas (dia x situação) geradas
+        """
+        rows = (
+            Order.objects.exclude(data__isnull=True)
+            .values('data', 'situacao_id')
+            .annotate(order_count=Count('id'), total_sum=Sum('total'))
+        )
+
+        DailySalesRollup.objects.all().delete()
+        DailySalesRollup.objects.bulk_create([
+            DailySalesRollup(
+                day=row['data'],
+                situacao_id=row['situacao_id'] or 0,
+                order_count=row['order_count'],
+                total=row['total_sum'] or Decimal('0'),
+            )
+            for row in rows
+        ], batch_size=1000)
+
+        count = DailySalesRollup.objects.count()
+        logger.info(f"Agregados de vendas recalculados: {count} linhas")
+        return count
+
+    def sales(self, date_from, date_to, granularity='day', situacoes=None):
+        """
+        Série de vendas por período a partir dos agregados
+
+        Args:
+            date_from (date): Primeiro dia (inclusive)
+            date_to (date): Último dia (inclusive)
+            granularity (str): day, week ou month
+            situacoes (list): IDs de situação a considerar (padrão: todas)
+
+        Returns:
+            dict: {'data': [...], 'totals': {...}}
+        """
+        if granularity not in self.GRANULARITIES:
+            raise ValueError(f"Granularidade {granularity} não suportada")
+
+        queryset = DailySalesRollup.objects.filter(day__gte=date_from, day__lte=date_to)
+        if situacoes:
+            queryset = queryset.filter(situacao_id__in=situacoes)
+
+        trunc = self.GRANULARITIES[granularity]
+        period = trunc('day') if trunc else F('day')
+
+        rows = (
+            queryset.annotate(period=period)
+            .values('period')
+            .annotate(orders=Sum('order_count'), sales=Sum('total'))
+            .order_by('period')
+        )
+
+        rows = list(rows)
+        total_orders = sum(row['orders'] or 0 for row in rows)
+        total_sales = sum((row['sales'] or Decimal('0') for row in rows), Decimal('0'))
+
+        return {
+            'data': [self._entry(row['period'].isoformat(), row['orders'], row['sales']) for row in rows],
+            'totals': self._entry(None, total_orders, total_sales),
+        }
+
+    def _entry(self, period, orders, sales):
+        orders = orders or 0
+        sales = sales or Decimal('0')
+        entry = {
+            'order_count': orders,
+            'total': float(sales),
+            'avg_ticket': round(float(sales) / orders, 2) if orders else 0.0,
+        }
+        if period is not None:
+            entry = {'period': period, **entry}
+        return entry
@@ -0,0 +1,79 @@
+import copy
+import threading
+
+
+class _InFlightCall:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Agrupa chamadas idênticas e simultâneas em uma única execução
+
+    A primeira thread com uma chave executa a função; as demais que chegam
+    enquanto ela está em andamento aguardam e recebem uma cópia do resultado
+    (ou a mesma exceção).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._stats = {'executions': 0, 'collapsed': 0, 'collapsed_remote': 0}
+
+    def do(self, key, func):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _InFlightCall()
+                self._calls[key] = call
+                self._stats['executions'] += 1
+            else:
+                self._stats['collapsed'] += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            # Cópia para que quem chamou possa alterar o resultado livremente
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = func()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def add_remote_collapse(self):
+        """
+        Registra uma chamada atendida pelo resultado de outro worker
+        """
+        with self._lock:
+            self._stats['collapsed_remote'] += 1
+
+    def stats(self):
+        with self._lock:
+            data = dict(self._stats)
+            data['in_flight'] = len(self._calls)
+
+        total = data['executions'] + data['collapsed'] + data['collapsed_remote']
+        data['collapse_ratio'] = round((data['collapsed'] + data['collapsed_remote']) / total, 4) if total else 0.0
+        return data
+
+
+_single_flight = SingleFlight()
+
+
+def get_single_flight():
+    """
+    Retorna o agrupador de chamadas do processo
+    """
+    return _single_flight
@@ -0,0 +1,139 @@
+import time
+import threading
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+_current = ContextVar('bling_request_timeline', default=None)
+
+
+class RequestTimeline:
+    """
+    Linha do tempo de uma requisição: autenticação, chamadas ao Bling,
+    consultas ao cache e serialização
+
+    Os trechos são gravados com o início relativo ao começo da requisição.
+    Chamadas feitas em paralelo (paginação, lotes, dashboard) entram como
+    trechos sobrepostos, então a soma de uma categoria pode passar do total.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.entries = []
+        self._lock = threading.Lock()
+
+    def add(self, category, duration, description='', started=None):
+        started = time.perf_counter() - duration if started is None else started
+        with self._lock:
+            self.entries.append((category, description, started - self.started, duration))
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def totals(self):
+        """
+        {categoria: (quantidade, segundos)} na ordem da primeira ocorrência
+        """
+        totals = {}
+        with self._lock:
+            entries = list(self.entries)
+        for category, _, _, duration in entries:
+            count, seconds = totals.get(category, (0, 0.0))
+            totals[category] = (count + 1, seconds + duration)
+        return totals
+
+    def server_timing(self, max_entries=10):
+        """
+        Valor do header Server-Timing: totais por categoria, as primeiras
+        chamadas ao Bling individualmente e o total da requisição
+        """
+        metrics = []
+        for category, (count, seconds) in self.totals().items():
+            metric = f'{category};dur={seconds * 1000:.1f}'
+            if count > 1:
+                metric += f';desc="{count}x"'
+            metrics.append(metric)
+
+        with self._lock:
+            calls = sorted((entry for entry in self.entries if entry[0] == 'bling'), key=lambda entry: entry[2])
+        for index, (_, description, _, duration) in enumerate(calls[:max_entries], start=1):
+            metrics.append(f'bling-{index};dur={duration * 1000:.1f};desc="{_quote(description)}"')
+
+        metrics.append(f'total;dur={self.elapsed() * 1000:.1f}')
+        return ', '.join(metrics)
+
+    def breakdown(self):
+        """
+        Trechos em ordem de início, formatados para o log de requisições lentas
+        """
+        with self._lock:
+            entries = sorted(self.entries, key=lambda entry: entry[2])
+        return [
+            f'{offset * 1000:+9.1f} ms  {category:<8} {duration * 1000:8.1f} ms  {description}'.rstrip()
+            for category, description, offset, duration in entries
+        ]
+
+
+def _quote(value):
+    return str(value).replace('\\', '\\\\').replace('"', "'")
+
+
+def start():
+    """
+    Inicia a linha do tempo da requisição atual
+    """
+    timeline = RequestTimeline()
+    _current.set(timeline)
+    return timeline
+
+
+def finish():
+    # A thread do servidor é reaproveitada: a próxima requisição começa sem linha do tempo
+    _current.set(None)
+
+
+@contextmanager
+def span(category, description=''):
+    """
+    Mede o bloco e grava na linha do tempo (sem custo fora de uma requisição medida)
+    """
+    timeline = _current.get()
+    if timeline is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timeline.add(category, time.perf_counter() - started, description, started)
+
+
+def record(category, duration, description=''):
+    """
+    Grava um trecho já medido (segundos)
+    """
+    timeline = _current.get()
+    if timeline is not None:
+        timeline.add(category, duration, description)
+
+
+def propagate(func):
+    """
+    Leva a linha do tempo atual para a função executada em outra thread
+
+    Threads de um ThreadPoolExecutor não herdam o contexto de quem as criou.
+    """
+    timeline = _current.get()
+    if timeline is None:
+        return func
+
+    def wrapper(*args, **kwargs):
+        token = _current.set(timeline)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current.reset(token)
+
+    return wrapper
@@ -0,0 +1,199 @@
+import hmac
+import json
+import hashlib
+import logging
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..models import WebhookEvent
+from .cache_lock import cache_lock
+from .mirror import BlingMirrorService
+from .response_cache import BlingResponseCache
+
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidSignature(Exception):
+    """
+    Assinatura do webhook ausente ou diferente da esperada
+    """
+
+
+class BlingWebhookService:
+    """
+    Aplica os eventos de webhook do Bling no espelho local e no cache
+
+    Cada evento é gravado uma única vez (eventId) e só é aplicado se for
+    mais recente que o último evento aplicado para a mesma entidade, então
+    reenvios e entregas fora de ordem não sobrescrevem dados novos.
+
+    No cache de respostas, o detalhe da entidade é removido na hora; as
+    listagens do recurso são invalidadas no máximo uma vez a cada
+    BLING_WEBHOOK_LIST_INVALIDATION_SECONDS, no fim da janela, para que um
+    fluxo intenso de eventos não esvazie o cache a cada chamada.
+    """
+
+    SIGNATURE_HEADER = 'HTTP_X_BLING_SIGNATURE_256'
+    PENDING_PREFIX = 'bling_webhook_invalidation'
+
+    # Recurso do evento -> endpoint do Bling cujo cache de respostas é invalidado
+    CACHE_ENDPOINTS = {
+        'order': '/pedidos/vendas',
+        'product': '/produtos',
+        'stock': '/produtos',
+    }
+
+    def __init__(self, mirror=None, response_cache=None):
+        self.mirror = mirror or BlingMirrorService()
+        self.response_cache = response_cache or BlingResponseCache()
+
+    def verify_signature(self, body, signature):
+        """
+        Confere o HMAC-SHA256 do corpo com o segredo do webhook
+
+        Raises:
+            InvalidSignature: Se a assinatura não confere
+        """
+        expected = hmac.new(settings.BLING_WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest()
+        received = (signature or '').split('=', 1)[-1].strip()
+
+        if not received or not hmac.compare_digest(expected, received):
+            raise InvalidSignature('Assinatura do webhook inválida')
+
+    def _occurred_at(self, payload):
+        try:
+            value = parse_datetime(payload.get('date') or '')
+        except ValueError:
+            return None
+
+        if value and timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        return value
+
+    def _entity_id(self, resource, data):
+        if resource == 'stock':
+            return (data.get('produto') or {}).get('id')
+        return data.get('id')
+
+    def handle(self, body):
+        """
+        Processa o corpo (bytes) de uma chamada do webhook
+
+        Returns:
+            WebhookEvent: Evento com o status do processamento
+        """
+        payload = json.loads(body)
+        if not isinstance(payload, dict):
+            raise ValueError('O corpo deve ser um objeto JSON')
+
+        event = str(payload.get('event') or '')
+        resource, _, action = event.partition('.')
+        data = payload.get('data') or {}
+
+        event_id = str(payload.get('eventId') or hashlib.sha256(body).hexdigest())
+        record, created = WebhookEvent.objects.get_or_create(
+            event_id=event_id,
+            defaults={
+                'event': event,
+                'resource': resource,
+                'entity_id': self._entity_id(resource, data),
+                'occurred_at': self._occurred_at(payload),
+                'payload': payload,
+            },
+        )
+
+        # Reenvio de um evento já processado (ou em processamento)
+        if not created and record.status != WebhookEvent.STATUS_FAILED:
+            return record
+
+        if resource not in self.CACHE_ENDPOINTS or not record.entity_id:
+            record.status = WebhookEvent.STATUS_IGNORED
+            record.save(update_fields=['status'])
+            return record
+
+        try:
+            with cache_lock(f'bling_webhook:{resource}:{record.entity_id}', timeout=30, wait=10):
+                if self._is_stale(record):
+                    record.status = WebhookEvent.STATUS_STALE
+                else:
+                    self._apply(resource, action, record.entity_id, data)
+                    record.status = WebhookEvent.STATUS_APPLIED
+                    record.error = ''
+        except Exception as e:
+            # Falhou (ou não obteve o lock): o reenvio do Bling processa de novo
+            logger.error(f"Erro ao aplicar webhook {event} ({event_id}): {e}")
+            record.status = WebhookEvent.STATUS_FAILED
+            record.error = str(e)
+
+        record.save(update_fields=['status', 'error'])
+
+        endpoint = self.CACHE_ENDPOINTS[resource]
+        self.response_cache.delete(f'{endpoint}/{record.entity_id}')
+        self._invalidate_lists(endpoint)
+        return record
+
+    def _invalidate_lists(self, endpoint):
+        """
+        Agenda a invalidação das listagens do recurso para o fim da janela
+
+        O primeiro evento da janela agenda; os seguintes já estão cobertos
+        por ela, porque a invalidação acontece depois deles.
+        """
+        window = settings.BLING_WEBHOOK_LIST_INVALIDATION_SECONDS
+        if not window:
+            self.response_cache.invalidate(endpoint)
+            return
+
+        # Expira sozinha se o processo morrer antes de invalidar
+        key = f'{self.PENDING_PREFIX}:{endpoint}'
+        if not cache.add(key, 1, int(window * 2) + 1):
+            return
+
+        def invalidate():
+            # Libera antes de invalidar: um evento que chega agora agenda a próxima janela
+            cache.delete(key)
+            try:
+                self.response_cache.invalidate(endpoint)
+            except Exception as e:
+                logger.warning(f"Erro ao invalidar listagens de {endpoint}: {e}")
+
+        timer = threading.Timer(window, invalidate)
+        timer.daemon = True
+        timer.start()
+
+    def _is_stale(self, record):
+        """
+        Já foi aplicado um evento mais recente para a mesma entidade?
+        """
+        if record.occurred_at is None:
+            return False
+
+        return WebhookEvent.objects.filter(
+            resource=record.resource,
+            entity_id=record.entity_id,
+            status=WebhookEvent.STATUS_APPLIED,
+            occurred_at__gt=record.occurred_at,
+        ).exists()
+
+    def _apply(self, resource, action, entity_id, data):
+        if resource == 'order':
+            if action == 'deleted':
+                self.mirror.delete_orders([entity_id])
+            else:
+                self.mirror.upsert_orders([data])
+
+        elif resource == 'product':
+            if action == 'deleted':
+                self.mirror.delete_products([entity_id])
+            else:
+                self.mirror.upsert_products([data])
+
+        elif resource == 'stock':
+            stock = {key: data[key] for key in ('saldoFisicoTotal', 'saldoVirtualTotal') if key in data}
+            if stock:
+                self.mirror.update_stock(entity_id, stock)
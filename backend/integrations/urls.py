@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import views, async_views
 
 
 urlpatterns = [
@@ -14,11 +14,14 @@ urlpatterns = [
 
     # Produtos
     path('products/', views.get_products, name='bling-products'),
+    path('products/stream/', views.stream_products, name='bling-products-stream'),
     path('products/<str:product_identifier>/', views.get_product_detail, name='bling-product-detail'),
     path('products/<str:product_identifier>/variations/', views.get_product_variations, name='bling-product-variations'),
 
     # Pedidos
     path('orders/', views.get_orders, name='bling-orders'),
+    path('orders/stream/', views.stream_orders, name='bling-orders-stream'),
+    path('orders/batch/', views.get_orders_batch, name='bling-orders-batch'),
     path('orders/<int:order_id>/', views.get_order_detail, name='bling-order-detail'),
 
     # Categorias
@@ -26,10 +29,30 @@ urlpatterns = [
 
     # Contatos
     path('contacts/', views.get_contacts, name='bling-contacts'),
+    path('contacts/stream/', views.stream_contacts, name='bling-contacts-stream'),
 
     # Dashboard/Resumos
     path('dashboard/', views.get_dashboard_summary, name='bling-dashboard'),
+    path('analytics/sales/', views.get_sales_analytics, name='bling-analytics-sales'),
+
+    # Versões assíncronas (servidas via ASGI)
+    path('async/products/', async_views.get_products, name='bling-async-products'),
+    path('async/products/<str:product_identifier>/', async_views.get_product_detail, name='bling-async-product-detail'),
+    path('async/orders/', async_views.get_orders, name='bling-async-orders'),
+    path('async/orders/<int:order_id>/', async_views.get_order_detail, name='bling-async-order-detail'),
+    path('async/categories/', async_views.get_categories, name='bling-async-categories'),
+    path('async/contacts/', async_views.get_contacts, name='bling-async-contacts'),
+    path('async/dashboard/', async_views.get_dashboard_summary, name='bling-async-dashboard'),
+
+    # Tarefas em segundo plano (manage.py bling_worker)
+    path('jobs/', views.jobs, name='bling-jobs'),
+    path('jobs/<int:job_id>/', views.job_detail, name='bling-job-detail'),
+    path('jobs/<int:job_id>/download/', views.job_download, name='bling-job-download'),
+
+    # Webhooks do Bling
+    path('webhooks/bling/', views.bling_webhook, name='bling-webhook'),
 
     path('health/', views.api_health_check, name='bling-health'),
+    path('metrics/', views.metrics, name='bling-metrics'),
     path('debug/products/<str:product_id>/structure/', views.debug_product_structure, name='debug-structure'),
 ]
@@ -1,22 +1,186 @@
+import os
+import json
+import uuid
 import logging
 
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+
 from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.renderers import JSONRenderer
 from rest_framework import status
 
+from django.conf import settings
 from django.shortcuts import redirect
-from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.core.cache import cache
+from django.http import FileResponse, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
 from .services.bling_oauth import BlingOAuthService
 from .services.bling_api import BlingAPIService
+from .services.mirror import BlingMirrorService
+from .services.http_client import get_http_client
+from .services.response_cache import BlingResponseCache
+from .services.single_flight import get_single_flight
+from .services.sales_rollup import SalesRollupService
+from .services.projection import parse_fields, project
+from .services.webhooks import BlingWebhookService, InvalidSignature
+from .services.jobs import JOB_HANDLERS, enqueue, serialize_job
+from .services.metrics import get_metrics, render_prometheus
+from .services.circuit_breaker import BlingCircuitBreaker, UpstreamUnavailable
+from .services.product_search import ProductSearchIndex
+from .services import timing
+from .models import Job
+from .decorators import content_etag, etag_stats
+from .middleware import compression_stats
 
 logger = logging.getLogger(__name__)
 
 
+def _read_service():
+    """
+    Fonte das leituras: espelho local (BLING_SERVE_FROM_MIRROR) ou API do Bling
+    """
+    if settings.BLING_SERVE_FROM_MIRROR:
+        return BlingMirrorService()
+    return BlingAPIService()
+
+
+def _wait_headers(api_service):
+    """
+    Tempo aguardando o limite de requisições, em header: no corpo mudaria a
+    ETag a cada chamada e impediria o 304
+    """
+    return {'X-Rate-Limit-Wait': f'{api_service.last_wait_time:.3f}'}
+
+
+def _search_products(api_service, search, page, limit):
+    """
+    Busca de produtos: índice local (BLING_LOCAL_SEARCH, depois da cópia
+    completa dos produtos) ou a fonte das leituras
+    """
+    if settings.BLING_LOCAL_SEARCH:
+        index = ProductSearchIndex()
+        if index.available() and index.populated():
+            return index.search(search, page, limit)
+    return api_service.search_products(search, page, limit)
+
+
+def _product_filters(request):
+    """
+    Monta os filtros de produtos a partir da query string
+    """
+    filters = {}
+    if request.GET.get('categoria'):
+        filters['criterio'] = 5  # Por categoria
+        filters['termo'] = request.GET.get('categoria')
+    return filters
+
+
+def _order_filters(request):
+    """
+    Monta os filtros de pedidos a partir da query string
+    """
+    filters = {}
+    if request.GET.get('data_inicial'):
+        filters['dataInicial'] = request.GET.get('data_inicial')
+    if request.GET.get('data_final'):
+        filters['dataFinal'] = request.GET.get('data_final')
+    if request.GET.get('situacao'):
+        filters['situacao'] = request.GET.get('situacao')
+    if request.GET.get('numero'):
+        filters['numero'] = request.GET.get('numero')
+    return filters
+
+
+def _ndjson_response(items, error_message):
+    """
+    Transmite os itens como JSON delimitado por linha (NDJSON)
+
+    O primeiro item é obtido antes de iniciar a resposta para que erros de
+    autenticação ou conexão ainda retornem status 500.
+    """
+    iterator = iter(items)
+
+    try:
+        first = next(iterator, None)
+    except Exception as e:
+        logger.error(f"{error_message}: {e}")
+        return JsonResponse({'error': error_message, 'details': str(e)}, status=500)
+
+    def generate():
+        if first is None:
+            return
+
+        yield json.dumps(first, ensure_ascii=False) + '\n'
+
+        try:
+            for item in iterator:
+                yield json.dumps(item, ensure_ascii=False) + '\n'
+        except Exception as e:
+            # Status já foi enviado: sinaliza o erro na última linha
+            logger.error(f"{error_message} (stream interrompido): {e}")
+            yield json.dumps({'error': error_message, 'details': str(e)}, ensure_ascii=False) + '\n'
+
+    return StreamingHttpResponse(generate(), content_type='application/x-ndjson; charset=utf-8')
+
+
+def _project_response(request, response):
+    """
+    Aplica ?fields= (ex: id,numero,contato.nome) aos itens de response['data']
+    """
+    tree = parse_fields(request.GET.get('fields'))
+    if tree and isinstance(response, dict) and response.get('data') is not None:
+        response['data'] = project(response['data'], tree)
+    return response
+
+
+def _project_items(request, items):
+    tree = parse_fields(request.GET.get('fields'))
+    if not tree:
+        return items
+    return (project(item, tree) for item in items)
+
+
+def _cursor_response(request, fetch_page):
+    """
+    Resposta paginada por cursor a partir do espelho local
+
+    fetch_page recebe (cursor, limit); o cursor vazio (?cursor=) é a primeira página.
+    """
+    try:
+        limit = int(request.GET.get('limit', 100))
+        if not 1 <= limit <= settings.BLING_CURSOR_MAX_LIMIT:
+            raise ValueError(f'limit deve estar entre 1 e {settings.BLING_CURSOR_MAX_LIMIT}')
+        page = fetch_page(request.GET.get('cursor') or None, limit)
+    except ValueError as e:
+        return Response(
+            {'error': 'Parâmetros inválidos', 'details': str(e)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    return Response(_project_response(request, page))
+
+
+def _error_status(error):
+    """
+    503 quando o Bling está fora (ou com o circuito aberto) e não há resposta guardada
+    """
+    if isinstance(error, UpstreamUnavailable):
+        return status.HTTP_503_SERVICE_UNAVAILABLE
+    return status.HTTP_500_INTERNAL_SERVER_ERROR
+
+
+def _max_pages(request):
+    max_pages = request.GET.get('max_pages')
+    return int(max_pages) if max_pages else None
+
+
 # TESTE E UTILITÁRIOS
 @api_view(['GET'])
 @renderer_classes([JSONRenderer])
@@ -41,15 +205,18 @@ def test_integration(request):
                 'detail': '/integrations/products/{id}/',
                 'variations': '/integrations/products/{id}/variations/',
                 'search': '/integrations/products/?search=termo',
+                'stream': '/integrations/products/stream/',
             },
             'orders': {
                 'list': '/integrations/orders/',
                 'detail': '/integrations/orders/{id}/',
                 'by_date': '/integrations/orders/?data_inicial=YYYY-MM-DD&data_final=YYYY-MM-DD',
+                'stream': '/integrations/orders/stream/',
             },
             'others': {
                 'categories': '/integrations/categories/',
                 'contacts': '/integrations/contacts/',
+                'contacts_stream': '/integrations/contacts/stream/',
                 'dashboard': '/integrations/dashboard/',
             }
         }
@@ -70,7 +237,13 @@ def api_health_check(request):
         return Response({
             'api_status': 'healthy',
             'authentication_status': 'authenticated' if is_authenticated else 'not_authenticated',
-            'cache_status': 'working',
+            'cache_status': _cache_status(),
+            'http_pool': get_http_client().stats(),
+            'response_cache': BlingResponseCache().stats(),
+            'single_flight': get_single_flight().stats(),
+            'circuit_breaker': BlingCircuitBreaker().stats(),
+            'etag': etag_stats.stats(),
+            'compression': compression_stats.stats(),
             'timestamp': request.build_absolute_uri(),
         })
     except Exception as e:
@@ -80,6 +253,65 @@ def api_health_check(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def _cache_status():
+    """
+    Grava e lê uma chave de teste no cache
+    """
+    key = 'bling_health:probe'
+    value = uuid.uuid4().hex
+    try:
+        cache.set(key, value, 30)
+        return 'working' if cache.get(key) == value else 'not_working'
+    except Exception as e:
+        logger.error(f"Cache indisponível: {e}")
+        return 'unavailable'
+
+
+@require_http_methods(["GET"])
+def metrics(request):
+    """
+    Métricas no formato de texto do Prometheus
+
+    Inclui a latência das chamadas ao Bling (histograma por endpoint),
+    respostas por status, novas tentativas após 429, espera no limite de
+    requisições, renovações de token e os acertos do cache de respostas,
+    somados entre todos os workers.
+    """
+    try:
+        counters, histograms, workers = get_metrics().collect()
+        cache_stats = BlingResponseCache().stats()
+
+        extra = [
+            (
+                'bling_response_cache_requests_total', 'counter', 'Consultas ao cache de respostas por resultado',
+                [
+                    ([('result', 'hit')], cache_stats['hits']),
+                    ([('result', 'stale')], cache_stats['stale_hits']),
+                    ([('result', 'miss')], cache_stats['misses']),
+                ],
+            ),
+            (
+                'bling_response_cache_fallbacks_total', 'counter',
+                'Respostas guardadas servidas porque o Bling estava indisponível',
+                [([], cache_stats['fallbacks'])],
+            ),
+            (
+                'bling_response_cache_hit_ratio', 'gauge', 'Fração das consultas ao cache servidas sem chamar o Bling',
+                [([], cache_stats['hit_ratio'])],
+            ),
+            (
+                'bling_metrics_workers', 'gauge', 'Processos com métricas recentes no cache',
+                [([], workers)],
+            ),
+        ]
+        body = render_prometheus(counters, histograms, extra)
+    except Exception as e:
+        logger.error(f"Erro ao coletar métricas: {e}")
+        return HttpResponse(f'# erro ao coletar métricas: {e}\n', status=500, content_type='text/plain; charset=utf-8')
+
+    return HttpResponse(body, content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 # AUTENTICAÇÃO OAUTH
 @api_view(['GET'])
 @renderer_classes([JSONRenderer])
@@ -209,6 +441,7 @@ def auth_status(request):
 
 
 # PRODUTOS
+@content_etag
 @api_view(['GET'])
 @renderer_classes([JSONRenderer])
 @permission_classes([AllowAny])
@@ -221,9 +454,19 @@ def get_products(request):
     - limit: Itens por página (padrão: 100, máx: 100)
     - search: Termo de busca
     - categoria: Filtrar por categoria
+    - fields: Campos retornados em cada item (ex: codigo,nome,preco)
+    - cursor: Paginação por cursor no espelho local (vazio = primeira página);
+      usa meta.next_cursor e aceita limit até BLING_CURSOR_MAX_LIMIT
     """
     try:
-        api_service = BlingAPIService()
+        if 'cursor' in request.GET:
+            search = request.GET.get('search')
+            filters = {'criterio': 1, 'termo': search} if search else _product_filters(request)
+            return _cursor_response(
+                request, lambda cursor, limit: BlingMirrorService().get_products_page(cursor, limit, filters)
+            )
+
+        api_service = _read_service()
 
         # Parâmetros de consulta
         page = int(request.GET.get('page', 1))
@@ -231,13 +474,10 @@ def get_products(request):
         search = request.GET.get('search')
 
         if search:
-            products = api_service.search_products(search, page, limit)
+            products = _search_products(api_service, search, page, limit)
         else:
             # Filtros opcionais
-            filters = {}
-            if request.GET.get('categoria'):
-                filters['criterio'] = 5  # Por categoria
-                filters['termo'] = request.GET.get('categoria')
+            filters = _product_filters(request)
 
             products = api_service.get_products(page, limit, filters or None)
 
@@ -248,19 +488,20 @@ def get_products(request):
                 'limit': limit,
                 'search': search,
                 'total_items': len(products.get('data', [])),
-                'has_more': len(products.get('data', [])) == limit
+                'has_more': len(products.get('data', [])) == limit,
             }
 
-        return Response(products)
+        return Response(_project_response(request, products), headers=_wait_headers(api_service))
 
     except Exception as e:
         logger.error(f"Erro ao buscar produtos: {e}")
         return Response(
             {'error': 'Erro ao buscar produtos', 'details': str(e)},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            status=_error_status(e)
         )
 
 
+@content_etag
 @api_view(['GET'])
 @renderer_classes([JSONRenderer])
 @permission_classes([AllowAny])
@@ -272,7 +513,7 @@ def get_product_detail(request, product_identifier):
     - product_identifier: ID numérico ou código do produto
     """
     try:
-        api_service = BlingAPIService()
+        api_service = _read_service()
 
         # Tenta primeiro como ID numérico
         try:
@@ -280,29 +521,16 @@ def get_product_detail(request, product_identifier):
             product = api_service.get_product(product_id)
         except ValueError:
             # Se não for numérico, busca por código
-            products_response = api_service.search_products(product_identifier)
-            if products_response and 'data' in products_response:
-                # Procura produto com código exato
-                for p in products_response['data']:
-                    if p.get('codigo') == product_identifier:
-                        product = {'data': p}
-                        break
-                else:
-                    return Response(
-                        {
-                            'error': f'Produto com código "{product_identifier}" não encontrado',
-                            'suggestion': 'Verifique se o código está correto ou use o ID numérico'
-                        },
-                        status=status.HTTP_404_NOT_FOUND
-                    )
-            else:
+            found = api_service.find_product_by_code(product_identifier)
+            if found is None:
                 return Response(
                     {
-                        'error': f'Produto "{product_identifier}" não encontrado',
-                        'suggestion': 'Verifique se o código/ID está correto'
+                        'error': f'Produto com código "{product_identifier}" não encontrado',
+                        'suggestion': 'Verifique se o código está correto ou use o ID numérico'
                     },
                     status=status.HTTP_404_NOT_FOUND
                 )
+            product = {'data': found}
 
         return Response(product)
 
@@ -310,10 +538,11 @@ def get_product_detail(request, product_identifier):
         logger.error(f"Erro ao buscar produto {product_identifier}: {e}")
         return Response(
             {'error': 'Erro ao buscar produto', 'details': str(e)},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            status=_error_status(e)
         )
 
 
+@content_etag
 @api_view(['GET'])
 @renderer_classes([JSONRenderer])
 @permission_classes([AllowAny])
@@ -334,21 +563,11 @@ def get_product_variations(request, product_identifier):
         try:
             product_id = int(product_identifier)
         except ValueError:
-            # Busca o produto por código para obter o ID
-            products_response = api_service.search_products(product_identifier)
-            if products_response and 'data' in products_response:
-                for p in products_response['data']:
-                    if p.get('codigo') == product_identifier:
-                        product_id = p['id']
-                        break
-                else:
-                    return Response(
-                        {'error': f'Produto com código "{product_identifier}" não encontrado'},
-                        status=status.HTTP_404_NOT_FOUND
-                    )
-            else:
+            # Obtém o ID pelo índice de códigos (busca no Bling só se não indexado)
+            product_id = api_service.resolve_product_id(product_identifier)
+            if product_id is None:
                 return Response(
-                    {'error': f'Produto "{product_identifier}" não encontrado'},
+                    {'error': f'Produto com código "{product_identifier}" não encontrado'},
                     status=status.HTTP_404_NOT_FOUND
                 )
 
@@ -362,40 +581,15 @@ def get_product_variations(request, product_identifier):
 
             # Busca produtos que podem ser variações (baseado no código)
             try:
-                # Obtém o produto pai para pegar o código
-                product_response = api_service.get_product(product_id)
-                if product_response and 'data' in product_response:
-                    parent_code = product_response['data'].get('codigo', '')
-
-                    # Busca possíveis variações
-                    search_patterns = [
-                        f"{parent_code}-",  # Produtos com hífen
-                        f"{parent_code}_",  # Produtos com underscore
-                        f"{parent_code} ",  # Produtos com espaço
-                    ]
-
-                    all_variations = []
-                    for pattern in search_patterns:
-                        try:
-                            search_result = api_service.search_products(pattern)
-                            if search_result and 'data' in search_result:
-                                for item in search_result['data']:
-                                    code = item.get('codigo', '')
-                                    # Verifica se realmente é uma variação
-                                    if (code.startswith(parent_code) and 
-                                        code != parent_code and 
-                                        item['id'] != product_id):
-                                        all_variations.append(item)
-                        except:
-                            continue
-
+                result = api_service.find_variations_by_code(product_id)
+                if result is not None:
                     return Response({
-                        'data': all_variations,
+                        'data': result['data'],
                         '_metadata': {
-                            'method': 'alternative_search',
+                            'method': result['method'],
                             'parent_product_id': product_id,
-                            'parent_code': parent_code,
-                            'total_found': len(all_variations),
+                            'parent_code': result['parent_code'],
+                            'total_found': len(result['data']),
                             'note': 'Variações encontradas através de busca por código'
                         }
                     })
@@ -417,11 +611,12 @@ def get_product_variations(request, product_identifier):
         logger.error(f"Erro ao buscar variações do produto {product_identifier}: {e}")
         return Response(
             {'error': 'Erro ao buscar variações', 'details': str(e)},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            status=_error_status(e)
         )
 
 
 # PEDIDOS
+@content_etag
 @api_view(['GET'])
 @renderer_classes([JSONRenderer])
 @permission_classes([AllowAny])
@@ -436,24 +631,25 @@ def get_orders(request):
     - data_final: Data final (YYYY-MM-DD)
     - situacao: Situação do pedido
     - numero: Número do pedido
+    - fields: Campos retornados em cada item (ex: numero,total,contato.nome)
+    - cursor: Paginação por cursor no espelho local, mais recentes primeiro
+      (vazio = primeira página)
     """
     try:
-        api_service = BlingAPIService()
+        if 'cursor' in request.GET:
+            filters = _order_filters(request)
+            return _cursor_response(
+                request, lambda cursor, limit: BlingMirrorService().get_orders_page(cursor, limit, filters)
+            )
+
+        api_service = _read_service()
 
         # Parâmetros de consulta
         page = int(request.GET.get('page', 1))
         limit = min(int(request.GET.get('limit', 100)), 100)
 
         # Filtros opcionais
-        filters = {}
-        if request.GET.get('data_inicial'):
-            filters['dataInicial'] = request.GET.get('data_inicial')
-        if request.GET.get('data_final'):
-            filters['dataFinal'] = request.GET.get('data_final')
-        if request.GET.get('situacao'):
-            filters['situacao'] = request.GET.get('situacao')
-        if request.GET.get('numero'):
-            filters['numero'] = request.GET.get('numero')
+        filters = _order_filters(request)
 
         orders = api_service.get_orders(page, limit, filters or None)
 
@@ -466,16 +662,61 @@ def get_orders(request):
                 'total_items': len(orders.get('data', [])),
             }
 
-        return Response(orders)
+        return Response(_project_response(request, orders), headers=_wait_headers(api_service))
 
     except Exception as e:
         logger.error(f"Erro ao buscar pedidos: {e}")
         return Response(
             {'error': 'Erro ao buscar pedidos', 'details': str(e)},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            status=_error_status(e)
         )
 
 
+@content_etag
+@api_view(['GET'])
+@renderer_classes([JSONRenderer])
+@permission_classes([AllowAny])
+def get_orders_batch(request):
+    """
+    Obtém o detalhe (com itens) de vários pedidos: ?ids=1,2,3
+
+    Pedidos em cache (ou no espelho) não chamam o Bling; os demais são
+    buscados em paralelo. Falhas individuais vão para "errors" sem
+    derrubar o lote. Aceita ?fields= como /orders/.
+    """
+    try:
+        order_ids = [int(value) for value in request.GET.get('ids', '').split(',') if value.strip()]
+    except ValueError:
+        return Response(
+            {'error': 'Parâmetros inválidos', 'details': 'ids deve ser uma lista de IDs numéricos separados por vírgula'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if not order_ids or len(order_ids) > settings.BLING_BATCH_MAX_IDS:
+        return Response(
+            {'error': 'Parâmetros inválidos', 'details': f'Informe entre 1 e {settings.BLING_BATCH_MAX_IDS} IDs'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        api_service = _read_service()
+        result = api_service.get_orders_batch(order_ids)
+
+        return Response({
+            'data': _project_response(request, result)['data'],
+            'errors': result['errors'],
+            '_metadata': result['meta'],
+        })
+
+    except Exception as e:
+        logger.error(f"Erro ao buscar lote de pedidos: {e}")
+        return Response(
+            {'error': 'Erro ao buscar lote de pedidos', 'details': str(e)},
+            status=_error_status(e)
+        )
+
+
+@content_etag
 @api_view(['GET'])
 @renderer_classes([JSONRenderer])
 @permission_classes([AllowAny])
@@ -484,7 +725,7 @@ def get_order_detail(request, order_id):
     Obtém detalhes de um pedido específico
     """
     try:
-        api_service = BlingAPIService()
+        api_service = _read_service()
         order = api_service.get_order(order_id)
 
         return Response(order)
@@ -493,11 +734,12 @@ def get_order_detail(request, order_id):
         logger.error(f"Erro ao buscar pedido {order_id}: {e}")
         return Response(
             {'error': 'Erro ao buscar pedido', 'details': str(e)},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            status=_error_status(e)
         )
 
 
 # CATEGORIAS
+@content_etag
 @api_view(['GET'])
 @renderer_classes([JSONRenderer])
 @permission_classes([AllowAny])
@@ -506,7 +748,7 @@ def get_categories(request):
     Lista categorias de produtos
     """
     try:
-        api_service = BlingAPIService()
+        api_service = _read_service()
 
         page = int(request.GET.get('page', 1))
         limit = min(int(request.GET.get('limit', 100)), 100)
@@ -519,20 +761,29 @@ def get_categories(request):
         logger.error(f"Erro ao buscar categorias: {e}")
         return Response(
             {'error': 'Erro ao buscar categorias', 'details': str(e)},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            status=_error_status(e)
         )
 
 
 # CONTATOS
+@content_etag
 @api_view(['GET'])
 @renderer_classes([JSONRenderer])
 @permission_classes([AllowAny])
 def get_contacts(request):
     """
     Lista contatos (clientes/fornecedores)
+
+    Com ?cursor= pagina por cursor no espelho local, em ordem de nome.
     """
     try:
-        api_service = BlingAPIService()
+        if 'cursor' in request.GET:
+            search = request.GET.get('search')
+            return _cursor_response(
+                request, lambda cursor, limit: BlingMirrorService().get_contacts_page(cursor, limit, search)
+            )
+
+        api_service = _read_service()
 
         page = int(request.GET.get('page', 1))
         limit = min(int(request.GET.get('limit', 100)), 100)
@@ -549,66 +800,315 @@ def get_contacts(request):
         logger.error(f"Erro ao buscar contatos: {e}")
         return Response(
             {'error': 'Erro ao buscar contatos', 'details': str(e)},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            status=_error_status(e)
         )
 
 
 # RELATÓRIOS E RESUMOS
+# Seções do dashboard: (chave no resumo, campo com a lista)
+DASHBOARD_SECTIONS = (
+    ('products', 'recent'),
+    ('orders', 'recent'),
+    ('categories', 'list'),
+)
+
+
+def _dashboard_calls(api_service):
+    """
+    Chamadas ao Bling de cada seção do dashboard, na ordem de DASHBOARD_SECTIONS
+    """
+    return (
+        lambda: api_service.get_products(page=1, limit=5),
+        lambda: api_service.get_orders(page=1, limit=5),
+        lambda: api_service.get_categories(page=1, limit=10),
+    )
+
+
+def _build_dashboard_summary(request, results):
+    """
+    Monta o resumo a partir da resposta (ou exceção) de cada seção
+    """
+    summary = {'timestamp': request.build_absolute_uri()}
+
+    for (section, field), result in zip(DASHBOARD_SECTIONS, results):
+        summary[section] = {field: [], 'error': None}
+
+        if isinstance(result, Exception):
+            summary[section]['error'] = str(result)
+        elif result and 'data' in result:
+            summary[section][field] = result['data']
+            summary[section]['total_pages'] = result.get('meta', {}).get('totalPages', 0)
+            # Resposta guardada servida com o Bling fora do ar
+            if result.get('_stale'):
+                summary[section]['stale'] = result['_stale']
+
+    return summary
+
+
+@content_etag
 @api_view(['GET'])
 @renderer_classes([JSONRenderer])
 @permission_classes([AllowAny])
 def get_dashboard_summary(request):
     """
     Obtém um resumo para dashboard com informações principais
+
+    As três chamadas ao Bling rodam em paralelo, então a latência é a da
+    chamada mais lenta e não a soma delas.
     """
     try:
-        api_service = BlingAPIService()
+        api_service = _read_service()
+        calls = _dashboard_calls(api_service)
 
-        # Coleta dados em paralelo (simulado)
-        summary = {
-            'timestamp': request.build_absolute_uri(),
-            'products': {'recent': [], 'error': None},
-            'orders': {'recent': [], 'error': None},
-            'categories': {'list': [], 'error': None},
+        with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+            futures = [executor.submit(timing.propagate(call)) for call in calls]
+
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+
+        return Response(_build_dashboard_summary(request, results))
+
+    except Exception as e:
+        logger.error(f"Erro ao buscar resumo: {e}")
+        return Response(
+            {'error': 'Erro ao buscar resumo', 'details': str(e)},
+            status=_error_status(e)
+        )
+
+
+@content_etag
+@api_view(['GET'])
+@renderer_classes([JSONRenderer])
+@permission_classes([AllowAny])
+def get_sales_analytics(request):
+    """
+    Vendas agregadas por período (dia, semana ou mês)
+
+    Responde a partir dos agregados diários mantidos pelo espelho, sem
+    consultar pedidos nem o Bling. Parâmetros: from, to (AAAA-MM-DD,
+    padrão: últimos 30 dias), granularity e situacao (IDs separados por vírgula).
+    _metadata.source é "unavailable" (sem dados) quando os agregados não
+    são mantidos; veja SalesRollupService.available.
+    """
+    try:
+        date_to = parse_date(request.GET.get('to') or '') or timezone.localdate()
+        date_from = parse_date(request.GET.get('from') or '') or date_to - timedelta(days=29)
+        granularity = request.GET.get('granularity', 'day')
+        situacoes = [int(value) for value in request.GET.get('situacao', '').split(',') if value.strip()]
+    except ValueError as e:
+        return Response(
+            {'error': 'Parâmetros inválidos', 'details': str(e)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if granularity not in SalesRollupService.GRANULARITIES:
+        return Response(
+            {'error': 'Parâmetros inválidos', 'details': 'granularity deve ser day, week ou month'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        service = SalesRollupService()
+        if service.available():
+            result = service.sales(date_from, date_to, granularity, situacoes)
+            source = 'rollup'
+        else:
+            # Agregados não mantidos (espelho desligado ou vazio): o frontend
+            # volta a calcular a partir dos pedidos do Bling
+            result = {'data': [], 'totals': None}
+            source = 'unavailable'
+
+        result['_metadata'] = {
+            'from': date_from.isoformat(),
+            'to': date_to.isoformat(),
+            'granularity': granularity,
+            'situacoes': situacoes,
+            'source': source,
         }
+        return Response(result)
 
-        # Produtos recentes
-        try:
-            products_response = api_service.get_products(page=1, limit=5)
-            if products_response and 'data' in products_response:
-                summary['products']['recent'] = products_response['data']
-                summary['products']['total_pages'] = products_response.get('meta', {}).get('totalPages', 0)
-        except Exception as e:
-            summary['products']['error'] = str(e)
+    except Exception as e:
+        logger.error(f"Erro ao buscar vendas agregadas: {e}")
+        return Response(
+            {'error': 'Erro ao buscar vendas agregadas', 'details': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
 
-        # Pedidos recentes
-        try:
-            orders_response = api_service.get_orders(page=1, limit=5)
-            if orders_response and 'data' in orders_response:
-                summary['orders']['recent'] = orders_response['data']
-                summary['orders']['total_pages'] = orders_response.get('meta', {}).get('totalPages', 0)
-        except Exception as e:
-            summary['orders']['error'] = str(e)
 
-        # Categorias
+# STREAMING (NDJSON)
+@require_http_methods(["GET"])
+def stream_products(request):
+    """
+    Transmite todos os produtos em NDJSON, uma página do Bling por vez
+
+    Parâmetros:
+    - categoria: Filtrar por categoria
+    - max_pages: Limite de páginas do Bling
+    - fields: Campos retornados em cada item
+    """
+    try:
+        max_pages = _max_pages(request)
+    except ValueError:
+        return JsonResponse({'error': 'max_pages inválido'}, status=400)
+
+    api_service = BlingAPIService()
+    products = api_service.iter_products(_product_filters(request) or None, max_pages)
+    return _ndjson_response(_project_items(request, products), 'Erro ao transmitir produtos')
+
+
+@require_http_methods(["GET"])
+def stream_orders(request):
+    """
+    Transmite todos os pedidos em NDJSON, uma página do Bling por vez
+
+    Parâmetros:
+    - data_inicial, data_final, situacao, numero: Mesmos filtros de /orders/
+    - max_pages: Limite de páginas do Bling
+    - fields: Campos retornados em cada item
+    """
+    try:
+        max_pages = _max_pages(request)
+    except ValueError:
+        return JsonResponse({'error': 'max_pages inválido'}, status=400)
+
+    api_service = BlingAPIService()
+    orders = api_service.iter_orders(_order_filters(request) or None, max_pages)
+    return _ndjson_response(_project_items(request, orders), 'Erro ao transmitir pedidos')
+
+
+@require_http_methods(["GET"])
+def stream_contacts(request):
+    """
+    Transmite todos os contatos em NDJSON, uma página do Bling por vez
+
+    Parâmetros:
+    - max_pages: Limite de páginas do Bling
+    - fields: Campos retornados em cada item
+    """
+    try:
+        max_pages = _max_pages(request)
+    except ValueError:
+        return JsonResponse({'error': 'max_pages inválido'}, status=400)
+
+    api_service = BlingAPIService()
+    contacts = api_service.iter_contacts(max_pages=max_pages)
+    return _ndjson_response(_project_items(request, contacts), 'Erro ao transmitir contatos')
+
+
+# TAREFAS EM SEGUNDO PLANO
+@api_view(['GET', 'POST'])
+@renderer_classes([JSONRenderer])
+@permission_classes([AllowAny])
+def jobs(request):
+    """
+    Lista as tarefas (GET) ou coloca uma nova na fila (POST)
+
+    POST: {"kind": "sync" | "export_orders" | "rebuild_sales_rollups", "params": {...}}
+    GET: filtros opcionais status e kind; retorna as 50 mais recentes
+    """
+    if request.method == 'POST':
+        kind = request.data.get('kind')
+        params = request.data.get('params') or {}
+
+        if kind not in JOB_HANDLERS or not isinstance(params, dict):
+            return Response(
+                {'error': 'Parâmetros inválidos', 'details': f"kind deve ser um de: {', '.join(JOB_HANDLERS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         try:
-            categories_response = api_service.get_categories(page=1, limit=10)
-            if categories_response and 'data' in categories_response:
-                summary['categories']['list'] = categories_response['data']
-                summary['categories']['total_pages'] = categories_response.get('meta', {}).get('totalPages', 0)
+            job = enqueue(kind, params)
+            return Response(serialize_job(job), status=status.HTTP_201_CREATED)
         except Exception as e:
-            summary['categories']['error'] = str(e)
+            logger.error(f"Erro ao criar tarefa: {e}")
+            return Response(
+                {'error': 'Erro ao criar tarefa', 'details': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
 
-        return Response(summary)
+    try:
+        queryset = Job.objects.select_related('schedule').order_by('-pk')
+        if request.GET.get('status'):
+            queryset = queryset.filter(status=request.GET['status'])
+        if request.GET.get('kind'):
+            queryset = queryset.filter(kind=request.GET['kind'])
+
+        return Response({'data': [serialize_job(job) for job in queryset[:50]]})
 
     except Exception as e:
-        logger.error(f"Erro ao buscar resumo: {e}")
+        logger.error(f"Erro ao listar tarefas: {e}")
         return Response(
-            {'error': 'Erro ao buscar resumo', 'details': str(e)},
+            {'error': 'Erro ao listar tarefas', 'details': str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
 
+@api_view(['GET'])
+@renderer_classes([JSONRenderer])
+@permission_classes([AllowAny])
+def job_detail(request, job_id):
+    """
+    Situação e progresso de uma tarefa
+    """
+    job = Job.objects.select_related('schedule').filter(pk=job_id).first()
+    if job is None:
+        return Response({'error': 'Tarefa não encontrada'}, status=status.HTTP_404_NOT_FOUND)
+
+    return Response(serialize_job(job))
+
+
+@require_http_methods(["GET"])
+def job_download(request, job_id):
+    """
+    Baixa o arquivo gerado por uma tarefa de exportação concluída
+    """
+    job = Job.objects.filter(pk=job_id, status=Job.STATUS_SUCCEEDED).first()
+    filename = os.path.basename(((job.result if job else None) or {}).get('file') or '')
+    path = os.path.join(settings.BLING_EXPORT_DIR, filename)
+
+    if not filename or not os.path.exists(path):
+        return JsonResponse({'error': 'Arquivo não encontrado'}, status=404)
+
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=filename, content_type='application/x-ndjson')
+
+
+# WEBHOOKS
+@csrf_exempt
+@require_http_methods(["POST"])
+def bling_webhook(request):
+    """
+    Recebe os eventos do Bling (pedidos, produtos e estoque)
+
+    A assinatura HMAC-SHA256 do corpo vem no header X-Bling-Signature-256.
+    Eventos repetidos ou mais antigos que o último aplicado são registrados
+    sem alterar o espelho. Falhas retornam 500 para que o Bling reenvie.
+    """
+    service = BlingWebhookService()
+
+    try:
+        service.verify_signature(request.body, request.META.get(service.SIGNATURE_HEADER))
+    except InvalidSignature as e:
+        logger.warning(f"Webhook rejeitado: {e}")
+        return JsonResponse({'error': str(e)}, status=401)
+
+    try:
+        event = service.handle(request.body)
+    except ValueError as e:
+        return JsonResponse({'error': 'Corpo inválido', 'details': str(e)}, status=400)
+    except Exception as e:
+        logger.error(f"Erro ao processar webhook: {e}")
+        return JsonResponse({'error': 'Erro ao processar webhook', 'details': str(e)}, status=500)
+
+    if event.status == event.STATUS_FAILED:
+        return JsonResponse({'error': 'Erro ao aplicar evento', 'details': event.error}, status=500)
+
+    return JsonResponse({'event_id': event.event_id, 'status': event.status})
+
+
 # ============================================================================
 # VIEWS DE DEBUG (REMOVER EM PRODUÇÃO)
 # ============================================================================
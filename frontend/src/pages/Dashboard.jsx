@@ -1,22 +1,37 @@
 import React from 'react';
 import { useApi } from '../hooks/useApi';
-import { dashboardAPI, ordersAPI } from '../services/api';
+import { analyticsAPI, dashboardAPI, ordersAPI, ORDER_LIST_FIELDS } from '../services/api';
 import MetricsCard from '../components/MetricsCard';
 import SalesChart from '../components/SalesChart';
 import OrdersTable from '../components/OrdersTable';
 
 const Dashboard = () => {
   const { data: dashboardData, loading: dashboardLoading, error: dashboardError } = useApi(() => dashboardAPI.getSummary());
-  const { data: ordersData, loading: ordersLoading, error: ordersError } = useApi(() => ordersAPI.getAll({ limit: 5 }));
+  const { data: ordersData, loading: ordersLoading, error: ordersError } = useApi(() => ordersAPI.getAll({ limit: 5, fields: ORDER_LIST_FIELDS }));
+  const { data: salesData, loading: salesLoading, error: salesError } = useApi(() => analyticsAPI.getSales({ granularity: 'day' }));
 
-  // Calcula métricas dos dados
+  // Vendas agregadas só existem com o espelho local em uso; sem elas, usa os pedidos recentes do Bling
+  const useRollup = !salesError && salesData?._metadata?.source === 'rollup';
+
+  // Calcula métricas a partir das vendas agregadas no backend (últimos 30 dias) ou dos pedidos
   const calculateMetrics = () => {
-    // Usa dados mock se houver erro na API
+    const productsCount = dashboardData?.products?.recent?.length || 0;
+
+    if (useRollup) {
+      return {
+        totalOrders: salesData.totals.order_count,
+        totalSales: salesData.totals.total,
+        productsCount,
+        avgOrderValue: salesData.totals.avg_ticket
+      };
+    }
+
+    // Usa zeros se houver erro na API
     if (ordersError || !ordersData) {
       return {
         totalOrders: 0,
         totalSales: 0,
-        productsCount: dashboardData?.products?.recent?.length || 0,
+        productsCount,
         avgOrderValue: 0
       };
     }
@@ -24,7 +39,6 @@ const Dashboard = () => {
     const orders = ordersData.data || [];
     const totalOrders = orders.length;
     const totalSales = orders.reduce((sum, order) => sum + (order.total || 0), 0);
-    const productsCount = dashboardData?.products?.recent?.length || 0;
 
     return {
       totalOrders,
@@ -36,8 +50,19 @@ const Dashboard = () => {
 
   const metrics = calculateMetrics();
 
-  // Gera dados do gráfico baseado nos pedidos ou dados mock
+  // Gera dados do gráfico a partir da série diária, dos pedidos ou dados mock
   const generateChartData = () => {
+    if (useRollup) {
+      // period vem como AAAA-MM-DD; formata sem passar por Date para não deslocar o fuso
+      return salesData.data.map(item => {
+        const [, month, day] = item.period.split('-');
+        return {
+          data: `${day}/${month}`,
+          vendas: item.total
+        };
+      });
+    }
+
     if (ordersError || !ordersData?.data) {
       // Retorna dados mock em caso de erro
       return [
@@ -49,10 +74,9 @@ const Dashboard = () => {
       ];
     }
 
-    const orders = ordersData.data;
     const salesByDate = {};
 
-    orders.forEach(order => {
+    ordersData.data.forEach(order => {
       const date = order.dataEmissao || order.data;
       if (date) {
         const formattedDate = new Date(date).toLocaleDateString('pt-BR', { 
@@ -76,11 +100,13 @@ const Dashboard = () => {
       <h2 className="mb-20">Dashboard</h2>
       
       {/* Mostrar erros se houver */}
-      {(dashboardError || ordersError) && (
+      {(dashboardError || ordersError || salesError) && (
         <div className="error mb-20">
           <strong>Aviso:</strong> Alguns dados podem não estar atualizados devido a problemas na conexão com o Bling ERP.
           {ordersError && <br />}
           {ordersError && `Pedidos: ${ordersError}`}
+          {salesError && <br />}
+          {salesError && `Vendas: ${salesError}`}
         </div>
       )}
       
@@ -111,8 +137,12 @@ const Dashboard = () => {
       {/* Gráfico de Vendas */}
       <SalesChart 
         data={chartData}
-        loading={dashboardLoading || ordersLoading}
-        title={ordersError ? "Vendas (Dados de Exemplo)" : "Vendas por Data"}
+        loading={salesLoading || ordersLoading}
+        title={
+          useRollup
+            ? "Vendas dos Últimos 30 Dias"
+            : (ordersError || !ordersData?.data) ? "Vendas (Dados de Exemplo)" : "Vendas por Data"
+        }
       />
 
       {/* Tabela de Pedidos Recentes */}
@@ -128,6 +158,7 @@ const Dashboard = () => {
         <div style={{ fontSize: '14px', color: 'var(--text-secondary)' }}>
           <p>Dashboard: {dashboardError ? '❌ Erro' : '✅ OK'}</p>
           <p>Pedidos: {ordersError ? '❌ Erro' : '✅ OK'}</p>
+          <p>Vendas: {salesError ? '❌ Erro' : '✅ OK'}</p>
           {dashboardData && (
             <>
               <p>Produtos: {dashboardData.products?.error ? '❌ Erro' : '✅ OK'}</p>
@@ -1,6 +1,6 @@
 import React, { useState } from 'react';
 import { useApi } from '../hooks/useApi';
-import { ordersAPI } from '../services/api';
+import { ordersAPI, ORDER_LIST_FIELDS } from '../services/api';
 
 const Orders = () => {
   const [filters, setFilters] = useState({
@@ -13,7 +13,8 @@ const Orders = () => {
   const { data: ordersData, loading, refetch } = useApi(
     () => ordersAPI.getAll({
       ...filters,
-      limit: 20
+      limit: 20,
+      fields: ORDER_LIST_FIELDS
     }),
     [filters]
   );
@@ -10,6 +10,7 @@ const Products = () => {
     () => productsAPI.getAll({ 
       page, 
       limit: 20,
+      fields: 'codigo,nome,preco,tipo,situacao',
       ...(searchTerm && { search: searchTerm })
     }),
     [page, searchTerm]
@@ -36,6 +36,14 @@ export const dashboardAPI = {
   getHealthCheck: () => apiRequest('/health/')
 };
 
+// Vendas agregadas (dia, semana ou mês)
+export const analyticsAPI = {
+  getSales: (params = {}) => {
+    const queryString = new URLSearchParams(params).toString();
+    return apiRequest(`/analytics/sales/?${queryString}`);
+  }
+};
+
 // Produtos
 export const productsAPI = {
   getAll: (params = {}) => {
@@ -47,6 +55,9 @@ export const productsAPI = {
 };
 
 // Pedidos
+// Campos exibidos nas tabelas de pedidos (?fields= reduz o payload de cada item)
+export const ORDER_LIST_FIELDS = 'numero,data,dataEmissao,total,situacao,contato.nome';
+
 export const ordersAPI = {
   getAll: (params = {}) => {
     const queryString = new URLSearchParams(params).toString();